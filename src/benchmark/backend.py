@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from benchmark.exceptions import InferenceError
+
+
+class InferenceBackend(ABC):
+    """
+    Interface of an inference engine the runner can benchmark.
+
+    `generate_batch` returns one dict per prompt with output_text,
+    output_tokens (None when the backend cannot count them),
+    prompt_tokens, token_times (per-token timestamps in
+    seconds since the call started, or None when not streaming) and
+    timed_out. A backend may add `timings`, a dict of extra per-request
+    timing fields recorded with the result row.
+
+    Backends without a local tokenizer leave `tokenizer` as None; the
+    runner then skips token caching and buckets prompts by character
+    length.
+    """
+
+    tokenizer = None
+    compile_mode = None
+    prefix_stats = None
+    load_stats: Dict[str, Any] = {}
+
+    @abstractmethod
+    def generate_batch(
+        self,
+        prompts: list[str],
+        generation_config: dict,
+        input_ids: list | None = None,
+    ) -> list[dict]:
+        ...
+
+    def generate(
+        self,
+        prompt: str,
+        generation_config: dict,
+    ) -> dict:
+        """
+        Run generation for a single prompt; one entry of `generate_batch`.
+        """
+        return self.generate_batch([prompt], generation_config)[0]
+
+    def memory_footprint_mb(self) -> float:
+        """
+        Local memory held by the model; 0 for remote backends.
+        """
+        return 0.0
+
+    def close(self) -> None:
+        """
+        Release resources held outside the model (connections, worker
+        threads); a no-op for backends without any.
+        """
+
+    def set_prefix(self, text: str | None, use_cache: bool = True) -> None:
+        """
+        Prepend a shared prefix to every prompt. Only backends that
+        manage their own KV cache support it.
+        """
+        if text:
+            raise InferenceError(
+                f"{type(self).__name__} does not support a shared prefix"
+            )
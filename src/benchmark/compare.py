@@ -0,0 +1,214 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from benchmark.exceptions import ReportError
+from benchmark.metrics import bootstrap_mean_diff, mann_whitney_u
+from benchmark.sink import iter_result_chunks
+
+
+# Metrics compared between runs, and whether a higher value is better
+COMPARE_METRICS = {
+    "latency_sec": False,
+    "tokens_per_sec": True,
+    "ttft_sec": False,
+    "peak_ram_mb": False,
+}
+
+# Relative change (percent) in the worse direction that counts as a
+# regression once it is also statistically significant
+DEFAULT_THRESHOLDS_PCT = {
+    "latency_sec": 5.0,
+    "tokens_per_sec": 5.0,
+    "ttft_sec": 10.0,
+    "peak_ram_mb": 10.0,
+}
+
+COMPARE_METHODS = ("mannwhitney", "bootstrap")
+
+
+def load_run_results(run_dir: Path) -> pd.DataFrame:
+    """
+    Read the result rows of a run directory: the `results/` part files
+    when present, otherwise `results.csv`. Failed rows are dropped.
+    """
+    results_dir = run_dir / "results"
+
+    if results_dir.exists():
+        chunks = list(iter_result_chunks(results_dir))
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    elif (run_dir / "results.csv").exists():
+        df = pd.read_csv(run_dir / "results.csv")
+    else:
+        raise ReportError(f"No results found in {run_dir}")
+
+    if df.empty:
+        raise ReportError(f"Run {run_dir} has no result rows")
+
+    if "status" in df.columns:
+        df = df[df["status"] != "error"]
+
+    return df
+
+
+def _compare_metric(
+    base: pd.DataFrame,
+    cand: pd.DataFrame,
+    metric: str,
+    method: str,
+) -> Dict[str, Any] | None:
+    """
+    Compare one metric of one model on the prompts both runs share.
+    """
+    base_values = pd.to_numeric(base[metric], errors="coerce")
+    cand_values = pd.to_numeric(cand[metric], errors="coerce")
+
+    # Per-prompt means pair the runs prompt by prompt
+    paired = pd.concat(
+        [
+            base_values.groupby(base["prompt_id"]).mean().rename("baseline"),
+            cand_values.groupby(cand["prompt_id"]).mean().rename("candidate"),
+        ],
+        axis=1,
+        join="inner",
+    ).dropna()
+
+    if paired.empty:
+        return None
+
+    shared = paired.index
+    base_samples = base_values[base["prompt_id"].isin(shared)].dropna()
+    cand_samples = cand_values[cand["prompt_id"].isin(shared)].dropna()
+
+    baseline_mean = float(base_samples.mean())
+    candidate_mean = float(cand_samples.mean())
+    delta = candidate_mean - baseline_mean
+
+    if method == "bootstrap":
+        test = bootstrap_mean_diff(paired["candidate"] - paired["baseline"])
+    else:
+        test = mann_whitney_u(base_samples, cand_samples)
+
+    return {
+        "metric": metric,
+        "prompts": len(paired),
+        "baseline_mean": round(baseline_mean, 6),
+        "candidate_mean": round(candidate_mean, 6),
+        "delta": round(delta, 6),
+        "delta_pct": (
+            round(100.0 * delta / baseline_mean, 3) if baseline_mean else None
+        ),
+        "p_value": round(test["p_value"], 6),
+    }
+
+
+def compare_runs(
+    baseline: pd.DataFrame,
+    candidate: pd.DataFrame,
+    thresholds_pct: Dict[str, float] | None = None,
+    alpha: float = 0.05,
+    method: str = "mannwhitney",
+) -> pd.DataFrame:
+    """
+    Compare a candidate run against a baseline, per model and metric,
+    joined on (model_name, prompt_id).
+
+    A row is flagged as a regression when the change is in the worse
+    direction by more than the metric's threshold (percent of the
+    baseline mean) and significant at `alpha` (Mann-Whitney U on the
+    per-request samples, or a paired bootstrap over per-prompt means).
+    Models present in only one run are skipped.
+    """
+    if method not in COMPARE_METHODS:
+        raise ValueError(f"Unknown comparison method: {method}")
+
+    thresholds = {**DEFAULT_THRESHOLDS_PCT, **(thresholds_pct or {})}
+
+    rows = []
+    models = sorted(set(baseline["model_name"]) & set(candidate["model_name"]))
+
+    for model_name in sorted(set(baseline["model_name"]) ^ set(candidate["model_name"])):
+        logging.warning(f"Model {model_name} is not in both runs; skipping it")
+
+    for model_name in models:
+        base = baseline[baseline["model_name"] == model_name]
+        cand = candidate[candidate["model_name"] == model_name]
+
+        for metric, higher_is_better in COMPARE_METRICS.items():
+            if metric not in base.columns or metric not in cand.columns:
+                continue
+
+            result = _compare_metric(base, cand, metric, method)
+            if result is None:
+                continue
+
+            worse_pct = result["delta_pct"] or 0.0
+            if higher_is_better:
+                worse_pct = -worse_pct
+
+            significant = bool(result["p_value"] < alpha)
+
+            rows.append({
+                "model_name": model_name,
+                **result,
+                "significant": significant,
+                "threshold_pct": thresholds.get(metric),
+                "regression": bool(
+                    significant
+                    and thresholds.get(metric) is not None
+                    and worse_pct > thresholds[metric]
+                ),
+            })
+
+    return pd.DataFrame(rows)
+
+
+def compare_run_dirs(
+    run_dirs: List[Path],
+    thresholds_pct: Dict[str, float] | None = None,
+    alpha: float = 0.05,
+    method: str = "mannwhitney",
+) -> pd.DataFrame:
+    """
+    Compare every run in `run_dirs[1:]` against the baseline
+    `run_dirs[0]`; rows are labelled with the candidate run.
+    """
+    if len(run_dirs) < 2:
+        raise ValueError("Comparison needs a baseline and at least one other run")
+
+    baseline = load_run_results(run_dirs[0])
+
+    frames = []
+    for run_dir in run_dirs[1:]:
+        comparison = compare_runs(
+            baseline,
+            load_run_results(run_dir),
+            thresholds_pct=thresholds_pct,
+            alpha=alpha,
+            method=method,
+        )
+        comparison.insert(0, "candidate_run", str(run_dir))
+        frames.append(comparison)
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def save_comparison(
+    comparison: pd.DataFrame,
+    output_dir: Path,
+) -> Path:
+    """
+    Save the run comparison to CSV.
+    """
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        csv_path = output_dir / "comparison.csv"
+        comparison.to_csv(csv_path, index=False)
+
+        return csv_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to save comparison: {exc}") from exc
@@ -1,53 +1,51 @@
+import csv
 import json
+import random
 from pathlib import Path
-from typing import List, Dict, Any
-
-import pandas as pd
+from typing import List, Dict, Any, Iterator
 
 from benchmark.exceptions import DatasetError
 
 
-def load_dataset(
-    path: str,
+SUPPORTED_FORMATS = {"csv", "jsonl"}
+
+
+def _iter_raw_records(
+    dataset_path: Path,
     fmt: str,
     text_field: str,
-    max_prompts: int | None = None,
-) -> List[Dict[str, Any]]:
+    chunksize: int,
+) -> Iterator[Dict[str, Any]]:
     """
-    Load a prompt dataset from CSV or JSONL format.
+    Yield {"id", "prompt"} records straight from disk.
 
-    Returns a list of dicts with at least:
-        {
-            "id": <int>,
-            "prompt": <str>
-        }
+    JSONL is read line by line; CSV is read in `chunksize`-row chunks
+    of the text column only, so neither format is held in memory.
     """
-    dataset_path = Path(path)
-
-    if not dataset_path.exists():
-        raise DatasetError(f"Dataset file not found: {dataset_path}")
-
-    if fmt not in {"csv", "jsonl"}:
-        raise DatasetError(f"Unsupported dataset format: {fmt}")
-
-    records: List[Dict[str, Any]] = []
-
     try:
         if fmt == "csv":
-            df = pd.read_csv(dataset_path)
+            with open(dataset_path, "r", encoding="utf-8-sig", newline="") as f:
+                header = next(csv.reader(f), None)
 
-            if text_field not in df.columns:
+            if header is not None and text_field not in header:
                 raise DatasetError(
                     f"Missing required column '{text_field}' in CSV dataset"
                 )
 
-            for idx, row in df.iterrows():
-                records.append(
-                    {
-                        "id": int(idx),
-                        "prompt": str(row[text_field]),
-                    }
-                )
+            # pandas is only needed (and only imported) for CSV prompts
+            import pandas as pd
+
+            offset = 0
+            reader = pd.read_csv(
+                dataset_path,
+                usecols=[text_field],
+                chunksize=chunksize,
+            )
+
+            for chunk in reader:
+                for idx, text in enumerate(chunk[text_field].tolist(), start=offset):
+                    yield {"id": idx, "prompt": str(text)}
+                offset += len(chunk)
 
         elif fmt == "jsonl":
             with open(dataset_path, "r", encoding="utf-8") as f:
@@ -62,20 +60,144 @@ def load_dataset(
                             f"Missing required field '{text_field}' in JSONL record at line {idx + 1}"
                         )
 
-                    records.append(
-                        {
-                            "id": obj.get("id", idx),
-                            "prompt": str(obj[text_field]),
-                        }
-                    )
+                    yield {
+                        "id": obj.get("id", idx),
+                        "prompt": str(obj[text_field]),
+                    }
 
-    except (json.JSONDecodeError, pd.errors.ParserError) as exc:
+    except ValueError as exc:
+        # json.JSONDecodeError and pandas' ParserError are ValueErrors
         raise DatasetError(f"Failed to parse dataset: {exc}") from exc
 
-    if not records:
-        raise DatasetError("Dataset is empty after loading")
 
-    if max_prompts is not None:
-        records = records[: max_prompts]
+def _check_shard(num_shards: int, shard_index: int) -> None:
+    if num_shards < 1 or not 0 <= shard_index < num_shards:
+        raise ValueError(
+            f"shard_index must be in [0, num_shards), got shard_index={shard_index} "
+            f"with num_shards={num_shards}"
+        )
+
+
+def iter_dataset(
+    path: str,
+    fmt: str,
+    text_field: str,
+    max_prompts: int | None = None,
+    sample_fraction: float | None = None,
+    num_shards: int = 1,
+    shard_index: int = 0,
+    seed: int = 42,
+    chunksize: int = 10_000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream prompt records from CSV or JSONL, applying sharding,
+    sampling and `max_prompts` lazily, in that order.
+
+    Sharding keeps every `num_shards`-th record starting at
+    `shard_index`, which must satisfy 0 <= shard_index < num_shards
+    (ValueError otherwise); sampling keeps each record with probability
+    `sample_fraction`, seeded so repeated passes see the same prompts.
+    Reading stops as soon as `max_prompts` records have been yielded.
+    """
+    dataset_path = Path(path)
+
+    if not dataset_path.exists():
+        raise DatasetError(f"Dataset file not found: {dataset_path}")
+
+    if fmt not in SUPPORTED_FORMATS:
+        raise DatasetError(f"Unsupported dataset format: {fmt}")
+
+    _check_shard(num_shards, shard_index)
+
+    if max_prompts == 0:
+        return
+
+    rng = random.Random(seed)
+    yielded = 0
+
+    for position, record in enumerate(
+        _iter_raw_records(dataset_path, fmt, text_field, chunksize)
+    ):
+        if position % num_shards != shard_index:
+            continue
+
+        if sample_fraction is not None and rng.random() >= sample_fraction:
+            continue
+
+        yield record
+        yielded += 1
+
+        if max_prompts is not None and yielded >= max_prompts:
+            return
+
+
+class PromptDataset:
+    """
+    Re-iterable streaming view over a prompt file.
+
+    Every iteration re-opens the file, so the runner can make one pass
+    per repetition without materializing the corpus. Instances only
+    hold the loader arguments and are cheap to send to worker
+    processes.
+    """
+
+    def __init__(self, path: str, fmt: str, text_field: str, **options):
+        self.path = path
+        self.fmt = fmt
+        self.text_field = text_field
+        self.options = options
+
+        if not Path(path).exists():
+            raise DatasetError(f"Dataset file not found: {path}")
+
+        if fmt not in SUPPORTED_FORMATS:
+            raise DatasetError(f"Unsupported dataset format: {fmt}")
+
+        _check_shard(options.get("num_shards", 1), options.get("shard_index", 0))
+
+    @classmethod
+    def from_config(cls, dataset_cfg: dict, seed: int = 42) -> "PromptDataset":
+        return cls(
+            path=dataset_cfg["path"],
+            fmt=dataset_cfg["format"],
+            text_field=dataset_cfg["text_field"],
+            max_prompts=dataset_cfg.get("max_prompts"),
+            sample_fraction=dataset_cfg.get("sample_fraction"),
+            num_shards=dataset_cfg.get("num_shards", 1),
+            shard_index=dataset_cfg.get("shard_index", 0),
+            seed=seed,
+        )
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter_dataset(
+            self.path,
+            self.fmt,
+            self.text_field,
+            **self.options,
+        )
+
+
+def load_dataset(
+    path: str,
+    fmt: str,
+    text_field: str,
+    max_prompts: int | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Load a prompt dataset from CSV or JSONL format.
+
+    Returns a list of dicts with at least:
+        {
+            "id": <int>,
+            "prompt": <str>
+        }
+
+    Prefer `PromptDataset` / `iter_dataset` for large corpora.
+    """
+    records = list(iter_dataset(path, fmt, text_field, max_prompts=max_prompts))
+
+    # max_prompts=0 asks for nothing; only an empty file is an error
+    if not records and max_prompts != 0:
+        raise DatasetError("Dataset is empty after loading")
 
     return records
@@ -1,23 +1,77 @@
 import platform
+import re
 import sys
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
+from pathlib import Path
 
 import psutil
 
-try:
-    import torch
-except ImportError:
-    torch = None
 
-try:
-    import transformers
-except ImportError:
-    transformers = None
+NUMA_SYSFS_DIR = Path("/sys/devices/system/node")
 
-try:
-    import pynvml
-    _NVML_AVAILABLE = True
-except ImportError:
-    _NVML_AVAILABLE = False
+
+def get_numa_nodes(sysfs_dir: Path = NUMA_SYSFS_DIR) -> list | None:
+    """
+    NUMA layout as [{"node": 0, "cpus": "0-7"}, ...], read from sysfs.
+
+    Returns None where the layout is not exposed (non-Linux hosts,
+    restricted containers).
+    """
+    try:
+        node_dirs = sorted(
+            (d for d in sysfs_dir.glob("node[0-9]*") if d.name[4:].isdigit()),
+            key=lambda d: int(d.name[4:]),
+        )
+        nodes = [
+            {
+                "node": int(d.name[4:]),
+                "cpus": (d / "cpulist").read_text().strip(),
+            }
+            for d in node_dirs
+        ]
+    except OSError:
+        return None
+
+    return nodes or None
+
+
+_VERSION_ASSIGNMENT = re.compile(r"""^__version__\s*=\s*['"]([^'"]+)['"]""", re.MULTILINE)
+
+
+def _package_version(name: str, version_file: str | None = None) -> str | None:
+    """
+    Installed version of a package, without importing it (slow for the
+    ML libraries).
+
+    Prefers the `__version__` of an already imported module, then the
+    one assigned in `version_file` inside the package (torch's
+    version.py keeps the build tag, e.g. "2.2.2+cu121", which the
+    distribution metadata may drop), then the distribution metadata.
+    """
+    module = sys.modules.get(name)
+    if getattr(module, "__version__", None):
+        return str(module.__version__)
+
+    if version_file is not None:
+        try:
+            spec = find_spec(name)
+        except (ImportError, ValueError):
+            spec = None
+
+        if spec is not None and spec.submodule_search_locations:
+            path = Path(list(spec.submodule_search_locations)[0]) / version_file
+            try:
+                match = _VERSION_ASSIGNMENT.search(path.read_text(encoding="utf-8"))
+            except OSError:
+                match = None
+            if match:
+                return match.group(1)
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
 
 
 def get_environment_metadata() -> dict:
@@ -29,13 +83,21 @@ def get_environment_metadata() -> dict:
         "os_version": platform.version(),
         "python_version": sys.version.split()[0],
         "cpu_cores": psutil.cpu_count(logical=True),
+        "cpu_physical_cores": psutil.cpu_count(logical=False),
+        "cpu_logical_cores": psutil.cpu_count(logical=True),
+        "numa_nodes": get_numa_nodes(),
         "total_ram_gb": round(psutil.virtual_memory().total / (1024 ** 3), 2),
-        "torch_version": torch.__version__ if torch else None,
-        "transformers_version": transformers.__version__ if transformers else None,
+        "torch_version": _package_version("torch", version_file="version.py"),
+        "transformers_version": _package_version("transformers"),
         "gpu": None,
     }
 
-    if _NVML_AVAILABLE:
+    try:
+        import pynvml
+    except ImportError:
+        pynvml = None
+
+    if pynvml is not None:
         try:
             pynvml.nvmlInit()
             handle = pynvml.nvmlDeviceGetHandleByIndex(0)
@@ -0,0 +1,405 @@
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+from urllib.parse import urlsplit
+
+from benchmark.backend import InferenceBackend
+from benchmark.exceptions import InferenceError, ModelLoadError
+
+
+# Failures of a reused keep-alive connection the server already closed;
+# the request is retried once on a fresh connection
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+def parse_server_timing(header: str | None) -> Dict[str, float]:
+    """
+    Parse a `Server-Timing` header into {metric: seconds}, e.g.
+    "queue;dur=1.5, total;dur=20" -> {"queue": 0.0015, "total": 0.02}.
+    Metrics without a duration are ignored.
+    """
+    timings = {}
+    if not header:
+        return timings
+
+    for entry in header.split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "dur" and name:
+                try:
+                    timings[name] = float(value.strip('"')) / 1000.0
+                except ValueError:
+                    pass
+
+    return timings
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections to one server.
+
+    At most `max_connections` requests are in flight; idle connections
+    are reused so requests skip TCP (and TLS) setup. A connection that
+    fails mid-request is closed rather than returned.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 8, timeout: float | None = None):
+        parsed = urlsplit(base_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Invalid server URL: {base_url}")
+
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.connections_opened = 0
+
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = (
+            http.client.HTTPSConnection
+            if self.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self) -> Iterator[tuple[http.client.HTTPConnection, float]]:
+        """
+        Borrow a connected connection; yields (connection, connect_sec),
+        where connect_sec is 0 for a reused keep-alive connection.
+        """
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._new_connection()
+
+            connect_sec = 0.0
+            if conn.sock is None:
+                start = time.perf_counter()
+                conn.connect()
+                connect_sec = time.perf_counter() - start
+                with self._lock:
+                    self.connections_opened += 1
+
+            try:
+                yield conn, connect_sec
+            except BaseException:
+                conn.close()
+                raise
+
+            if conn.sock is not None:
+                self._idle.put(conn)
+
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class OpenAIHTTPModel(InferenceBackend):
+    """
+    Benchmark a model behind an OpenAI-compatible HTTP server (vLLM,
+    TGI, llama.cpp server, ...) through its `/v1/completions` endpoint.
+
+    Requests go over a pool of keep-alive connections; the prompts of a
+    batch are sent as concurrent requests and batched by the server.
+    With `streaming`, the response is read as server-sent events so
+    every chunk is timestamped and TTFT is observed on the client.
+
+    Besides the usual outputs, each result carries `timings`:
+    connect_sec (TCP setup, 0 on a reused connection), server_queue_sec
+    and server_time_sec (from the server's `Server-Timing` header, when
+    it sends one) and network_sec, the client-observed time the server
+    does not account for: time to response headers minus server queue
+    time when streaming, total latency minus server time otherwise.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        base_url: str,
+        timeout_seconds: float | None = None,
+        max_connections: int = 8,
+        api_key_env: str | None = None,
+    ):
+        self.model_id = model_id
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+
+        self._headers = {"Content-Type": "application/json"}
+        if api_key_env:
+            api_key = os.environ.get(api_key_env)
+            if not api_key:
+                raise ModelLoadError(f"Environment variable {api_key_env} is not set")
+            self._headers["Authorization"] = f"Bearer {api_key}"
+
+        try:
+            self.pool = ConnectionPool(base_url, max_connections, timeout=timeout_seconds)
+        except ValueError as exc:
+            raise ModelLoadError(str(exc)) from exc
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+
+        self._connect()
+
+    def _connect(self) -> None:
+        """
+        Check the server is reachable and serves `model_id`.
+        """
+        start = time.perf_counter()
+
+        try:
+            with self.pool.connection() as (conn, connect_sec):
+                conn.request("GET", f"{self.pool.base_path}/v1/models", headers=self._headers)
+                response = conn.getresponse()
+                body = response.read()
+
+            if response.status != 200:
+                raise ModelLoadError(
+                    f"Inference server at {self.base_url} returned HTTP {response.status}"
+                )
+
+            served = [model.get("id") for model in json.loads(body).get("data", [])]
+
+        except (OSError, http.client.HTTPException, ValueError) as exc:
+            raise ModelLoadError(
+                f"Cannot reach inference server at {self.base_url}: {exc}"
+            ) from exc
+
+        if served and self.model_id not in served:
+            logging.warning(
+                f"Server at {self.base_url} does not list {self.model_id} "
+                f"(serves {', '.join(map(str, served))})"
+            )
+
+        self.load_stats = {
+            "connect_sec": round(connect_sec, 4),
+            "load_total_sec": round(time.perf_counter() - start, 4),
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    def generate_batch(
+        self,
+        prompts: list[str],
+        generation_config: dict,
+        input_ids: list | None = None,
+    ) -> list[dict]:
+        """
+        Send every prompt as its own concurrent request; results are in
+        prompt order. `input_ids` is ignored: the server tokenizes.
+        """
+        if not prompts:
+            return []
+
+        futures = [
+            self._executor.submit(self._complete, prompt, generation_config)
+            for prompt in prompts
+        ]
+        return [future.result() for future in futures]
+
+    def _complete(self, prompt: str, generation_config: dict) -> dict:
+        streaming = generation_config.get("streaming", False)
+
+        payload = {
+            "model": self.model_id,
+            "prompt": prompt,
+            "max_tokens": generation_config.get("max_new_tokens", 128),
+            "temperature": generation_config.get("temperature", 0.7),
+            "top_p": generation_config.get("top_p", 0.9),
+            "stream": streaming,
+        }
+        if not generation_config.get("do_sample", True):
+            payload["temperature"] = 0.0
+        if streaming:
+            payload["stream_options"] = {"include_usage": True}
+
+        body = json.dumps(payload).encode("utf-8")
+
+        for attempt in range(2):
+            try:
+                return self._post(body, streaming)
+            except _STALE_CONNECTION_ERRORS:
+                if attempt:
+                    raise InferenceError("Inference server closed the connection")
+            except (OSError, http.client.HTTPException, ValueError) as exc:
+                raise InferenceError(f"Request to {self.base_url} failed: {exc}") from exc
+
+    def _post(self, body: bytes, streaming: bool) -> dict:
+        start = time.perf_counter()
+        deadline = start + self.timeout_seconds if self.timeout_seconds else None
+
+        with self.pool.connection() as (conn, connect_sec):
+            try:
+                conn.request(
+                    "POST",
+                    f"{self.pool.base_path}/v1/completions",
+                    body=body,
+                    headers=self._headers,
+                )
+                response = conn.getresponse()
+                headers_sec = time.perf_counter() - start
+
+                if response.status != 200:
+                    detail = response.read().decode("utf-8", errors="replace")[:200]
+                    raise InferenceError(f"HTTP {response.status} from server: {detail}")
+
+                server_timing = parse_server_timing(response.getheader("Server-Timing"))
+
+                if streaming:
+                    result = self._read_stream(conn, response, start, deadline)
+                else:
+                    result = self._read_completion(response)
+            except socket.timeout:
+                # No (complete) response within the timeout: a timed-out
+                # request, not a failed one. The half-read connection
+                # cannot be reused.
+                conn.close()
+                return self._timed_out_result(streaming, connect_sec)
+
+        latency = time.perf_counter() - start
+
+        queue_sec = server_timing.get("queue")
+        server_sec = server_timing.get("total")
+
+        if streaming:
+            network_sec = headers_sec - connect_sec - (queue_sec or 0.0)
+        elif server_sec is not None:
+            network_sec = latency - connect_sec - server_sec
+        else:
+            network_sec = None
+
+        result["timings"] = {
+            "connect_sec": round(connect_sec, 6),
+            "server_queue_sec": round(queue_sec, 6) if queue_sec is not None else None,
+            "server_time_sec": round(server_sec, 6) if server_sec is not None else None,
+            "network_sec": round(max(network_sec, 0.0), 6) if network_sec is not None else None,
+        }
+        return result
+
+    @staticmethod
+    def _timed_out_result(streaming: bool, connect_sec: float) -> dict:
+        return {
+            "output_text": "",
+            "output_tokens": 0,
+            "prompt_tokens": 0,
+            "token_times": [] if streaming else None,
+            "timed_out": True,
+            "timings": {
+                "connect_sec": round(connect_sec, 6),
+                "server_queue_sec": None,
+                "server_time_sec": None,
+                "network_sec": None,
+            },
+        }
+
+    @staticmethod
+    def _read_completion(response) -> dict:
+        """
+        Parse a non-streaming completion. Token counts come from the
+        server's `usage`; when it omits `completion_tokens`, output_tokens
+        is None rather than a guess, since there is no local tokenizer
+        and word counts are not token counts.
+        """
+        data = json.loads(response.read())
+        choice = data["choices"][0]
+        text = choice.get("text", "")
+        usage = data.get("usage") or {}
+
+        return {
+            "output_text": text,
+            "output_tokens": usage.get("completion_tokens"),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "token_times": None,
+            "timed_out": choice.get("finish_reason") == "timeout",
+        }
+
+    @staticmethod
+    def _read_stream(conn, response, start: float, deadline: float | None) -> dict:
+        """
+        Read server-sent events until `[DONE]`, timestamping each text
+        chunk. Past the deadline (or on a stalled socket) the partial
+        output is returned and the connection is dropped.
+
+        output_tokens comes from the final `usage` event only; without
+        it (or after a timeout) it is None, as in `_read_completion`.
+        Chunks are not tokens: servers may send several per event.
+        """
+        pieces = []
+        token_times = []
+        usage: Dict[str, Any] = {}
+        timed_out = False
+
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                timed_out = True
+                break
+
+            try:
+                line = response.readline()
+            except socket.timeout:
+                timed_out = True
+                break
+
+            if not line:
+                break
+
+            line = line.strip()
+            if not line.startswith(b"data:"):
+                continue
+
+            data = line[len(b"data:"):].strip()
+            if data == b"[DONE]":
+                break
+
+            event = json.loads(data)
+            if event.get("usage"):
+                usage = event["usage"]
+
+            for choice in event.get("choices") or []:
+                if choice.get("text"):
+                    token_times.append(time.perf_counter() - start)
+                    pieces.append(choice["text"])
+
+        if timed_out:
+            # Unread events would corrupt the next request on this connection
+            conn.close()
+        else:
+            # Consume the end of the chunked body so the connection is reusable
+            response.read()
+
+        return {
+            "output_text": "".join(pieces),
+            "output_tokens": usage.get("completion_tokens"),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "token_times": token_times,
+            "timed_out": timed_out,
+        }
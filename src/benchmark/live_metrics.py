@@ -0,0 +1,251 @@
+import bisect
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from benchmark.exceptions import BenchmarkError
+
+
+# Histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TTFT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class _Histogram:
+    """
+    Cumulative Prometheus histogram, one series per model.
+    """
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts: Dict[str, List[int]] = {}
+        self.sums: Dict[str, float] = defaultdict(float)
+
+    def observe(self, model: str, value: float) -> None:
+        counts = self.counts.setdefault(model, [0] * (len(self.buckets) + 1))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sums[model] += value
+
+    def render(self, name: str) -> List[str]:
+        lines = []
+        for model, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket{_labels(model=model, le=_format_bound(bound))} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(model=model)} {self.sums[model]!r}")
+            lines.append(f"{name}_count{_labels(model=model)} {cumulative}")
+        return lines
+
+
+class LiveMetrics:
+    """
+    In-flight benchmark progress in the Prometheus text format.
+
+    Per model: requests completed by status (ok / timeout / error),
+    generated tokens, the throughput of the latest batch, latency and
+    TTFT histograms, and the current process RSS while the model runs
+    (read from its `ResourceMonitor` at render time). Thread-safe; the
+    runner records into it and a `MetricsServer` or `TextfileExporter`
+    publishes `render()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[tuple, int] = defaultdict(int)
+        self._tokens: Dict[str, int] = defaultdict(int)
+        self._tokens_per_sec: Dict[str, float] = {}
+        self._latency = _Histogram(LATENCY_BUCKETS)
+        self._ttft = _Histogram(TTFT_BUCKETS)
+        self._monitors: Dict[str, Any] = {}
+
+    def record_rows(self, model: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Count the result rows of one batch.
+        """
+        with self._lock:
+            for row in rows:
+                self._requests[(model, row.get("status", "ok"))] += 1
+                self._tokens[model] += row.get("output_tokens") or 0
+                self._latency.observe(model, row["latency_sec"])
+                if row.get("ttft_sec") is not None:
+                    self._ttft.observe(model, row["ttft_sec"])
+
+            if rows:
+                tokens_per_sec = rows[0].get("batch_tokens_per_sec")
+                if tokens_per_sec is None:
+                    tokens_per_sec = rows[0].get("tokens_per_sec")
+                if tokens_per_sec is not None:
+                    self._tokens_per_sec[model] = tokens_per_sec
+
+    def record_failures(self, model: str, count: int) -> None:
+        with self._lock:
+            self._requests[(model, "error")] += count
+
+    def track_memory(self, model: str, monitor) -> None:
+        """
+        Report the RSS seen by `monitor` under `model` until `untrack`.
+        """
+        with self._lock:
+            self._monitors[model] = monitor
+
+    def untrack(self, model: str) -> None:
+        with self._lock:
+            self._monitors.pop(model, None)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP llm_bench_requests_total Requests completed, by status.",
+                "# TYPE llm_bench_requests_total counter",
+            ]
+            lines += [
+                f"llm_bench_requests_total{_labels(model=model, status=status)} {count}"
+                for (model, status), count in sorted(self._requests.items())
+            ]
+
+            lines += [
+                "# HELP llm_bench_output_tokens_total Generated tokens.",
+                "# TYPE llm_bench_output_tokens_total counter",
+            ]
+            lines += [
+                f"llm_bench_output_tokens_total{_labels(model=model)} {count}"
+                for model, count in sorted(self._tokens.items())
+            ]
+
+            lines += [
+                "# HELP llm_bench_tokens_per_second Throughput of the latest batch.",
+                "# TYPE llm_bench_tokens_per_second gauge",
+            ]
+            lines += [
+                f"llm_bench_tokens_per_second{_labels(model=model)} {value!r}"
+                for model, value in sorted(self._tokens_per_sec.items())
+            ]
+
+            lines += [
+                "# HELP llm_bench_request_latency_seconds Per-request latency.",
+                "# TYPE llm_bench_request_latency_seconds histogram",
+            ]
+            lines += self._latency.render("llm_bench_request_latency_seconds")
+
+            lines += [
+                "# HELP llm_bench_ttft_seconds Time to first token (streaming runs).",
+                "# TYPE llm_bench_ttft_seconds histogram",
+            ]
+            lines += self._ttft.render("llm_bench_ttft_seconds")
+
+            lines += [
+                "# HELP llm_bench_resident_memory_bytes Process RSS while the model runs.",
+                "# TYPE llm_bench_resident_memory_bytes gauge",
+            ]
+            for model, monitor in sorted(self._monitors.items()):
+                rss_bytes = int(monitor.current_ram_mb() * 1024 ** 2)
+                lines.append(f"llm_bench_resident_memory_bytes{_labels(model=model)} {rss_bytes}")
+
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0].rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    Serve `metrics.render()` at `/metrics` from a background thread, for
+    Prometheus to scrape. Port 0 picks a free port; see `url`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, metrics: LiveMetrics, host: str = "127.0.0.1", port: int = 9464):
+        try:
+            super().__init__((host, port), _MetricsHandler)
+        except OSError as exc:
+            raise BenchmarkError(f"Cannot serve metrics on {host}:{port}: {exc}") from exc
+        self.metrics = metrics
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class TextfileExporter:
+    """
+    Write `metrics.render()` to a `.prom` file for node_exporter's
+    textfile collector, at most once per `interval_seconds` (or when
+    forced). The file is replaced atomically, so the collector never
+    reads a partial write.
+    """
+
+    def __init__(self, metrics: LiveMetrics, path: Path, interval_seconds: float = 5.0):
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self._last_write = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_write < self.interval_seconds:
+            return
+
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.metrics.render(), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._last_write = now
+
+
+def worker_textfile_path(path: Path, pid: int) -> Path:
+    """
+    Per-process textfile name, so concurrent worker processes do not
+    overwrite each other: llm_bench.prom -> llm_bench.<pid>.prom.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{pid}{path.suffix}")
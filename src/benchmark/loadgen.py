@@ -0,0 +1,224 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
+
+import numpy as np
+
+from benchmark.exceptions import InferenceError
+
+
+ARRIVAL_PATTERNS = {"poisson", "constant"}
+
+
+def generate_arrival_offsets(
+    num_requests: int,
+    rate: float,
+    pattern: str = "poisson",
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    Generate request arrival times (seconds from test start) for an
+    open-loop load at `rate` requests per second.
+
+    "poisson" draws exponential inter-arrival gaps, "constant" spaces
+    requests evenly at 1 / rate.
+    """
+    if pattern not in ARRIVAL_PATTERNS:
+        raise ValueError(f"Unsupported arrival pattern: {pattern}")
+
+    if rate <= 0:
+        raise ValueError(f"Request rate must be positive, got {rate}")
+
+    if pattern == "constant":
+        return np.arange(num_requests, dtype=float) / rate
+
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(1.0 / rate, size=num_requests)
+    gaps[0] = 0.0
+    return np.cumsum(gaps)
+
+
+def _serve_request(
+    model,
+    request_id: int,
+    prompt: Dict[str, Any],
+    generation_config: dict,
+    arrival: float,
+    test_start: float,
+) -> Dict[str, Any]:
+    """
+    Run one request and record its queueing and service timeline.
+
+    `arrival` is when the request entered the system; the gap until a
+    worker picks it up is queueing delay, the generation itself is
+    service time. `model` may be any `InferenceBackend` or anything with
+    the same `generate` call, such as a `MicroBatchScheduler`.
+    """
+    start = time.perf_counter()
+    record = {
+        "request_id": request_id,
+        "prompt_id": prompt["id"],
+        "arrival_sec": round(arrival - test_start, 6),
+        "queue_delay_sec": round(start - arrival, 6),
+        "status": "ok",
+        "output_tokens": 0,
+    }
+
+    try:
+        output = model.generate(prompt["prompt"], generation_config)
+        record["output_tokens"] = output["output_tokens"]
+        if output.get("timed_out"):
+            record["status"] = "timeout"
+        record["batch_size"] = output.get("batch_size", 1)
+        record["batch_wait_sec"] = output.get("batch_wait_sec", 0.0)
+        record.update(output.get("timings", {}))
+    except InferenceError as exc:
+        record["status"] = "error"
+        record["error"] = str(exc)
+
+    end = time.perf_counter()
+    record["service_time_sec"] = round(end - start, 6)
+    record["latency_sec"] = round(end - arrival, 6)
+    record["completion_sec"] = round(end - test_start, 6)
+
+    return record
+
+
+def run_open_loop(
+    model,
+    prompts: List[Dict[str, Any]],
+    generation_config: dict,
+    arrival_offsets: np.ndarray,
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """
+    Replay prompts at pre-computed arrival times, independent of how
+    fast the model responds.
+
+    Requests that arrive while all `workers` are busy wait in the
+    executor queue, which shows up as queueing delay.
+    """
+    test_start = time.perf_counter()
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for request_id, offset in enumerate(arrival_offsets):
+            delay = test_start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            futures.append(executor.submit(
+                _serve_request,
+                model,
+                request_id,
+                prompts[request_id % len(prompts)],
+                generation_config,
+                time.perf_counter(),
+                test_start,
+            ))
+
+    return [future.result() for future in futures]
+
+
+def run_closed_loop(
+    model,
+    prompts: List[Dict[str, Any]],
+    generation_config: dict,
+    concurrency: int,
+    num_requests: int,
+) -> List[Dict[str, Any]]:
+    """
+    Keep exactly `concurrency` requests in flight: each worker issues
+    its next request as soon as the previous one completes.
+    """
+    test_start = time.perf_counter()
+    counter = iter(range(num_requests))
+    lock = threading.Lock()
+    records: List[Dict[str, Any]] = []
+
+    def worker():
+        while True:
+            with lock:
+                request_id = next(counter, None)
+            if request_id is None:
+                return
+
+            record = _serve_request(
+                model,
+                request_id,
+                prompts[request_id % len(prompts)],
+                generation_config,
+                time.perf_counter(),
+                test_start,
+            )
+            with lock:
+                records.append(record)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+
+    return sorted(records, key=lambda record: record["request_id"])
+
+
+def summarize_load(
+    records: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Summarize one offered-load level: achieved throughput, tail latency
+    and the split between queueing delay and service time.
+
+    Timed-out requests were served (with partial output) and count
+    towards latency; failed requests do not. Throughput is None when
+    the backend could not count some request's output tokens.
+    """
+    completed = [record for record in records if record["status"] != "error"]
+
+    summary = {
+        "requests": len(records),
+        "failed": len(records) - len(completed),
+        "timed_out": sum(record["status"] == "timeout" for record in records),
+        "achieved_rps": 0.0,
+        "tokens_per_sec": 0.0,
+        "latency_p50_sec": None,
+        "latency_p90_sec": None,
+        "latency_p99_sec": None,
+        "queue_delay_mean_sec": None,
+        "queue_delay_p99_sec": None,
+        "service_time_mean_sec": None,
+        "mean_batch_size": None,
+    }
+
+    if not completed:
+        return summary
+
+    latency = np.array([record["latency_sec"] for record in completed])
+    queue_delay = np.array([record["queue_delay_sec"] for record in completed])
+    service = np.array([record["service_time_sec"] for record in completed])
+    token_counts = [record["output_tokens"] for record in completed]
+
+    makespan = max(record["completion_sec"] for record in completed) - min(
+        record["arrival_sec"] for record in records
+    )
+
+    p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+    summary.update({
+        "achieved_rps": round(len(completed) / makespan, 4) if makespan > 0 else 0.0,
+        "tokens_per_sec": (
+            None if None in token_counts
+            else round(sum(token_counts) / makespan, 4) if makespan > 0
+            else 0.0
+        ),
+        "latency_p50_sec": round(float(p50), 4),
+        "latency_p90_sec": round(float(p90), 4),
+        "latency_p99_sec": round(float(p99), 4),
+        "queue_delay_mean_sec": round(float(queue_delay.mean()), 4),
+        "queue_delay_p99_sec": round(float(np.percentile(queue_delay, 99)), 4),
+        "service_time_mean_sec": round(float(service.mean()), 4),
+        "mean_batch_size": round(
+            float(np.mean([record.get("batch_size", 1) for record in completed])), 2
+        ),
+    })
+
+    return summary
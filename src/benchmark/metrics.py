@@ -1,5 +1,8 @@
+import math
 import time
-from typing import Dict, Set
+from typing import Dict, List, Optional, Set
+
+import numpy as np
 
 
 def measure_latency(func, *args, **kwargs) -> tuple[float, any]:
@@ -27,9 +30,25 @@ def compute_throughput(tokens_generated: int, latency_seconds: float) -> float:
     return tokens_generated / latency_seconds
 
 
+def compute_padding_efficiency(prompt_lengths: List[int]) -> float:
+    """
+    Compute the share of a padded batch that is real prompt tokens:
+        sum(lengths) / (batch_size * max(lengths))
+
+    1.0 means no padding; low values mean most of the prefill compute
+    went into pad positions.
+    """
+    if not prompt_lengths or max(prompt_lengths) == 0:
+        return 1.0
+    return sum(prompt_lengths) / (len(prompt_lengths) * max(prompt_lengths))
+
+
 def compute_output_length(output_text: str) -> int:
     """
-    Compute output length in number of tokens (whitespace-based).
+    Compute output length in whitespace-separated words.
+
+    This is a tokenizer-independent quality signal; throughput uses
+    the model tokenizer's count of generated tokens instead.
     """
     if not output_text:
         return 0
@@ -52,21 +71,228 @@ def compute_vocabulary_diversity(output_text: str) -> float:
     return len(unique_tokens) / len(tokens)
 
 
+def compute_token_latencies(
+    token_times: List[float],
+    prompt_tokens: int = 0,
+) -> Dict[str, Optional[float]]:
+    """
+    Compute streaming latency metrics from per-token timestamps.
+
+    `token_times` are seconds since the request started, one per
+    generated token. The first token closes the prefill phase, so:
+
+        ttft            = token_times[0]
+        inter-token     = diffs between consecutive timestamps
+        prefill tok/s   = prompt_tokens / ttft
+        decode tok/s    = (n - 1) / (token_times[-1] - token_times[0])
+    """
+    metrics: Dict[str, Optional[float]] = {
+        "ttft_sec": None,
+        "itl_mean_sec": None,
+        "itl_p50_sec": None,
+        "itl_p99_sec": None,
+        "prefill_tokens_per_sec": None,
+        "decode_tokens_per_sec": None,
+    }
+
+    if not token_times:
+        return metrics
+
+    ttft = token_times[0]
+    metrics["ttft_sec"] = round(ttft, 4)
+    metrics["prefill_tokens_per_sec"] = round(
+        compute_throughput(prompt_tokens, ttft), 4
+    )
+
+    if len(token_times) > 1:
+        inter_token = np.diff(np.asarray(token_times, dtype=float))
+        metrics["itl_mean_sec"] = round(float(inter_token.mean()), 6)
+        metrics["itl_p50_sec"] = round(float(np.percentile(inter_token, 50)), 6)
+        metrics["itl_p99_sec"] = round(float(np.percentile(inter_token, 99)), 6)
+        metrics["decode_tokens_per_sec"] = round(
+            compute_throughput(
+                len(token_times) - 1,
+                token_times[-1] - token_times[0],
+            ),
+            4,
+        )
+
+    return metrics
+
+
 def aggregate_metrics(
     latency: float,
-    tokens_generated: int,
+    tokens_generated: Optional[int],
     output_text: str,
-) -> Dict[str, float]:
+    prompt_tokens: int = 0,
+    token_times: Optional[List[float]] = None,
+) -> Dict[str, Optional[float]]:
     """
     Aggregate all metrics into a single dictionary.
+
+    `tokens_generated` must count only newly generated tokens, so
+    `tokens_per_sec` reflects generation speed rather than prompt
+    length; when the backend could not count them (None), so is
+    `tokens_per_sec`. Streaming metrics (TTFT, inter-token latency,
+    prefill/decode throughput) are None unless `token_times` is provided.
     """
-    throughput = compute_throughput(tokens_generated, latency)
+    throughput = (
+        compute_throughput(tokens_generated, latency)
+        if tokens_generated is not None else None
+    )
     output_length = compute_output_length(output_text)
     vocab_diversity = compute_vocabulary_diversity(output_text)
 
     return {
         "latency_sec": round(latency, 4),
-        "tokens_per_sec": round(throughput, 4),
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": tokens_generated,
+        "tokens_per_sec": round(throughput, 4) if throughput is not None else None,
         "output_length": output_length,
         "vocab_diversity": round(vocab_diversity, 4),
+        **compute_token_latencies(token_times or [], prompt_tokens),
+    }
+
+
+def _bootstrap_means(arr: np.ndarray, n_bootstrap: int, rng) -> np.ndarray:
+    """
+    Means of `n_bootstrap` resamples (with replacement) of `arr`.
+
+    Vectorized, processed in chunks so memory stays bounded for large
+    sample counts.
+    """
+    chunk = max(1, min(n_bootstrap, 10_000_000 // arr.size))
+
+    boot_means = np.empty(n_bootstrap)
+    for start in range(0, n_bootstrap, chunk):
+        size = min(chunk, n_bootstrap - start)
+        idx = rng.integers(0, arr.size, size=(size, arr.size))
+        boot_means[start:start + size] = arr[idx].mean(axis=1)
+
+    return boot_means
+
+
+def compute_distribution_stats(
+    values,
+    n_bootstrap: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    Summarize repeated measurements of one metric.
+
+    Returns mean, sample standard deviation, p50/p90/p99 and a
+    percentile-bootstrap confidence interval for the mean. NaNs are
+    ignored.
+    """
+    arr = np.asarray(values, dtype=float)
+    arr = arr[~np.isnan(arr)]
+
+    stats = {
+        "n": int(arr.size),
+        "mean": float("nan"),
+        "std": float("nan"),
+        "p50": float("nan"),
+        "p90": float("nan"),
+        "p99": float("nan"),
+        "ci_low": float("nan"),
+        "ci_high": float("nan"),
+    }
+
+    if arr.size == 0:
+        return stats
+
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    stats.update({
+        "mean": float(arr.mean()),
+        "std": float(arr.std(ddof=1)) if arr.size > 1 else 0.0,
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+    })
+
+    boot_means = _bootstrap_means(arr, n_bootstrap, np.random.default_rng(seed))
+
+    alpha = (1.0 - confidence) / 2.0
+    ci_low, ci_high = np.percentile(boot_means, [100 * alpha, 100 * (1 - alpha)])
+    stats["ci_low"] = float(ci_low)
+    stats["ci_high"] = float(ci_high)
+
+    return stats
+
+
+def mann_whitney_u(a, b) -> Dict[str, float]:
+    """
+    Two-sided Mann-Whitney U test of whether samples `a` and `b` come
+    from the same distribution.
+
+    Uses the normal approximation with tie and continuity corrections,
+    which is accurate for the sample sizes a benchmark produces (more
+    than ~10 per side). NaNs are ignored.
+    """
+    x = np.asarray(a, dtype=float)
+    y = np.asarray(b, dtype=float)
+    x, y = x[~np.isnan(x)], y[~np.isnan(y)]
+
+    n1, n2 = x.size, y.size
+    if n1 == 0 or n2 == 0:
+        return {"u": float("nan"), "p_value": float("nan")}
+
+    combined = np.concatenate([x, y])
+    _, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+
+    # Average rank of each distinct value, shared by its ties
+    upper = np.cumsum(counts)
+    ranks = (upper - (counts - 1) / 2.0)[inverse]
+
+    u = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2.0)
+
+    n = n1 + n2
+    tie_term = float((counts ** 3 - counts).sum()) / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+
+    if sigma == 0:
+        return {"u": u, "p_value": 1.0}
+
+    z = max(abs(u - n1 * n2 / 2.0) - 0.5, 0.0) / sigma
+    return {"u": u, "p_value": float(math.erfc(z / math.sqrt(2.0)))}
+
+
+def bootstrap_mean_diff(
+    differences,
+    n_bootstrap: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    Bootstrap the mean of paired differences (candidate - baseline,
+    one per prompt).
+
+    Returns the observed mean difference, a percentile confidence
+    interval and a two-sided p-value: twice the share of bootstrap
+    means on the far side of zero.
+    """
+    arr = np.asarray(differences, dtype=float)
+    arr = arr[~np.isnan(arr)]
+
+    if arr.size == 0:
+        return {
+            "mean_diff": float("nan"),
+            "ci_low": float("nan"),
+            "ci_high": float("nan"),
+            "p_value": float("nan"),
+        }
+
+    boot_means = _bootstrap_means(arr, n_bootstrap, np.random.default_rng(seed))
+
+    alpha = (1.0 - confidence) / 2.0
+    ci_low, ci_high = np.percentile(boot_means, [100 * alpha, 100 * (1 - alpha)])
+
+    tail = min((boot_means <= 0).mean(), (boot_means >= 0).mean())
+
+    return {
+        "mean_diff": float(arr.mean()),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+        "p_value": float(min(1.0, 2.0 * tail)),
     }
@@ -0,0 +1,87 @@
+import gc
+import logging
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class ModelCache:
+    """
+    In-process LRU cache of loaded models, bounded by a memory budget.
+
+    Sweeps that benchmark the same weights under several configs reuse
+    the loaded model instead of paying cold start again. When adding a
+    model would exceed `max_memory_mb`, least recently used models are
+    evicted first; a model larger than the whole budget is returned
+    but not cached.
+
+    Models must provide `memory_footprint_mb()` and `close()`; evicted
+    models are closed.
+    """
+
+    def __init__(self, max_memory_mb: float):
+        self.max_memory_mb = max_memory_mb
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def used_mb(self) -> float:
+        return sum(size for _, size in self._entries.values())
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+    ) -> tuple[Any, bool]:
+        """
+        Return (model, cache_hit), calling `loader()` on a miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0], True
+
+        self.misses += 1
+        model = loader()
+        size_mb = model.memory_footprint_mb()
+
+        if size_mb > self.max_memory_mb:
+            logging.warning(
+                f"Model {key} ({size_mb:.0f} MB) exceeds the model cache "
+                f"budget of {self.max_memory_mb:.0f} MB; not caching it"
+            )
+            return model, False
+
+        while self._entries and self.used_mb + size_mb > self.max_memory_mb:
+            self._evict_oldest()
+
+        self._entries[key] = (model, size_mb)
+        return model, False
+
+    def _evict_oldest(self) -> None:
+        key, (model, size_mb) = self._entries.popitem(last=False)
+        logging.info(f"Evicting {key} ({size_mb:.0f} MB) from model cache")
+        model.close()
+        self._release_memory()
+
+    def clear(self) -> None:
+        for model, _ in self._entries.values():
+            model.close()
+        self._entries.clear()
+        self._release_memory()
+
+    @staticmethod
+    def _release_memory() -> None:
+        gc.collect()
+
+        # Only served models were cached if torch was never imported
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
@@ -1,13 +1,163 @@
+import logging
+import threading
+import time
+from functools import partial
+
+import numpy as np
+import psutil
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
+from transformers.generation.streamers import BaseStreamer
 
+from benchmark.backend import InferenceBackend
 from benchmark.exceptions import ModelLoadError, InferenceError
+from benchmark.monitor import ResourceMonitor
+
+
+class TokenTimer(BaseStreamer):
+    """
+    Streamer that timestamps every decoding step of `model.generate`.
+
+    The first `put` carries the prompt ids and is ignored; each later
+    call delivers the new tokens of that step: one per sequence for
+    regular decoding, or a (1, n) block of accepted tokens for assisted
+    decoding, which all share the step's timestamp. Times are seconds
+    relative to `start_time`. `on_first_token` is called as the first
+    new tokens arrive, i.e. when prefill ends.
+    """
+
+    def __init__(self, start_time: float, on_first_token=None):
+        self.start_time = start_time
+        self.step_times: list[float] = []
+        self.on_first_token = on_first_token
+        self._prompt_seen = False
+
+    def put(self, value):
+        now = time.perf_counter()
+        if not self._prompt_seen:
+            self._prompt_seen = True
+            return
+        if not self.step_times and self.on_first_token is not None:
+            self.on_first_token()
+        tokens = value.shape[-1] if value.dim() == 2 else 1
+        self.step_times.extend([now - self.start_time] * tokens)
+
+    def end(self):
+        pass
+
+
+class AcceptanceCounter:
+    """
+    Counts draft tokens proposed by the assistant model and accepted by
+    the target model during assisted (speculative) generation.
+
+    `wrap` instruments the candidate generator that `generate` creates,
+    so the counts come straight from the decoding loop.
+    """
+
+    def __init__(self):
+        self.proposed = 0
+        self.accepted = 0
+
+    @property
+    def acceptance_rate(self) -> float | None:
+        if self.proposed == 0:
+            return None
+        return self.accepted / self.proposed
+
+    def wrap(self, candidate_generator):
+        get_candidates = candidate_generator.get_candidates
+        update_candidate_strategy = candidate_generator.update_candidate_strategy
 
+        def counted_get_candidates(input_ids):
+            candidate_ids, candidate_logits = get_candidates(input_ids)
+            self.proposed += candidate_ids.shape[1] - input_ids.shape[1]
+            return candidate_ids, candidate_logits
+
+        def counted_update(input_ids, scores, num_matches):
+            self.accepted += int(num_matches)
+            return update_candidate_strategy(input_ids, scores, num_matches)
+
+        candidate_generator.get_candidates = counted_get_candidates
+        candidate_generator.update_candidate_strategy = counted_update
+        return candidate_generator
+
+
+class DeadlineCriteria(StoppingCriteria):
+    """
+    Stopping criterion that ends generation once a wall-clock deadline
+    has passed.
 
-class HuggingFaceModel:
+    It is checked after every decoding step, so a runaway generation
+    stops at the next token boundary and keeps its partial output. A
+    single forward pass already in progress cannot be interrupted.
+    """
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.triggered = False
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if time.perf_counter() >= self.deadline:
+            self.triggered = True
+
+        return torch.full(
+            (input_ids.shape[0],),
+            self.triggered,
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+
+def _tensor_bytes(value, seen: set) -> int:
+    """
+    Total bytes of the tensors in `value` (a tensor or nested
+    tuples/lists of tensors), skipping storage already in `seen`.
+    """
+    if isinstance(value, torch.Tensor):
+        if value.data_ptr() in seen:
+            return 0
+        seen.add(value.data_ptr())
+        return value.element_size() * value.nelement()
+
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item, seen) for item in value)
+
+    return 0
+
+
+class HuggingFaceModel(InferenceBackend):
     """
     Wrapper around Hugging Face causal language models
     for safe loading and inference.
+
+    `dtype` is one of float32, float16, bfloat16 or int8; int8 loads
+    float32 weights and applies dynamic quantization to the Linear
+    layers (CPU only). `low_cpu_mem_usage` assigns checkpoint tensors
+    straight into the model instead of materializing a randomly
+    initialized copy first; combined with safetensors checkpoints the
+    weights are read from a memory map, and on CUDA they are placed on
+    the device as they load rather than moved afterwards.
+
+    Backend options: `attn_implementation` selects the attention kernel
+    ("eager", "sdpa", ...); `compile_mode` wraps the forward pass in
+    `torch.compile` (compilation happens lazily on the first call);
+    `grad_mode` runs inference under `torch.no_grad` or
+    `torch.inference_mode`.
+
+    With an `assistant_id`, generation is assisted (speculative): the
+    small draft model proposes tokens that the target model verifies in
+    one forward pass. The draft must share the target's tokenizer, and
+    assisted generation handles one sequence at a time.
+
+    While a `phase_recorder` (see `benchmark.profiling.PhaseRecorder`)
+    is attached, every generate call reports its tokenize, prefill,
+    decode and detokenize phases to it.
     """
 
     def __init__(
@@ -15,89 +165,621 @@ class HuggingFaceModel:
         model_id: str,
         device: str = "cpu",
         dtype: str = "float32",
+        timeout_seconds: float | None = None,
+        low_cpu_mem_usage: bool = False,
+        use_safetensors: bool | None = None,
+        assistant_id: str | None = None,
+        assistant_dtype: str | None = None,
+        num_assistant_tokens: int | None = None,
+        attn_implementation: str | None = None,
+        compile_mode: str | None = None,
+        grad_mode: str = "no_grad",
     ):
         self.model_id = model_id
         self.device = device
         self.dtype = dtype
+        self.timeout_seconds = timeout_seconds
+        self.low_cpu_mem_usage = low_cpu_mem_usage
+        self.use_safetensors = use_safetensors
+        self.assistant_id = assistant_id
+        self.assistant_dtype = assistant_dtype or dtype
+        self.num_assistant_tokens = num_assistant_tokens
+        self.attn_implementation = attn_implementation
+        self.compile_mode = compile_mode
+        self.grad_mode = grad_mode
 
         self.tokenizer = None
         self.model = None
+        self.assistant_model = None
+        self.load_stats = None
+        self.phase_recorder = None
+
+        # Per-thread acceptance counter of the assisted call in flight
+        self._acceptance = threading.local()
+
+        # Shared prompt prefix (see `set_prefix`)
+        self._prefix_ids = None
+        self._prefix_cache = None
+        self.prefix_stats = None
+        self._special_affixes = None
+
+        # Fast (Rust) tokenizers raise "Already borrowed" when padding
+        # is applied from several threads at once; the load generator
+        # calls generate concurrently.
+        self._tokenizer_lock = threading.Lock()
 
         self._load_model()
 
-    def _get_torch_dtype(self):
-        if self.dtype == "float16":
+    def _get_torch_dtype(self, dtype: str | None = None):
+        dtype = dtype or self.dtype
+        if dtype == "float16":
             return torch.float16
+        if dtype == "bfloat16":
+            return torch.bfloat16
+        # int8 is quantized from float32 weights after loading
         return torch.float32
 
-    def _load_model(self):
+    def _load_assistant(self) -> None:
         """
-        Load tokenizer and model safely.
+        Load the draft model for assisted generation and route the
+        target model's candidate generator through `AcceptanceCounter`.
         """
-        try:
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.model_id,
-                use_fast=True,
+        self.assistant_model = AutoModelForCausalLM.from_pretrained(
+            self.assistant_id,
+            torch_dtype=self._get_torch_dtype(self.assistant_dtype),
+        )
+        self.assistant_model.to(self.device)
+        self.assistant_model.eval()
+
+        if self.num_assistant_tokens is not None:
+            # A fixed draft length keeps runs comparable; the default
+            # heuristic adapts it from call to call.
+            self.assistant_model.generation_config.num_assistant_tokens = (
+                self.num_assistant_tokens
+            )
+            self.assistant_model.generation_config.num_assistant_tokens_schedule = (
+                "constant"
             )
 
-            if self.tokenizer.pad_token is None:
-                self.tokenizer.pad_token = self.tokenizer.eos_token
+        get_candidate_generator = self.model._get_candidate_generator
+
+        def counted_candidate_generator(*args, **kwargs):
+            candidate_generator = get_candidate_generator(*args, **kwargs)
+            counter = getattr(self._acceptance, "counter", None)
+            if counter is not None:
+                counter.wrap(candidate_generator)
+            return candidate_generator
 
-            self.model = AutoModelForCausalLM.from_pretrained(
-                self.model_id,
-                torch_dtype=self._get_torch_dtype(),
+        self.model._get_candidate_generator = counted_candidate_generator
+
+    def _quantize_int8(self) -> None:
+        """
+        Replace Linear layers with dynamically quantized int8 versions:
+        weights are stored as int8, activations are quantized on the fly.
+        """
+        if self.device != "cpu":
+            raise ModelLoadError("int8 dynamic quantization is only supported on CPU")
+
+        torch.ao.quantization.quantize_dynamic(
+            self.model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+            inplace=True,
+        )
+
+        quantized = sum(
+            isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+            for module in self.model.modules()
+        )
+        if quantized == 0:
+            logging.warning(
+                f"No Linear layers to quantize in '{self.model_id}'; "
+                "the int8 variant runs in float32"
             )
+        else:
+            logging.info(f"Quantized {quantized} Linear layers of '{self.model_id}' to int8")
+
+    def _load_model(self):
+        """
+        Load tokenizer and model safely, timing each stage.
+
+        `load_stats` breaks cold-start cost down into tokenizer load,
+        weight load (deserialization) and the move to the target device,
+        along with peak process RSS while loading.
+        """
+        monitor = ResourceMonitor(
+            monitor_gpu=(self.device == "cuda"),
+            interval=0.005,
+        )
+        rss_before_mb = psutil.Process().memory_info().rss / (1024 ** 2)
+
+        try:
+            with monitor:
+                start = time.perf_counter()
+
+                self.tokenizer = AutoTokenizer.from_pretrained(
+                    self.model_id,
+                    use_fast=True,
+                )
+
+                if self.tokenizer.pad_token is None:
+                    self.tokenizer.pad_token = self.tokenizer.eos_token
+
+                # Decoder-only models continue from the last position,
+                # so batched prompts must be padded on the left.
+                self.tokenizer.padding_side = "left"
+
+                tokenizer_done = time.perf_counter()
+
+                load_kwargs = {
+                    "torch_dtype": self._get_torch_dtype(),
+                    "low_cpu_mem_usage": self.low_cpu_mem_usage,
+                }
+                if self.use_safetensors is not None:
+                    load_kwargs["use_safetensors"] = self.use_safetensors
+                if self.attn_implementation is not None:
+                    load_kwargs["attn_implementation"] = self.attn_implementation
 
-            self.model.to(self.device)
-            self.model.eval()
+                loads_on_device = self.low_cpu_mem_usage and self.device != "cpu"
+                if loads_on_device:
+                    load_kwargs["device_map"] = self.device
+
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model_id,
+                    **load_kwargs,
+                )
+
+                weights_done = time.perf_counter()
+
+                if not loads_on_device:
+                    self.model.to(self.device)
+                self.model.eval()
+
+                if self.device == "cuda":
+                    torch.cuda.synchronize()
+
+                device_done = time.perf_counter()
+
+                if self.dtype == "int8":
+                    self._quantize_int8()
+
+                quantize_done = time.perf_counter()
+
+                if self.assistant_id:
+                    self._load_assistant()
+
+                assistant_done = time.perf_counter()
+
+                if self.compile_mode is not None:
+                    # Lazy: the compile cost lands on the first forward pass
+                    self.model.forward = torch.compile(
+                        self.model.forward,
+                        mode=self.compile_mode,
+                    )
+
+                end = time.perf_counter()
 
         except Exception as exc:
             raise ModelLoadError(
                 f"Failed to load model '{self.model_id}': {exc}"
             ) from exc
 
+        finally:
+            monitor.cleanup()
+
+        self.load_stats = {
+            "tokenizer_load_sec": round(tokenizer_done - start, 4),
+            "weights_load_sec": round(weights_done - tokenizer_done, 4),
+            "to_device_sec": round(device_done - weights_done, 4),
+            "quantize_sec": round(quantize_done - device_done, 4),
+            "assistant_load_sec": round(assistant_done - quantize_done, 4),
+            "compile_setup_sec": round(end - assistant_done, 4),
+            "load_total_sec": round(end - start, 4),
+            "load_peak_rss_mb": monitor.stats["peak_ram_mb"],
+            "load_rss_delta_mb": round(
+                monitor.stats["peak_ram_mb"] - rss_before_mb, 2
+            ),
+            "load_peak_gpu_mb": monitor.stats["peak_gpu_mb"],
+        }
+
+    def _grad_context(self):
+        """
+        Autograd-free context for inference. `inference_mode` also skips
+        view and version-counter tracking, which can shave per-op
+        overhead on CPU.
+        """
+        if self.grad_mode == "inference_mode":
+            return torch.inference_mode()
+        return torch.no_grad()
+
+    def memory_footprint_mb(self) -> float:
+        """
+        Memory held by the model's weights and buffers.
+
+        Besides parameters and buffers, the state dict is walked so
+        packed int8 weights of quantized layers are counted; shared
+        (tied) tensors are counted once.
+        """
+        seen = set()
+        total = (
+            _tensor_bytes(list(self.model.parameters()), seen)
+            + _tensor_bytes(list(self.model.buffers()), seen)
+            + _tensor_bytes(list(self.model.state_dict().values()), seen)
+        )
+
+        return round(total / (1024 ** 2), 2)
+
+    def set_prefix(self, prefix: str | None, use_cache: bool = True) -> None:
+        """
+        Prepend `prefix` (e.g. a shared system prompt) to every prompt.
+
+        With `use_cache`, the prefix is prefilled once here and its
+        past_key_values are reused by every later generate call, so
+        each call only prefills the prompt-specific suffix. Without it,
+        the same prefix tokens are recomputed on every call, which makes
+        the two settings directly comparable. `None` clears the prefix.
+        """
+        if not prefix:
+            self._prefix_ids = None
+            self._prefix_cache = None
+            self.prefix_stats = None
+            return
+
+        with self._tokenizer_lock:
+            prefix_ids = self.tokenizer(prefix)["input_ids"]
+
+        self.set_prefix_ids(prefix_ids, use_cache)
+
+    def set_prefix_ids(self, prefix_ids, use_cache: bool = True) -> None:
+        """
+        Same as `set_prefix`, for an already tokenized prefix.
+
+        `prefix_stats` records the prefix length and, when cached, the
+        one-off prefill time and the memory held by its KV cache.
+        """
+        self._prefix_ids = torch.as_tensor(list(prefix_ids), dtype=torch.long)
+        self._prefix_cache = None
+        self.prefix_stats = {
+            "prefix_tokens": len(self._prefix_ids),
+            "prefix_cached": use_cache,
+            "prefix_prefill_sec": None,
+            "prefix_cache_mb": None,
+        }
+
+        if not use_cache:
+            return
+
+        try:
+            start = time.perf_counter()
+
+            with self._grad_context():
+                outputs = self.model(
+                    input_ids=self._prefix_ids.unsqueeze(0).to(self.device),
+                    use_cache=True,
+                )
+
+            if self.device == "cuda":
+                torch.cuda.synchronize()
+
+            prefill_sec = time.perf_counter() - start
+
+        except RuntimeError as exc:
+            raise InferenceError(
+                f"Prefix prefill failed for model '{self.model_id}': {exc}"
+            ) from exc
+
+        cache = outputs.past_key_values
+        if hasattr(cache, "to_legacy_cache"):
+            cache = cache.to_legacy_cache()
+        self._prefix_cache = cache
+
+        self.prefix_stats.update({
+            "prefix_prefill_sec": round(prefill_sec, 6),
+            "prefix_cache_mb": round(_tensor_bytes(cache, set()) / (1024 ** 2), 4),
+        })
+
+    def _prefixed_inputs(self, suffix_ids: list) -> dict:
+        """
+        Build [prefix][padding][suffix] inputs for a batch.
+
+        Keeping the prefix at the same positions in every row lets all
+        rows share one prefix KV cache; the padding between prefix and
+        suffix is masked out, and positions are derived from the
+        attention mask, so each suffix continues right after the prefix.
+        """
+        suffix = self._pad_token_ids(suffix_ids)
+        batch_size = suffix["input_ids"].shape[0]
+
+        prefix = self._prefix_ids.unsqueeze(0).expand(batch_size, -1)
+
+        return {
+            "input_ids": torch.cat([prefix, suffix["input_ids"]], dim=1),
+            "attention_mask": torch.cat(
+                [torch.ones_like(prefix), suffix["attention_mask"]], dim=1
+            ),
+        }
+
+    def _special_token_affixes(self) -> tuple:
+        """
+        The (leading, trailing) ids the tokenizer adds around any text
+        by default, e.g. ([bos], []) for Llama-style tokenizers.
+        """
+        if self._special_affixes is None:
+            with self._tokenizer_lock:
+                with_special = self.tokenizer("a")["input_ids"]
+                plain = self.tokenizer("a", add_special_tokens=False)["input_ids"]
+
+            affixes = ([], [])
+            for start in range(len(with_special) - len(plain) + 1):
+                if with_special[start:start + len(plain)] == plain:
+                    affixes = (with_special[:start], with_special[start + len(plain):])
+                    break
+
+            self._special_affixes = affixes
+
+        return self._special_affixes
+
+    def _strip_special_tokens(self, input_ids: list) -> list:
+        """
+        Drop the default special tokens from pre-tokenized prompts (e.g.
+        token cache ids), so a suffix following the prefix gets no BOS
+        in between: the same ids as tokenizing it without special tokens.
+        """
+        leading, trailing = self._special_token_affixes()
+        if not leading and not trailing:
+            return input_ids
+
+        stripped = []
+        for ids in input_ids:
+            ids = list(ids)
+            if leading and ids[:len(leading)] == leading:
+                ids = ids[len(leading):]
+            if trailing and ids[len(ids) - len(trailing):] == trailing:
+                ids = ids[:len(ids) - len(trailing)]
+            stripped.append(ids)
+
+        return stripped
+
+    def _expanded_prefix_cache(self, batch_size: int) -> tuple:
+        """
+        View the single-sequence prefix cache as a batch without copying;
+        generate extends it by concatenation, leaving the original intact.
+        """
+        return tuple(
+            tuple(t.expand(batch_size, *t.shape[1:]) for t in layer)
+            for layer in self._prefix_cache
+        )
+
     def generate(
         self,
         prompt: str,
         generation_config: dict,
-    ) -> tuple[str, int]:
+    ) -> dict:
+        """
+        Run safe text generation for a single prompt.
+
+        Returns the same dict as one entry of `generate_batch`: the
+        decoded completion (prompt excluded) and token counts taken
+        from the model's own tokenizer.
         """
-        Run safe text generation.
+        return self.generate_batch([prompt], generation_config)[0]
 
-        Returns:
-            output_text (str)
-            output_tokens (int)
+    def generate_batch(
+        self,
+        prompts: list[str],
+        generation_config: dict,
+        input_ids: list | None = None,
+    ) -> list[dict]:
         """
+        Run text generation for several prompts in a single
+        `model.generate` call.
+
+        `input_ids` optionally supplies pre-tokenized prompts (one id
+        sequence per prompt, e.g. from a `TokenCache`), in which case
+        the tokenizer is skipped entirely. With a prefix set (see
+        `set_prefix`), prompts are the suffixes that follow it, and
+        default special tokens (e.g. BOS) are stripped from supplied ids.
+
+        Prompts are left-padded to a common length, so the newly
+        generated tokens of every sequence start at the same position.
+        With `generation_config["streaming"]` enabled, every decoding
+        step is timestamped for TTFT and inter-token latency. When the
+        model has a `timeout_seconds`, generation stops at the first
+        token boundary past the deadline and unfinished sequences are
+        flagged `timed_out` with their partial output.
+
+        Returns one dict per prompt, in prompt order:
+            output_text (str): decoded completion, prompt excluded
+            output_tokens (int): newly generated tokens only
+            prompt_tokens (int): prompt tokens, padding excluded
+            token_times (list[float] | None): seconds since the call started
+            timed_out (bool)
+            acceptance_rate (float | None): accepted / proposed draft
+                tokens, with an assistant model only
+        """
+        if not prompts:
+            return []
+
+        if self.assistant_model is not None and len(prompts) > 1:
+            # Assisted generation only supports one sequence per call
+            return [
+                result
+                for i, prompt in enumerate(prompts)
+                for result in self.generate_batch(
+                    [prompt],
+                    generation_config,
+                    input_ids=None if input_ids is None else [input_ids[i]],
+                )
+            ]
+
+        recorder = self.phase_recorder
+
         try:
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                padding=True,
-            )
+            start_time = time.perf_counter()
+            streaming = generation_config.get("streaming", False)
+            streamer = None
+            if streaming or recorder is not None:
+                streamer = TokenTimer(
+                    start_time,
+                    on_first_token=(
+                        partial(recorder.start, "decode") if recorder is not None else None
+                    ),
+                )
+
+            deadline = None
+            stopping_criteria = None
+            if self.timeout_seconds:
+                deadline = DeadlineCriteria(start_time + self.timeout_seconds)
+                stopping_criteria = StoppingCriteriaList([deadline])
+
+            max_new_tokens = generation_config.get("max_new_tokens", 128)
+
+            generate_kwargs = {}
+
+            if recorder is not None:
+                recorder.start("tokenize")
+
+            if self._prefix_ids is not None:
+                if input_ids is None:
+                    with self._tokenizer_lock:
+                        input_ids = self.tokenizer(
+                            prompts, add_special_tokens=False
+                        )["input_ids"]
+                else:
+                    input_ids = self._strip_special_tokens(input_ids)
+
+                inputs = self._prefixed_inputs(input_ids)
+
+                # The draft model would need its own prefix cache
+                if self._prefix_cache is not None and self.assistant_model is None:
+                    generate_kwargs["past_key_values"] = self._expanded_prefix_cache(
+                        len(input_ids)
+                    )
+            elif input_ids is not None:
+                inputs = self._pad_token_ids(input_ids)
+            else:
+                with self._tokenizer_lock:
+                    inputs = self.tokenizer(
+                        prompts,
+                        return_tensors="pt",
+                        padding=True,
+                    )
 
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
-            with torch.no_grad():
+            counter = None
+            if self.assistant_model is not None:
+                counter = AcceptanceCounter()
+                self._acceptance.counter = counter
+                generate_kwargs["assistant_model"] = self.assistant_model
+
+            if recorder is not None:
+                # The streamer switches to "decode" at the first new token
+                recorder.start("prefill")
+
+            with self._grad_context():
                 outputs = self.model.generate(
                     **inputs,
-                    max_new_tokens=generation_config.get("max_new_tokens", 128),
+                    max_new_tokens=max_new_tokens,
                     temperature=generation_config.get("temperature", 0.7),
                     top_p=generation_config.get("top_p", 0.9),
                     do_sample=generation_config.get("do_sample", True),
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    streamer=streamer,
+                    stopping_criteria=stopping_criteria,
+                    **generate_kwargs,
                 )
 
-            generated_ids = outputs[0]
-            output_text = self.tokenizer.decode(
-                generated_ids,
-                skip_special_tokens=True,
-            )
+            if recorder is not None:
+                recorder.start("detokenize")
+
+            input_length = inputs["input_ids"].shape[1]
+            prompt_lengths = inputs["attention_mask"].sum(dim=1).tolist()
 
-            output_tokens = len(generated_ids)
+            results = []
+            for sequence, prompt_tokens in zip(outputs, prompt_lengths):
+                new_ids = sequence[input_length:]
+                new_tokens = self._count_new_tokens(new_ids)
+                finished = (
+                    new_tokens == 0
+                    or new_tokens < new_ids.shape[0]
+                    or new_tokens == max_new_tokens
+                    or new_ids[new_tokens - 1] == self.tokenizer.eos_token_id
+                )
+                with self._tokenizer_lock:
+                    output_text = self.tokenizer.decode(
+                        new_ids[:new_tokens],
+                        skip_special_tokens=True,
+                    )
 
-            return output_text, output_tokens
+                results.append({
+                    "output_text": output_text,
+                    "output_tokens": new_tokens,
+                    "prompt_tokens": int(prompt_tokens),
+                    "token_times": (
+                        streamer.step_times[:new_tokens]
+                        if streaming
+                        else None
+                    ),
+                    "timed_out": bool(
+                        deadline is not None and deadline.triggered and not finished
+                    ),
+                    "acceptance_rate": (
+                        counter.acceptance_rate if counter is not None else None
+                    ),
+                })
+
+            return results
 
         except RuntimeError as exc:
             # Typical OOM or CUDA failure
             raise InferenceError(
-                f"Inference failed for model '{self.model_id}': {exc}"
+                f"Batched inference failed for model '{self.model_id}': {exc}"
             ) from exc
+
+        finally:
+            self._acceptance.counter = None
+            if recorder is not None:
+                recorder.stop()
+
+    def _pad_token_ids(self, input_ids: list) -> dict:
+        """
+        Left-pad pre-tokenized prompts into the same tensors the
+        tokenizer would produce with `padding=True`.
+        """
+        max_length = max(len(ids) for ids in input_ids)
+
+        ids_tensor = torch.full(
+            (len(input_ids), max_length),
+            self.tokenizer.pad_token_id,
+            dtype=torch.long,
+        )
+        attention_mask = torch.zeros((len(input_ids), max_length), dtype=torch.long)
+
+        for row, ids in enumerate(input_ids):
+            if len(ids):
+                # Copy: cached ids are read-only memory-mapped views
+                ids_tensor[row, max_length - len(ids):] = torch.from_numpy(
+                    np.array(ids, dtype=np.int64)
+                )
+                attention_mask[row, max_length - len(ids):] = 1
+
+        return {"input_ids": ids_tensor, "attention_mask": attention_mask}
+
+    def _count_new_tokens(self, new_ids) -> int:
+        """
+        Count generated tokens up to and including the first EOS.
+
+        Sequences that finish early are padded with `pad_token_id`
+        until the longest sequence in the batch is done; that padding
+        is not generated work and must not count towards throughput.
+        """
+        eos_token_id = self.tokenizer.eos_token_id
+        if eos_token_id is None:
+            return int(new_ids.shape[0])
+
+        eos_positions = (new_ids == eos_token_id).nonzero()
+        if len(eos_positions) == 0:
+            return int(new_ids.shape[0])
+
+        return int(eos_positions[0][0]) + 1
@@ -1,3 +1,5 @@
+import math
+import threading
 import time
 import psutil
 
@@ -12,11 +14,25 @@ except ImportError:
 
 class ResourceMonitor:
     """
-    Monitor peak RAM and GPU memory usage during inference.
+    Monitor peak and mean RAM / GPU memory usage during inference.
+
+    Memory is polled on a daemon thread for as long as the monitor is
+    running, so peaks are observed while generation is in flight:
+
+        with monitor:
+            model.generate_batch(...)
+        stats = monitor.stats
     """
 
-    def __init__(self, monitor_gpu: bool = True):
+    def __init__(
+        self,
+        monitor_gpu: bool = True,
+        interval: float = 0.01,
+        max_series_points: int = 64,
+    ):
         self.monitor_gpu = monitor_gpu and _NVML_AVAILABLE
+        self.interval = interval
+        self.max_series_points = max_series_points
 
         self._process = psutil.Process()
         self._peak_ram_mb = 0.0
@@ -24,6 +40,14 @@ class ResourceMonitor:
         self._gpu_handle = None
         self._peak_gpu_mb = 0.0
 
+        self._samples: list[tuple[float, float, float]] = []
+        self._start_time = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._error = None
+
+        self.stats = None
+
         if self.monitor_gpu:
             try:
                 pynvml.nvmlInit()
@@ -32,33 +56,97 @@ class ResourceMonitor:
                 # GPU monitoring will be disabled gracefully
                 self.monitor_gpu = False
 
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
     def start(self):
         """
-        Reset peak measurements.
+        Reset measurements and start background sampling.
         """
-        self._peak_ram_mb = self._get_ram_mb()
-        self._peak_gpu_mb = self._get_gpu_mb() if self.monitor_gpu else 0.0
+        self._samples = []
+        self._error = None
+        self._start_time = time.perf_counter()
+        self._peak_ram_mb = 0.0
+        self._peak_gpu_mb = 0.0
+        self._update_peaks()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._poll,
+            name="resource-monitor",
+            daemon=True,
+        )
+        self._thread.start()
 
     def stop(self) -> dict:
         """
-        Return peak memory usage.
+        Stop background sampling and return peak / mean memory usage
+        together with a downsampled time series.
         """
         try:
+            self._stop_event.set()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+
+            if self._error is not None:
+                raise self._error
+
             # Final check
             self._update_peaks()
 
-            return {
-                "peak_ram_mb": round(self._peak_ram_mb, 2),
-                "peak_gpu_mb": round(self._peak_gpu_mb, 2)
-                if self.monitor_gpu
-                else None,
-            }
+            self.stats = self._summarize()
+            return self.stats
 
         except Exception as exc:
             raise ResourceMonitorError(
                 f"Failed to collect resource metrics: {exc}"
             ) from exc
 
+    def _poll(self):
+        """
+        Sampling loop executed on the background thread.
+        """
+        try:
+            while not self._stop_event.wait(self.interval):
+                self._update_peaks()
+        except Exception as exc:
+            self._error = exc
+
+    def _summarize(self) -> dict:
+        ram_values = [ram for _, ram, _ in self._samples]
+        stride = max(1, math.ceil(len(self._samples) / self.max_series_points))
+
+        stats = {
+            "peak_ram_mb": round(self._peak_ram_mb, 2),
+            "mean_ram_mb": round(sum(ram_values) / len(ram_values), 2),
+            "peak_gpu_mb": None,
+            "mean_gpu_mb": None,
+            "samples": len(self._samples),
+            "ram_series_mb": [
+                (round(t, 4), round(ram, 2))
+                for t, ram, _ in self._samples[::stride]
+            ],
+        }
+
+        if self.monitor_gpu:
+            gpu_values = [gpu for _, _, gpu in self._samples]
+            stats["peak_gpu_mb"] = round(self._peak_gpu_mb, 2)
+            stats["mean_gpu_mb"] = round(sum(gpu_values) / len(gpu_values), 2)
+
+        return stats
+
+    def current_ram_mb(self) -> float:
+        """
+        Current process RSS, whether or not the monitor is sampling.
+        """
+        return round(self._get_ram_mb(), 2)
+
     def _get_ram_mb(self) -> float:
         mem_bytes = self._process.memory_info().rss
         return mem_bytes / (1024 ** 2)
@@ -72,19 +160,26 @@ class ResourceMonitor:
 
     def _update_peaks(self):
         """
-        Update peak RAM/GPU values.
+        Record one sample and update peak RAM/GPU values.
         """
         ram_mb = self._get_ram_mb()
         self._peak_ram_mb = max(self._peak_ram_mb, ram_mb)
 
+        gpu_mb = 0.0
         if self.monitor_gpu:
             gpu_mb = self._get_gpu_mb()
             self._peak_gpu_mb = max(self._peak_gpu_mb, gpu_mb)
 
+        self._samples.append(
+            (time.perf_counter() - self._start_time, ram_mb, gpu_mb)
+        )
+
     def sample(self, interval: float = 0.01, duration: float = 0.5):
         """
-        Sample resource usage periodically.
-        Intended to be run during inference.
+        Sample resource usage on the calling thread for `duration` seconds.
+
+        Prefer using the monitor as a context manager, which samples in
+        the background without blocking the caller.
         """
         end_time = time.time() + duration
         while time.time() < end_time:
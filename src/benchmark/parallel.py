@@ -0,0 +1,151 @@
+import logging
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List
+
+import psutil
+
+from benchmark.exceptions import ConfigError
+
+
+# Torch thread count `run_in_workers` assigned to this process; None
+# outside worker processes
+_WORKER_THREADS: int | None = None
+
+
+def available_cores() -> List[int]:
+    """
+    Return the CPU core ids this process is allowed to run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_core_sets(
+    num_workers: int,
+    threads_per_worker: int,
+    cores: List[int] | None = None,
+) -> List[List[int]]:
+    """
+    Split the available cores into disjoint, contiguous sets of
+    `threads_per_worker` cores, one per worker.
+
+    Disjoint sets keep workers from contending for the same cores,
+    so each worker's latency is measured in isolation.
+    """
+    if cores is None:
+        cores = available_cores()
+
+    needed = num_workers * threads_per_worker
+    if needed > len(cores):
+        raise ConfigError(
+            f"{num_workers} workers x {threads_per_worker} threads needs "
+            f"{needed} cores, but only {len(cores)} are available"
+        )
+
+    return [
+        cores[i * threads_per_worker:(i + 1) * threads_per_worker]
+        for i in range(num_workers)
+    ]
+
+
+def worker_threads() -> int | None:
+    """
+    The torch thread count assigned to this worker process, or None
+    outside `run_in_workers`. Workers do not import torch themselves;
+    the runner applies the count when it loads a local model.
+    """
+    return _WORKER_THREADS
+
+
+def _pin_current_process(cores: List[int]) -> None:
+    try:
+        psutil.Process().cpu_affinity(cores)
+    except (AttributeError, OSError, psutil.Error) as exc:
+        logging.warning(f"CPU pinning not supported on this platform: {exc}")
+
+
+def _init_worker(
+    core_sets,
+    threads_per_worker: int,
+    pin_cores: bool,
+    log_level: int,
+) -> None:
+    """
+    Per-process setup: take a core set, pin to it and record the torch
+    intra-op thread count to use (see `worker_threads`).
+    """
+    global _WORKER_THREADS
+
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    cores = core_sets.get()
+    if pin_cores and cores:
+        _pin_current_process(cores)
+
+    _WORKER_THREADS = threads_per_worker
+
+    # Served models never need torch; only size its pool if it is loaded
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads_per_worker)
+
+    logging.info(
+        f"Worker {os.getpid()} ready: {threads_per_worker} torch threads, "
+        f"cores {cores if pin_cores else 'unpinned'}"
+    )
+
+
+def run_in_workers(
+    func: Callable[..., Any],
+    tasks: List[tuple],
+    workers: int,
+    threads_per_worker: int = 1,
+    pin_cores: bool = True,
+) -> List[Any]:
+    """
+    Run `func(*task)` for every task across `workers` spawned processes.
+
+    Each process is pinned to its own core set (when `pin_cores`) and
+    handles one task at a time, so per-process RSS and latency are not
+    polluted by other workers. Results are returned in task order;
+    tasks that raise are logged and skipped.
+    """
+    ctx = mp.get_context("spawn")
+
+    if pin_cores:
+        core_sets = plan_core_sets(workers, threads_per_worker)
+    else:
+        core_sets = [[] for _ in range(workers)]
+
+    core_queue = ctx.Queue()
+    for cores in core_sets:
+        core_queue.put(cores)
+
+    results = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(
+            core_queue,
+            threads_per_worker,
+            pin_cores,
+            logging.getLogger().getEffectiveLevel(),
+        ),
+    ) as pool:
+        futures = [pool.submit(func, *task) for task in tasks]
+
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                logging.error(f"Worker task failed: {exc}")
+
+    return results
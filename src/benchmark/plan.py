@@ -0,0 +1,168 @@
+import csv
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from tabulate import tabulate
+
+from benchmark.dataset import PromptDataset
+from benchmark.variants import expand_model_variants
+
+
+# Rough per-sequence generation speed (tokens/sec) and cold-start time by
+# model size, used when no earlier run of the model is available
+DEFAULT_TOKENS_PER_SEC = {
+    "cpu": {"<1B": 40.0, "~7B": 4.0, ">13B": 1.5},
+    "cuda": {"<1B": 150.0, "~7B": 40.0, ">13B": 20.0},
+}
+
+DEFAULT_LOAD_SEC = {"<1B": 5.0, "~7B": 60.0, ">13B": 150.0}
+
+
+def _read_csv_means(path: Path, value_field: str) -> Dict[str, float]:
+    """
+    Mean of `value_field` per model_name in a CSV written by an earlier
+    run; empty when the file is missing.
+    """
+    if not path.exists():
+        return {}
+
+    totals: Dict[str, List[float]] = defaultdict(list)
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                totals[row["model_name"]].append(float(row[value_field]))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    return {name: sum(values) / len(values) for name, values in totals.items() if values}
+
+
+def load_history(run_dir: Path) -> Dict[str, Dict[str, float]]:
+    """
+    Per-model mean batch latency and load time of an earlier run (e.g.
+    `outputs/latest`), used to calibrate the time estimate.
+    """
+    return {
+        "batch_latency_sec": _read_csv_means(run_dir / "results.csv", "latency_sec"),
+        "load_sec": _read_csv_means(run_dir / "model_loads.csv", "load_total_sec"),
+    }
+
+
+def scan_prompts(config: dict) -> Dict[str, Any]:
+    """
+    Stream the configured dataset once (raising DatasetError when it is
+    unreadable) and count the prompts a run would use.
+    """
+    dataset = PromptDataset.from_config(
+        config["dataset"],
+        seed=config.get("benchmark", {}).get("seed", 42),
+    )
+
+    count = 0
+    chars = 0
+    for record in dataset:
+        count += 1
+        chars += len(record["prompt"])
+
+    return {
+        "prompts": count,
+        "mean_prompt_chars": round(chars / count, 1) if count else 0.0,
+    }
+
+
+def build_plan(config: dict, history_dir: Path | None = None) -> Dict[str, Any]:
+    """
+    Expand the configured models into the work matrix of `llm-bench
+    run`, with an estimated run time per model variant.
+
+    The estimate uses the mean batch latency and load time of the same
+    model name in `history_dir` when available, otherwise a per-size
+    default speed; it covers loading, warmup and all measured batches.
+    """
+    scan = scan_prompts(config)
+    prompts = scan["prompts"]
+
+    benchmark_cfg = config.get("benchmark", {})
+    runs = benchmark_cfg.get("runs_per_prompt", 1)
+    warmup = benchmark_cfg.get("warmup_iterations", 0)
+    max_new_tokens = config["generation"].get("max_new_tokens", 128)
+    device = config["runtime"].get("device", "cpu")
+
+    history = load_history(history_dir) if history_dir else {
+        "batch_latency_sec": {},
+        "load_sec": {},
+    }
+
+    variants = []
+    for model_cfg in expand_model_variants(config["models"]):
+        name = model_cfg["name"]
+        size = model_cfg.get("size", "<1B")
+        batch_size = model_cfg.get("batch_size", config["runtime"].get("batch_size", 1))
+        batches = math.ceil(prompts / batch_size) * runs
+
+        # Served models: assume GPU-class speed on the server
+        speed_device = "cuda" if model_cfg.get("provider") == "openai" else device
+
+        if name in history["batch_latency_sec"]:
+            batch_sec = history["batch_latency_sec"][name]
+            basis = "history"
+        else:
+            batch_sec = max_new_tokens / DEFAULT_TOKENS_PER_SEC[speed_device].get(size, 40.0)
+            basis = "default"
+
+        load_sec = history["load_sec"].get(name, DEFAULT_LOAD_SEC.get(size, 5.0))
+        if model_cfg.get("provider") == "openai":
+            load_sec = history["load_sec"].get(name, 0.0)
+
+        variants.append({
+            "model_name": name,
+            "provider": model_cfg.get("provider", "huggingface"),
+            "dtype": model_cfg.get("dtype"),
+            "batch_size": batch_size,
+            "generations": prompts * runs,
+            "batches": batches,
+            "estimate_sec": round(load_sec + (warmup + batches) * batch_sec, 1),
+            "basis": basis,
+        })
+
+    return {
+        **scan,
+        "runs_per_prompt": runs,
+        "variants": variants,
+        "total_estimate_sec": round(sum(v["estimate_sec"] for v in variants), 1),
+    }
+
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def print_plan(plan: Dict[str, Any]) -> None:
+    """
+    Print the work matrix and time estimate to console.
+    """
+    print(
+        f"\n===== Benchmark Plan =====\n"
+        f"{plan['prompts']} prompts x {plan['runs_per_prompt']} runs, "
+        f"{len(plan['variants'])} model variants\n"
+    )
+    print(tabulate(
+        [
+            {
+                **{k: v for k, v in variant.items() if k != "estimate_sec"},
+                "estimate": format_duration(variant["estimate_sec"]),
+            }
+            for variant in plan["variants"]
+        ],
+        headers="keys",
+    ))
+    print(f"\nEstimated run time: {format_duration(plan['total_estimate_sec'])}")
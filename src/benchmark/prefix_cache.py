@@ -0,0 +1,101 @@
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmark.exceptions import InferenceError
+
+
+def tile_prefix_ids(prefix_ids: List[int], length: int) -> List[int]:
+    """
+    Repeat (or truncate) a tokenized prefix to exactly `length` tokens,
+    so one configured prefix can be benchmarked at several lengths.
+    """
+    if not prefix_ids:
+        raise ValueError("Cannot tile an empty prefix")
+
+    repeats = math.ceil(length / len(prefix_ids))
+    return (list(prefix_ids) * repeats)[:length]
+
+
+def measure_prefill(
+    model,
+    prompts: List[Dict[str, Any]],
+    generation_config: dict,
+    runs: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Time the prefill of every prompt under the model's current prefix
+    setting (see `HuggingFaceModel.set_prefix_ids`).
+
+    Each prompt generates a single streamed token; its time to first
+    token is the prefill time. Returns one record per prompt and run.
+    """
+    prefill_config = {
+        **generation_config,
+        "max_new_tokens": 1,
+        "streaming": True,
+    }
+
+    records = []
+    for run in range(runs):
+        for prompt in prompts:
+            record = {
+                "prompt_id": prompt["id"],
+                "run": run,
+                "status": "ok",
+                "prompt_tokens": None,
+                "prefill_sec": None,
+            }
+
+            try:
+                output = model.generate_batch([prompt["prompt"]], prefill_config)[0]
+                record["prompt_tokens"] = output["prompt_tokens"]
+                if output["token_times"]:
+                    record["prefill_sec"] = round(output["token_times"][0], 6)
+            except InferenceError as exc:
+                record["status"] = "error"
+                record["error"] = str(exc)
+
+            records.append(record)
+
+    return records
+
+
+def summarize_prefix_cache(
+    uncached: List[Dict[str, Any]],
+    cached: List[Dict[str, Any]],
+    prefix_stats: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Compare prefill with and without a reused prefix KV cache at one
+    prefix length: mean prefill time of each, the time saved per
+    request, and the memory the cache holds.
+    """
+    def mean_prefill(records):
+        values = [r["prefill_sec"] for r in records if r["prefill_sec"] is not None]
+        return float(np.mean(values)) if values else None
+
+    uncached_sec = mean_prefill(uncached)
+    cached_sec = mean_prefill(cached)
+
+    summary = {
+        "prefix_tokens": prefix_stats["prefix_tokens"],
+        "uncached_prefill_sec": uncached_sec,
+        "cached_prefill_sec": cached_sec,
+        "prefill_saved_sec": None,
+        "prefill_speedup": None,
+        "prefix_build_sec": prefix_stats["prefix_prefill_sec"],
+        "prefix_cache_mb": prefix_stats["prefix_cache_mb"],
+    }
+
+    if uncached_sec is not None and cached_sec is not None:
+        summary["prefill_saved_sec"] = round(uncached_sec - cached_sec, 6)
+        if cached_sec > 0:
+            summary["prefill_speedup"] = round(uncached_sec / cached_sec, 3)
+
+    for key in ("uncached_prefill_sec", "cached_prefill_sec"):
+        if summary[key] is not None:
+            summary[key] = round(summary[key], 6)
+
+    return summary
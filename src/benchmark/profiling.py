@@ -0,0 +1,238 @@
+import cProfile
+import csv
+import io
+import logging
+import pstats
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+# Phases of one generate call, in order; "other" is whatever the call
+# spends outside them (result assembly, bookkeeping)
+PHASES = ("tokenize", "prefill", "decode", "detokenize")
+
+
+class PhaseRecorder:
+    """
+    Accumulates wall time per generation phase across generate calls.
+
+    At most one phase is open at a time: `start` closes the open phase
+    before opening the next one, so moving on from inside a callback
+    (e.g. the streamer seeing the first new token end prefill) is a
+    single call.
+    Each phase is also marked as a `torch.profiler.record_function`
+    range, so phases appear as named spans in the profiler trace.
+    """
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self._open = None
+
+    def start(self, phase: str) -> None:
+        from torch.profiler import record_function
+
+        self.stop()
+
+        span = record_function(phase)
+        span.__enter__()
+        self._open = (phase, time.perf_counter(), span)
+
+    def stop(self) -> None:
+        if self._open is None:
+            return
+
+        phase, start, span = self._open
+        self._open = None
+
+        self.totals[phase] += time.perf_counter() - start
+        span.__exit__(None, None, None)
+
+
+def profile_dir_name(index: int, model_name: str) -> str:
+    """
+    Filesystem-safe directory name for the profile of the `index`-th
+    model, e.g. "00-DistilGPT-2_Small".
+    """
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_")
+    return f"{index:02d}-{slug}"
+
+
+def summarize_phases(
+    totals: Dict[str, float],
+    calls: int,
+    wall_sec: float,
+) -> List[Dict[str, Any]]:
+    """
+    One row per phase with its total time, time per call and share of
+    the profiled generate calls' wall time. Time outside the recorded
+    phases is reported as "other".
+    """
+    phase_totals = {phase: totals.get(phase, 0.0) for phase in PHASES}
+    phase_totals["other"] = max(wall_sec - sum(phase_totals.values()), 0.0)
+
+    return [
+        {
+            "phase": phase,
+            "calls": calls,
+            "total_sec": round(total, 6),
+            "per_call_sec": round(total / calls, 6) if calls else None,
+            "share": round(total / wall_sec, 4) if wall_sec > 0 else None,
+        }
+        for phase, total in phase_totals.items()
+    ]
+
+
+def _write_rows_csv(rows: List[Dict[str, Any]], path: Path) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _write_top_ops(events, output_dir: Path, sort_by: str, row_limit: int) -> None:
+    """
+    Write the profiler's operator table (top_ops.txt) and the operator
+    aggregates as CSV (top_ops.csv, phase spans left out), heaviest
+    first.
+    """
+    with open(output_dir / "top_ops.txt", "w", encoding="utf-8") as f:
+        f.write(events.table(sort_by=sort_by, row_limit=row_limit))
+
+    rows = sorted(
+        (event for event in events if event.key not in PHASES),
+        key=lambda event: getattr(event, sort_by),
+        reverse=True,
+    )
+
+    with open(output_dir / "top_ops.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "name",
+            "calls",
+            "self_cpu_ms",
+            "cpu_total_ms",
+            "self_cuda_ms",
+            "self_cpu_memory_mb",
+        ])
+        for event in rows[:row_limit]:
+            writer.writerow([
+                event.key,
+                event.count,
+                round(event.self_cpu_time_total / 1000.0, 4),
+                round(event.cpu_time_total / 1000.0, 4),
+                round(event.self_cuda_time_total / 1000.0, 4),
+                round(event.self_cpu_memory_usage / (1024 ** 2), 4),
+            ])
+
+
+def _run_cprofile(
+    model,
+    batches: list,
+    generation_config: dict,
+    output_dir: Path,
+    row_limit: int,
+) -> None:
+    """
+    Profile the same calls again under cProfile, in a separate pass so
+    the two profilers do not distort each other. Writes the raw stats
+    (cprofile.prof, for snakeviz / pstats) and a cumulative-time table.
+    """
+    profiler = cProfile.Profile()
+
+    for prompts, input_ids in batches:
+        profiler.enable()
+        try:
+            model.generate_batch(prompts, generation_config, input_ids=input_ids)
+        finally:
+            profiler.disable()
+
+    profiler.dump_stats(str(output_dir / "cprofile.prof"))
+
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(row_limit)
+    (output_dir / "cprofile.txt").write_text(buffer.getvalue(), encoding="utf-8")
+
+
+def profile_generation(
+    model,
+    batches: list,
+    generation_config: dict,
+    output_dir: Path,
+    profiling_config: dict | None = None,
+    model_name: str | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run `batches` (a list of (prompts, input_ids) pairs) through
+    `model.generate_batch` under `torch.profiler` and write to
+    `output_dir`:
+
+        trace.json    Chrome / Perfetto trace (chrome://tracing,
+                      ui.perfetto.dev), with the generation phases as
+                      named spans
+        top_ops.txt   operator table, heaviest first
+        top_ops.csv   the same aggregates as CSV
+        phases.csv    time per generation phase (see `summarize_phases`)
+
+    plus cprofile.prof / cprofile.txt when `cprofile` is enabled.
+    CPU activity is always recorded (CUDA too on a CUDA model), with
+    tensor shapes and memory unless disabled in `profiling_config`.
+
+    Returns the phase breakdown rows (see `summarize_phases`), labelled
+    with `model_name`.
+    """
+    import torch
+    from torch.profiler import ProfilerActivity, profile
+
+    profiling_config = profiling_config or {}
+    row_limit = profiling_config.get("row_limit", 25)
+
+    on_cuda = getattr(model, "device", "cpu") == "cuda" and torch.cuda.is_available()
+    activities = [ProfilerActivity.CPU]
+    if on_cuda:
+        activities.append(ProfilerActivity.CUDA)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    recorder = PhaseRecorder()
+    wall_sec = 0.0
+    calls = 0
+
+    model.phase_recorder = recorder
+    try:
+        with profile(
+            activities=activities,
+            record_shapes=profiling_config.get("record_shapes", True),
+            profile_memory=profiling_config.get("profile_memory", True),
+            with_stack=profiling_config.get("with_stack", False),
+        ) as profiler:
+            for prompts, input_ids in batches:
+                start = time.perf_counter()
+                model.generate_batch(prompts, generation_config, input_ids=input_ids)
+                wall_sec += time.perf_counter() - start
+                calls += 1
+    finally:
+        model.phase_recorder = None
+        recorder.stop()
+
+    profiler.export_chrome_trace(str(output_dir / "trace.json"))
+    _write_top_ops(
+        profiler.key_averages(),
+        output_dir,
+        sort_by="self_cuda_time_total" if on_cuda else "self_cpu_time_total",
+        row_limit=row_limit,
+    )
+
+    phases = [
+        {"model_name": model_name or getattr(model, "model_id", None), **row}
+        for row in summarize_phases(recorder.totals, calls, wall_sec)
+    ]
+    _write_rows_csv(phases, output_dir / "phases.csv")
+
+    if profiling_config.get("cprofile", False):
+        _run_cprofile(model, batches, generation_config, output_dir, row_limit)
+
+    logging.info(f"Profile of {calls} generate calls saved to {output_dir}")
+
+    return phases
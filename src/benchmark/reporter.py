@@ -1,25 +1,75 @@
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any
 
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 from benchmark.exceptions import ReportError
+from benchmark.metrics import compute_distribution_stats
+from benchmark.sink import iter_result_chunks, iter_result_rows
+
+
+STATISTICS_METRICS = (
+    "latency_sec",
+    "tokens_per_sec",
+    "ttft_sec",
+    "itl_p50_sec",
+    "decode_tokens_per_sec",
+    "peak_ram_mb",
+)
+
+
+SUMMARY_METRICS = (
+    "latency_sec",
+    "tokens_per_sec",
+    "batch_tokens_per_sec",
+    "padding_efficiency",
+    "peak_ram_mb",
+)
+
+
+MODEL_LOAD_COLUMNS = (
+    "model_name",
+    "cache_hit",
+    "tokenizer_load_sec",
+    "weights_load_sec",
+    "to_device_sec",
+    "load_total_sec",
+    "load_peak_rss_mb",
+    "model_memory_mb",
+    "first_call_sec",
+    "warm_call_sec",
+    "first_call_overhead_sec",
+)
 
 
 def save_results_csv(
-    results: List[Dict[str, Any]],
+    results_dir: Path,
     output_dir: Path,
 ) -> Path:
     """
-    Save raw benchmark results to CSV.
+    Export the streamed result rows to a single CSV.
+
+    Two streaming passes: the first collects the union of columns
+    (rows from different modes may differ), the second appends each
+    chunk aligned to it, so memory is bounded by the chunk size.
     """
+    import pandas as pd
+
     try:
-        df = pd.DataFrame(results)
         output_dir.mkdir(parents=True, exist_ok=True)
-
         csv_path = output_dir / "results.csv"
-        df.to_csv(csv_path, index=False)
+
+        columns: List[str] = []
+        for chunk in iter_result_chunks(results_dir):
+            columns.extend(c for c in chunk.columns if c not in columns)
+
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+            for chunk in iter_result_chunks(results_dir):
+                chunk.reindex(columns=columns).to_csv(f, index=False, header=False)
 
         return csv_path
 
@@ -27,19 +77,468 @@ def save_results_csv(
         raise ReportError(f"Failed to save results CSV: {exc}") from exc
 
 
+def summarize_means(
+    results_dir: Path,
+    metrics: tuple = SUMMARY_METRICS,
+) -> "pd.DataFrame":
+    """
+    Compute per-model averages of `metrics` in one streaming pass,
+    accumulating sums and non-null counts chunk by chunk.
+
+    The returned frame is indexed by model_name and also carries the
+    number of result rows per model in a `rows` column.
+    """
+    import pandas as pd
+
+    sums = None
+    counts = None
+    rows = None
+
+    for chunk in iter_result_chunks(results_dir):
+        numeric = chunk.reindex(columns=list(metrics)).apply(
+            pd.to_numeric, errors="coerce"
+        )
+        grouped = numeric.groupby(chunk["model_name"])
+
+        chunk_sums = grouped.sum()
+        chunk_counts = grouped.count()
+        chunk_rows = chunk.groupby("model_name").size()
+
+        if sums is None:
+            sums, counts, rows = chunk_sums, chunk_counts, chunk_rows
+        else:
+            sums = sums.add(chunk_sums, fill_value=0)
+            counts = counts.add(chunk_counts, fill_value=0)
+            rows = rows.add(chunk_rows, fill_value=0)
+
+    if sums is None:
+        return pd.DataFrame(columns=[*metrics, "rows"])
+
+    means = sums / counts.where(counts > 0)
+    means["rows"] = rows.astype(int)
+    return means
+
+
+def _reservoir_update(
+    reservoir: np.ndarray,
+    seen: int,
+    values: np.ndarray,
+    capacity: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, int]:
+    """
+    Vectorized reservoir sampling: keep a uniform sample of at most
+    `capacity` values from a stream seen chunk by chunk.
+    """
+    free = max(0, capacity - reservoir.size)
+    reservoir = np.concatenate([reservoir, values[:free]])
+    seen += min(free, values.size)
+
+    rest = values[free:]
+    if rest.size:
+        positions = np.arange(seen + 1, seen + rest.size + 1)
+        slots = (rng.random(rest.size) * positions).astype(np.int64)
+        keep = slots < capacity
+        reservoir[slots[keep]] = rest[keep]
+        seen += rest.size
+
+    return reservoir, seen
+
+
+def summarize_statistics(
+    results_dir: Path,
+    metrics: tuple = STATISTICS_METRICS,
+    max_samples: int = 200_000,
+) -> "pd.DataFrame":
+    """
+    Compute per-model distribution statistics (mean, std, percentiles,
+    bootstrap 95% CI of the mean) for each metric across all prompts
+    and repetitions.
+
+    Values are streamed from the results sink into a reservoir of at
+    most `max_samples` per model and metric; statistics are exact
+    below that size and estimated from a uniform sample above it.
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    reservoirs: Dict[tuple, tuple[np.ndarray, int]] = {}
+
+    for chunk in iter_result_chunks(results_dir):
+        for model_name, group in chunk.groupby("model_name"):
+            for metric in metrics:
+                if metric not in group.columns:
+                    continue
+
+                values = pd.to_numeric(group[metric], errors="coerce").to_numpy(
+                    dtype=float
+                )
+                values = values[~np.isnan(values)]
+
+                key = (model_name, metric)
+                reservoir, seen = reservoirs.get(key, (np.empty(0), 0))
+                reservoirs[key] = _reservoir_update(
+                    reservoir, seen, values, max_samples, rng
+                )
+
+    rows = []
+    for model_name in sorted({name for name, _ in reservoirs}):
+        for metric in metrics:
+            if (model_name, metric) not in reservoirs:
+                continue
+
+            reservoir, seen = reservoirs[(model_name, metric)]
+            stats = compute_distribution_stats(reservoir)
+            if stats["n"] == 0:
+                continue
+
+            rows.append({
+                "model_name": model_name,
+                "metric": metric,
+                **stats,
+                "n": seen,
+            })
+
+    return pd.DataFrame(rows)
+
+
+def save_statistics_csv(
+    statistics: "pd.DataFrame",
+    output_dir: Path,
+) -> Path:
+    """
+    Save per-model distribution statistics to CSV.
+    """
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        csv_path = output_dir / "statistics.csv"
+        statistics.round(6).to_csv(csv_path, index=False)
+
+        return csv_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to save statistics CSV: {exc}") from exc
+
+
+def read_model_loads(loads_dir: Path) -> "pd.DataFrame":
+    """
+    Read the per-model load records of a run (one row per load, so a
+    resumed run shows every cold start it paid).
+    """
+    import pandas as pd
+
+    if not loads_dir.exists():
+        return pd.DataFrame(columns=list(MODEL_LOAD_COLUMNS))
+
+    return pd.DataFrame(list(iter_result_rows(loads_dir)))
+
+
+def save_model_loads_csv(
+    model_loads: "pd.DataFrame",
+    output_dir: Path,
+) -> Path:
+    """
+    Save model load times to CSV.
+    """
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        csv_path = output_dir / "model_loads.csv"
+        model_loads.to_csv(csv_path, index=False)
+
+        return csv_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to save model load CSV: {exc}") from exc
+
+
+def read_profile_phases(profiles_dir: Path) -> "pd.DataFrame":
+    """
+    Collect the generation phase breakdown of every profiled model
+    (`profiles/<model>/phases.csv`).
+    """
+    import pandas as pd
+
+    frames = [pd.read_csv(path) for path in sorted(profiles_dir.glob("*/phases.csv"))]
+    if not frames:
+        return pd.DataFrame()
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def compare_assisted_decoding(
+    means: "pd.DataFrame",
+    baselines: Dict[str, str],
+) -> "pd.DataFrame":
+    """
+    Compare each assisted-decoding variant with its plain-decoding
+    baseline (`baselines` maps assisted model_name -> plain model_name):
+    mean latency and tokens/sec of both, the latency speedup and the
+    draft acceptance rate.
+    """
+    import pandas as pd
+
+    rows = []
+
+    for assisted, baseline in baselines.items():
+        if assisted not in means.index or baseline not in means.index:
+            continue
+
+        plain_row = means.loc[baseline]
+        assisted_row = means.loc[assisted]
+
+        rows.append({
+            "model_name": assisted,
+            "baseline_name": baseline,
+            "plain_latency_sec": plain_row["latency_sec"],
+            "assisted_latency_sec": assisted_row["latency_sec"],
+            "latency_speedup": (
+                plain_row["latency_sec"] / assisted_row["latency_sec"]
+                if assisted_row["latency_sec"] > 0
+                else None
+            ),
+            "plain_tokens_per_sec": plain_row["tokens_per_sec"],
+            "assisted_tokens_per_sec": assisted_row["tokens_per_sec"],
+            "acceptance_rate": assisted_row.get("acceptance_rate"),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def save_load_results(
+    records: List[Dict[str, Any]],
+    summaries: List[Dict[str, Any]],
+    output_dir: Path,
+) -> tuple[Path, Path]:
+    """
+    Save per-request load test records and per-level summaries to CSV.
+    """
+    import pandas as pd
+
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        records_path = output_dir / "load_results.csv"
+        pd.DataFrame(records).to_csv(records_path, index=False)
+
+        summary_path = output_dir / "load_summary.csv"
+        pd.DataFrame(summaries).to_csv(summary_path, index=False)
+
+        return records_path, summary_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to save load test results: {exc}") from exc
+
+
+def plot_latency_vs_throughput(
+    summaries: List[Dict[str, Any]],
+    output_dir: Path,
+) -> Path:
+    """
+    Plot p50 / p99 latency against achieved throughput for each model
+    (and scheduling variant), one point per offered-load level.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    try:
+        df = pd.DataFrame(summaries).sort_values("achieved_rps")
+
+        plt.figure(figsize=(8, 5))
+        group_cols = ["model_name"]
+        if "variant" in df.columns and df["variant"].nunique() > 1:
+            group_cols.append("variant")
+
+        for key, group in df.groupby(group_cols):
+            name = " / ".join(str(part) for part in key)
+            plt.plot(
+                group["achieved_rps"],
+                group["latency_p50_sec"],
+                marker="o",
+                label=f"{name} p50",
+            )
+            plt.plot(
+                group["achieved_rps"],
+                group["latency_p99_sec"],
+                marker="x",
+                linestyle="--",
+                label=f"{name} p99",
+            )
+
+        plt.xlabel("Achieved Throughput (requests/sec)")
+        plt.ylabel("Latency (seconds)")
+        plt.title("Latency vs Throughput")
+        plt.legend()
+        plt.tight_layout()
+
+        plot_path = output_dir / "latency_vs_throughput.png"
+        plt.savefig(plot_path)
+        plt.close()
+
+        return plot_path
+
+    except Exception as exc:
+        raise ReportError(
+            f"Failed to generate latency/throughput plot: {exc}"
+        ) from exc
+
+
+def save_prefix_results(
+    records: List[Dict[str, Any]],
+    summaries: List[Dict[str, Any]],
+    output_dir: Path,
+) -> tuple[Path, Path]:
+    """
+    Save per-prompt prefill records and per-prefix-length summaries of
+    the prefix cache comparison to CSV.
+    """
+    import pandas as pd
+
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        records_path = output_dir / "prefix_results.csv"
+        pd.DataFrame(records).to_csv(records_path, index=False)
+
+        summary_path = output_dir / "prefix_summary.csv"
+        pd.DataFrame(summaries).to_csv(summary_path, index=False)
+
+        return records_path, summary_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to save prefix cache results: {exc}") from exc
+
+
+def plot_prefill_vs_prefix_length(
+    summaries: List[Dict[str, Any]],
+    output_dir: Path,
+) -> Path:
+    """
+    Plot mean prefill time with and without the prefix KV cache against
+    prefix length, one pair of lines per model.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    try:
+        df = pd.DataFrame(summaries).sort_values("prefix_tokens")
+
+        plt.figure(figsize=(8, 5))
+
+        for model_name, group in df.groupby("model_name"):
+            plt.plot(
+                group["prefix_tokens"],
+                group["uncached_prefill_sec"],
+                marker="o",
+                label=f"{model_name} uncached",
+            )
+            plt.plot(
+                group["prefix_tokens"],
+                group["cached_prefill_sec"],
+                marker="x",
+                linestyle="--",
+                label=f"{model_name} cached",
+            )
+
+        plt.xlabel("Shared Prefix Length (tokens)")
+        plt.ylabel("Prefill Time (seconds)")
+        plt.title("Prefill Time vs Prefix Length")
+        plt.legend()
+        plt.tight_layout()
+
+        plot_path = output_dir / "prefill_vs_prefix_length.png"
+        plt.savefig(plot_path)
+        plt.close()
+
+        return plot_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to generate prefix cache plot: {exc}") from exc
+
+
+def save_scaling_results(
+    summaries: List[Dict[str, Any]],
+    output_dir: Path,
+) -> Path:
+    """
+    Save per-setting thread sweep results to CSV.
+    """
+    import pandas as pd
+
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        results_path = output_dir / "thread_scaling.csv"
+        pd.DataFrame(summaries).to_csv(results_path, index=False)
+
+        return results_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to save thread scaling results: {exc}") from exc
+
+
+def plot_thread_scaling(
+    summaries: List[Dict[str, Any]],
+    output_dir: Path,
+) -> Path:
+    """
+    Plot throughput and parallel efficiency against total threads, one
+    line per model and worker count.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    try:
+        df = pd.DataFrame(summaries).sort_values("total_threads")
+
+        fig, (ax_tps, ax_eff) = plt.subplots(1, 2, figsize=(12, 5))
+
+        for (model_name, workers), group in df.groupby(["model_name", "workers"]):
+            label = f"{model_name} ({workers} worker{'s' if workers > 1 else ''})"
+            ax_tps.plot(
+                group["total_threads"], group["tokens_per_sec"], marker="o", label=label
+            )
+            ax_eff.plot(
+                group["total_threads"],
+                group["parallel_efficiency"],
+                marker="o",
+                label=label,
+            )
+
+        ax_eff.axhline(1.0, color="grey", linestyle=":", linewidth=1)
+
+        ax_tps.set_xlabel("Total Threads")
+        ax_tps.set_ylabel("Throughput (tokens/sec)")
+        ax_tps.set_title("Throughput vs Threads")
+        ax_eff.set_xlabel("Total Threads")
+        ax_eff.set_ylabel("Parallel Efficiency")
+        ax_eff.set_title("Parallel Efficiency vs Threads")
+        ax_tps.legend()
+        fig.tight_layout()
+
+        plot_path = output_dir / "thread_scaling.png"
+        fig.savefig(plot_path)
+        plt.close(fig)
+
+        return plot_path
+
+    except Exception as exc:
+        raise ReportError(f"Failed to generate thread scaling plot: {exc}") from exc
+
+
 def plot_average_latency(
-    results: List[Dict[str, Any]],
+    means: "pd.DataFrame",
     output_dir: Path,
 ) -> Path:
     """
     Plot average latency per model.
     """
-    try:
-        df = pd.DataFrame(results)
-        avg_latency = df.groupby("model_name")["latency_sec"].mean()
+    import matplotlib.pyplot as plt
 
+    try:
         plt.figure(figsize=(8, 5))
-        avg_latency.plot(kind="bar")
+        means["latency_sec"].plot(kind="bar")
         plt.ylabel("Average Latency (seconds)")
         plt.title("Average Inference Latency by Model")
         plt.tight_layout()
@@ -55,18 +554,17 @@ def plot_average_latency(
 
 
 def plot_peak_memory(
-    results: List[Dict[str, Any]],
+    means: "pd.DataFrame",
     output_dir: Path,
 ) -> Path:
     """
     Plot peak RAM usage per model.
     """
-    try:
-        df = pd.DataFrame(results)
-        avg_memory = df.groupby("model_name")["peak_ram_mb"].mean()
+    import matplotlib.pyplot as plt
 
+    try:
         plt.figure(figsize=(8, 5))
-        avg_memory.plot(kind="bar")
+        means["peak_ram_mb"].plot(kind="bar")
         plt.ylabel("Peak RAM Usage (MB)")
         plt.title("Average Peak RAM Usage by Model")
         plt.tight_layout()
@@ -81,15 +579,9 @@ def plot_peak_memory(
         raise ReportError(f"Failed to generate memory plot: {exc}") from exc
 
 
-def print_summary(results: List[Dict[str, Any]]) -> None:
+def print_summary(means: "pd.DataFrame") -> None:
     """
     Print benchmark summary to console.
     """
-    df = pd.DataFrame(results)
-
     print("\n===== Benchmark Summary =====")
-    print(df.groupby("model_name")[[
-        "latency_sec",
-        "tokens_per_sec",
-        "peak_ram_mb",
-    ]].mean().round(4))
+    print(means[list(SUMMARY_METRICS)].round(4))
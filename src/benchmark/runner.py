@@ -1,49 +1,374 @@
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+from itertools import islice
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 import json
 import logging
+import multiprocessing as mp
+import os
+import time
 
-import pandas as pd
 from tqdm import tqdm
 
-from benchmark.dataset import load_dataset
-from benchmark.models import HuggingFaceModel
+from benchmark.dataset import PromptDataset
+from benchmark.backend import InferenceBackend
+from benchmark.http_backend import OpenAIHTTPModel
 from benchmark.monitor import ResourceMonitor
-from benchmark.metrics import measure_latency, aggregate_metrics
+from benchmark.metrics import (
+    measure_latency,
+    compute_throughput,
+    compute_padding_efficiency,
+    aggregate_metrics,
+)
 from benchmark.environment import get_environment_metadata
+from benchmark.loadgen import (
+    generate_arrival_offsets,
+    run_open_loop,
+    run_closed_loop,
+    summarize_load,
+)
+from benchmark.scheduler import MicroBatchScheduler
+from benchmark.variants import OPTIMIZATION_KEYS, expand_model_variants
+from benchmark.parallel import run_in_workers, available_cores, worker_threads
+from benchmark.token_cache import TokenCache, get_or_build_token_cache
+from benchmark.model_cache import ModelCache
+from benchmark.prefix_cache import (
+    tile_prefix_ids,
+    measure_prefill,
+    summarize_prefix_cache,
+)
+from benchmark.scaling import (
+    plan_thread_settings,
+    measure_generation,
+    combine_measurements,
+    summarize_scaling,
+)
+from benchmark.sink import ResultsSink, result_part_path, load_completed_keys
+from benchmark.profiling import PHASES, profile_dir_name
+from benchmark.live_metrics import (
+    LiveMetrics,
+    MetricsServer,
+    TextfileExporter,
+    worker_textfile_path,
+)
 from benchmark.reporter import (
+    SUMMARY_METRICS,
+    MODEL_LOAD_COLUMNS,
     save_results_csv,
+    summarize_means,
+    summarize_statistics,
+    save_statistics_csv,
+    read_model_loads,
+    save_model_loads_csv,
+    read_profile_phases,
+    compare_assisted_decoding,
+    save_load_results,
+    save_prefix_results,
     plot_average_latency,
+    plot_prefill_vs_prefix_length,
+    save_scaling_results,
+    plot_thread_scaling,
+    plot_latency_vs_throughput,
     plot_peak_memory,
     print_summary,
 )
-from benchmark.exceptions import ModelLoadError, InferenceError
+from benchmark.exceptions import BenchmarkError, ModelLoadError, InferenceError
 
 
-def run_benchmark(config: dict) -> None:
-    logging.info("Initializing benchmark run")
+def _iter_batches(
+    items: Iterable[Dict[str, Any]],
+    batch_size: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield consecutive groups of at most `batch_size` items, pulling
+    from `items` lazily so a streamed dataset is never materialized.
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
 
-    # Output directories (timestamped + latest)
+
+def _prompt_token_lengths(
+    model: InferenceBackend,
+    prompts: List[Dict[str, Any]],
+    token_cache: TokenCache | None = None,
+) -> List[int]:
+    """
+    Token length of each prompt, from the token cache when available.
+    """
+    if token_cache is not None:
+        return [len(token_cache.get(prompt["id"])) for prompt in prompts]
+
+    if model.tokenizer is None:
+        # Remote backends tokenize server-side; characters are a proxy
+        return [len(prompt["prompt"]) for prompt in prompts]
+
+    encoded = model.tokenizer([prompt["prompt"] for prompt in prompts])
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def _iter_windows(
+    model: InferenceBackend,
+    items: Iterable[Dict[str, Any]],
+    batch_size: int,
+    bucketing_cfg: dict | None = None,
+    token_cache: TokenCache | None = None,
+) -> Iterator[tuple[List[Dict[str, Any]], List[List[Dict[str, Any]]]]]:
+    """
+    Yield (window, batches) pairs, where `batches` covers every prompt
+    of `window` exactly once.
+
+    Without length bucketing each window is a single batch in dataset
+    order. With it, `window` prompts are read at a time, sorted by
+    token length and cut into batches, so each batch holds prompts of
+    similar length and needs little padding. Only one window is held in
+    memory, so the dataset is still streamed.
+    """
+    if not bucketing_cfg or not bucketing_cfg.get("enabled", False):
+        for batch in _iter_batches(items, batch_size):
+            yield batch, [batch]
+        return
+
+    window_size = bucketing_cfg.get("window", batch_size * 32)
+
+    for window in _iter_batches(items, window_size):
+        lengths = _prompt_token_lengths(model, window, token_cache)
+        ordered = [
+            prompt for _, prompt in sorted(
+                zip(lengths, window), key=lambda pair: pair[0]
+            )
+        ]
+        yield window, list(_iter_batches(ordered, batch_size))
+
+
+def _warmup(
+    model: InferenceBackend,
+    batch: List[Dict[str, Any]],
+    config: dict,
+    model_name: str,
+    token_cache: TokenCache | None = None,
+) -> Dict[str, Any]:
+    """
+    Run warmup generations so lazy kernel selection, `torch.compile`
+    and allocator growth do not land in the first measured prompt.
+
+    Warmup calls are timed separately from the benchmark: the first call carries the
+    one-off (compile / first-call) cost, later calls on the same batch
+    show the warm cost. Returns first_call_sec, warm_call_sec and
+    first_call_overhead_sec (empty when no warmup ran). A compiled
+    model always gets at least two iterations so the overhead is
+    measured.
+    """
+    iterations = config.get("benchmark", {}).get("warmup_iterations", 0)
+    if model.compile_mode is not None:
+        iterations = max(iterations, 2)
+
+    if not iterations or not batch:
+        return {}
+
+    logging.info(f"Warming up {model_name} ({iterations} iterations)")
+
+    timings = []
+    for _ in range(iterations):
+        try:
+            latency, _ = measure_latency(
+                model.generate_batch,
+                [prompt["prompt"] for prompt in batch],
+                config["generation"],
+                input_ids=_cached_ids(token_cache, batch),
+            )
+        except InferenceError as exc:
+            logging.warning(f"Warmup inference failed: {exc}")
+            break
+        timings.append(latency)
+
+    if not timings:
+        return {}
+
+    stats = {
+        "first_call_sec": round(timings[0], 4),
+        "warm_call_sec": None,
+        "first_call_overhead_sec": None,
+    }
+
+    if len(timings) > 1:
+        warm = sum(timings[1:]) / len(timings[1:])
+        stats["warm_call_sec"] = round(warm, 4)
+        stats["first_call_overhead_sec"] = round(timings[0] - warm, 4)
+
+    return stats
+
+
+@contextmanager
+def _torch_threads(optimizations: dict):
+    """
+    Apply an optimization variant's `num_threads` / `interop_threads`
+    for the duration of its benchmark, restoring the intra-op thread
+    count afterwards. Inside a worker process, `num_threads` defaults
+    to the worker's assigned count (see `worker_threads`).
+
+    torch only accepts an inter-op thread count before any inter-op
+    work has run in the process, so a late request is logged and
+    ignored; rows record the counts actually in effect.
+    """
+    import torch
+
+    previous = torch.get_num_threads()
+
+    interop_threads = optimizations.get("interop_threads")
+    if interop_threads is not None and interop_threads != torch.get_num_interop_threads():
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as exc:
+            logging.warning(f"Cannot set inter-op threads to {interop_threads}: {exc}")
+
+    num_threads = optimizations.get("num_threads", worker_threads())
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+def _cached_ids(
+    token_cache: TokenCache | None,
+    batch: List[Dict[str, Any]],
+) -> list | None:
+    """
+    Look up pre-tokenized ids for a batch, or None to let the model
+    tokenize the text itself.
+    """
+    if token_cache is None:
+        return None
+    return [token_cache.get(prompt["id"]) for prompt in batch]
+
+
+def _measure_batch(
+    model: InferenceBackend,
+    batch: List[Dict[str, Any]],
+    generation_config: dict,
+    monitor: ResourceMonitor,
+    token_cache: TokenCache | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Generate one batch under the resource monitor and return a
+    result row per prompt.
+
+    With a `token_cache`, prompts are fed as cached token ids so
+    tokenization stays out of the measured latency.
+    """
+    input_ids = _cached_ids(token_cache, batch)
+
+    with monitor:
+        latency, outputs = measure_latency(
+            model.generate_batch,
+            [prompt["prompt"] for prompt in batch],
+            generation_config,
+            input_ids=input_ids,
+        )
+
+    mem = monitor.stats
+
+    token_counts = [out["output_tokens"] for out in outputs]
+    batch_throughput = (
+        None if None in token_counts
+        else round(compute_throughput(sum(token_counts), latency), 4)
+    )
+    padding_efficiency = compute_padding_efficiency(
+        [out["prompt_tokens"] for out in outputs]
+    )
+
+    rows = []
+
+    # Every request in a batch completes when the batch does,
+    # so per-request latency is the batch wall time.
+    for prompt, output in zip(batch, outputs):
+        metrics = aggregate_metrics(
+            latency=latency,
+            tokens_generated=output["output_tokens"],
+            output_text=output["output_text"],
+            prompt_tokens=output["prompt_tokens"],
+            token_times=output["token_times"],
+        )
+
+        if output["timed_out"]:
+            generated = output["output_tokens"]
+            logging.warning(
+                f"Prompt {prompt['id']} timed out"
+                + (f" after {generated} tokens" if generated is not None else "")
+            )
+
+        rows.append({
+            "prompt_id": prompt["id"],
+            "status": "timeout" if output["timed_out"] else "ok",
+            "batch_size": len(batch),
+            **metrics,
+            "batch_tokens_per_sec": batch_throughput,
+            "padding_efficiency": round(padding_efficiency, 4),
+            "acceptance_rate": output.get("acceptance_rate"),
+            **output.get("timings", {}),
+            "peak_ram_mb": mem["peak_ram_mb"],
+            "mean_ram_mb": mem["mean_ram_mb"],
+            "peak_gpu_mb": mem["peak_gpu_mb"],
+        })
+
+    return rows
+
+
+def _new_run_dir(base_dir: Path) -> Path:
+    """
+    Create and return a run directory named after the current minute,
+    suffixed when that name is already taken.
+    """
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
+    base_dir.mkdir(parents=True, exist_ok=True)
+
+    suffix = 0
+    while True:
+        name = timestamp if suffix == 0 else f"{timestamp}_{suffix}"
+        try:
+            (base_dir / name).mkdir()
+            return base_dir / name
+        except FileExistsError:
+            suffix += 1
+
+
+def _prepare_run(
+    config: dict,
+    output_dir: Path | None = None,
+) -> tuple[Path, Path, PromptDataset]:
+    """
+    Create the timestamped (or given) and latest output directories,
+    load the prompt dataset and record environment metadata.
+
+    A fresh run never reuses an existing directory: a second run
+    started in the same minute gets a numbered suffix
+    (`<YYYY-MM-DD_HHMM>_1`, ...).
+    """
+    # Output directories (timestamped + latest)
     base_dir = Path(config["output"]["base_dir"])
 
-    output_dir = base_dir / timestamp
-    latest_dir = base_dir / "latest"
+    if output_dir is None:
+        output_dir = _new_run_dir(base_dir)
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-    output_dir.mkdir(parents=True, exist_ok=True)
+    latest_dir = base_dir / "latest"
     latest_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load dataset
-    dataset_cfg = config["dataset"]
-    prompts = load_dataset(
-        path=dataset_cfg["path"],
-        fmt=dataset_cfg["format"],
-        text_field=dataset_cfg["text_field"],
-        max_prompts=dataset_cfg.get("max_prompts"),
+    # Dataset is streamed from disk on every pass, never held in memory
+    prompts = PromptDataset.from_config(
+        config["dataset"],
+        seed=config.get("benchmark", {}).get("seed", 42),
     )
 
-    logging.info(f"Loaded {len(prompts)} prompts")
+    logging.info(f"Streaming prompts from {config['dataset']['path']}")
 
     # Environment metadata
     env = get_environment_metadata()
@@ -57,108 +382,1120 @@ def run_benchmark(config: dict) -> None:
 
     logging.info(f"Environment metadata saved to {env_path}")
 
-    results: List[Dict[str, Any]] = []
+    return output_dir, latest_dir, prompts
+
+
+def _update_latest(output_dir: Path, latest_dir: Path) -> None:
+    """
+    Mirror the files of the most recent run into latest/.
+    """
+    for item in latest_dir.iterdir():
+        if item.is_file():
+            item.unlink()
+
+    for file in output_dir.iterdir():
+        if file.is_file():
+            target = latest_dir / file.name
+            target.write_bytes(file.read_bytes())
+
+    logging.info("Updated outputs/latest with most recent run")
+
+
+# One per process: worker processes of a parallel sweep each keep their own
+_MODEL_CACHE: ModelCache | None = None
+
+
+def _get_model_cache(config: dict) -> ModelCache | None:
+    """
+    Return the process-wide model cache when `runtime.model_cache` is
+    enabled, (re)creating it if the memory budget changed.
+    """
+    global _MODEL_CACHE
+
+    cache_cfg = config["runtime"].get("model_cache")
+    if not cache_cfg or not cache_cfg.get("enabled", False):
+        return None
 
-    # Model loop
-    for model_cfg in config["models"]:
-        model_id = model_cfg["id"]
-        model_name = model_cfg["name"]
+    max_memory_mb = cache_cfg["max_memory_mb"]
+    if _MODEL_CACHE is None or _MODEL_CACHE.max_memory_mb != max_memory_mb:
+        _MODEL_CACHE = ModelCache(max_memory_mb)
 
-        logging.info(f"Loading model: {model_name}")
+    return _MODEL_CACHE
 
+
+# One per process, like the model cache: worker processes of a parallel
+# run keep their own metrics and publish them to their own textfile
+_LIVE_METRICS: LiveMetrics | None = None
+_METRICS_TEXTFILE: TextfileExporter | None = None
+
+
+def _get_live_metrics(config: dict) -> LiveMetrics | None:
+    """
+    Return the process-wide live metrics when `live_metrics` is
+    configured, creating them (and the textfile exporter) on first use.
+    In a worker process the textfile name gets the worker's pid.
+    """
+    global _LIVE_METRICS, _METRICS_TEXTFILE
+
+    live_cfg = config.get("live_metrics")
+    if not live_cfg:
+        return None
+
+    if _LIVE_METRICS is None:
+        _LIVE_METRICS = LiveMetrics()
+
+        if live_cfg.get("textfile"):
+            path = Path(live_cfg["textfile"])
+            if mp.parent_process() is not None:
+                path = worker_textfile_path(path, os.getpid())
+
+            _METRICS_TEXTFILE = TextfileExporter(
+                _LIVE_METRICS,
+                path,
+                interval_seconds=live_cfg.get("interval_seconds", 5.0),
+            )
+
+    return _LIVE_METRICS
+
+
+def _publish_live_metrics(force: bool = False) -> None:
+    """
+    Refresh the metrics textfile (rate-limited unless `force`); the HTTP
+    endpoint renders on every scrape and needs no refresh.
+    """
+    if _METRICS_TEXTFILE is not None:
         try:
-            model = HuggingFaceModel(
-                model_id=model_id,
-                device=config["runtime"]["device"],
-                dtype=model_cfg["dtype"],
+            _METRICS_TEXTFILE.write(force=force)
+        except OSError as exc:
+            logging.warning(f"Failed to write metrics textfile: {exc}")
+
+
+@contextmanager
+def _metrics_endpoint(config: dict):
+    """
+    Serve live metrics over HTTP for the duration of a run when
+    `live_metrics.port` is set. A port that cannot be bound is logged
+    and the run continues without the endpoint.
+    """
+    live_cfg = config.get("live_metrics") or {}
+    metrics = _get_live_metrics(config)
+
+    server = None
+    if metrics is not None and live_cfg.get("port") is not None:
+        try:
+            server = MetricsServer(
+                metrics,
+                host=live_cfg.get("host", "127.0.0.1"),
+                port=live_cfg["port"],
+            ).start()
+            logging.info(f"Serving live metrics at {server.url}")
+        except BenchmarkError as exc:
+            logging.error(str(exc))
+
+    try:
+        yield
+    finally:
+        _publish_live_metrics(force=True)
+        if server is not None:
+            server.stop()
+
+
+def _model_cache_key(model_cfg: dict, config: dict) -> tuple:
+    """
+    Everything that changes the loaded weights or how they are loaded;
+    configs that agree on all of it can share one loaded model. Load
+    options are included so variants comparing them (e.g.
+    `low_cpu_mem_usage`) each pay, and record, their own cold start.
+    """
+    assistant = model_cfg.get("assistant") or {}
+    optimizations = model_cfg.get("optimizations") or {}
+
+    return (
+        model_cfg["id"],
+        config["runtime"]["device"],
+        model_cfg.get("dtype"),
+        model_cfg.get("low_cpu_mem_usage", False),
+        model_cfg.get("use_safetensors"),
+        model_cfg.get("base_url"),
+        assistant.get("id"),
+        assistant.get("dtype"),
+        assistant.get("num_assistant_tokens"),
+        optimizations.get("attn_implementation"),
+        optimizations.get("compile"),
+    )
+
+
+def _load_model(
+    model_cfg: dict,
+    config: dict,
+) -> tuple[InferenceBackend | None, Dict[str, Any]]:
+    """
+    Load a configured model (or reuse it from the model cache) and
+    describe the load.
+
+    Returns (model, load_record); the model is None when loading
+    failed, so the remaining models still run. The record carries the
+    cold-start breakdown from the backend's `load_stats`, or just
+    the lookup time on a cache hit.
+    """
+    logging.info(f"Loading model: {model_cfg['name']}")
+
+    record = {
+        "model_id": model_cfg["id"],
+        "model_name": model_cfg["name"],
+        "device": config["runtime"]["device"],
+        "provider": model_cfg.get("provider", "huggingface"),
+        "dtype": model_cfg.get("dtype"),
+        "low_cpu_mem_usage": model_cfg.get("low_cpu_mem_usage", False),
+        "status": "ok",
+        "cache_hit": False,
+    }
+
+    assistant = model_cfg.get("assistant") or {}
+    if assistant:
+        record["assistant_id"] = assistant["id"]
+
+    optimizations = model_cfg.get("optimizations") or {}
+    for key in OPTIMIZATION_KEYS:
+        if key in optimizations:
+            record[key] = optimizations[key]
+
+    def load() -> InferenceBackend:
+        if model_cfg.get("provider") == "openai":
+            return OpenAIHTTPModel(
+                model_id=model_cfg["id"],
+                base_url=model_cfg["base_url"],
+                timeout_seconds=config["runtime"].get("timeout_seconds"),
+                max_connections=model_cfg.get("max_connections", 8),
+                api_key_env=model_cfg.get("api_key_env"),
             )
-        except ModelLoadError as exc:
-            logging.error(f"Model load failed: {exc}")
-            continue
 
-        for prompt in tqdm(prompts, desc=f"Running {model_name}"):
-            monitor = ResourceMonitor(
-                monitor_gpu=(config["runtime"]["device"] == "cuda")
+        # torch / transformers load only once a local model is needed
+        from benchmark.models import HuggingFaceModel
+
+        return HuggingFaceModel(
+            model_id=model_cfg["id"],
+            device=config["runtime"]["device"],
+            dtype=model_cfg["dtype"],
+            timeout_seconds=config["runtime"].get("timeout_seconds"),
+            low_cpu_mem_usage=model_cfg.get("low_cpu_mem_usage", False),
+            use_safetensors=model_cfg.get("use_safetensors"),
+            assistant_id=assistant.get("id"),
+            assistant_dtype=assistant.get("dtype"),
+            num_assistant_tokens=assistant.get("num_assistant_tokens"),
+            attn_implementation=optimizations.get("attn_implementation"),
+            compile_mode=optimizations.get("compile"),
+        )
+
+    cache = _get_model_cache(config)
+    start = time.perf_counter()
+
+    try:
+        if cache is None:
+            model, cache_hit = load(), False
+        else:
+            model, cache_hit = cache.get_or_load(
+                _model_cache_key(model_cfg, config), load
             )
+    except ModelLoadError as exc:
+        logging.error(f"Model load failed: {exc}")
+        record.update({"status": "error", "error": str(exc)})
+        return None, record
+
+    # A cached model may have been loaded under another config's
+    # timeout or grad mode
+    model.timeout_seconds = config["runtime"].get("timeout_seconds")
+    model.grad_mode = optimizations.get("grad_mode", "no_grad")
+
+    record["cache_hit"] = cache_hit
+    if cache_hit:
+        record["load_total_sec"] = round(time.perf_counter() - start, 4)
+    else:
+        record.update(model.load_stats)
+    record["model_memory_mb"] = model.memory_footprint_mb()
+
+    logging.info(
+        f"Loaded {model_cfg['name']} in {record['load_total_sec']:.2f}s"
+        + (" (model cache hit)" if cache_hit else "")
+    )
+
+    return model, record
+
+
+def _release_model(model: InferenceBackend, model_cfg: dict, config: dict) -> None:
+    """
+    Close a model once its benchmark is done (e.g. an HTTP backend's
+    connection pool and request threads), unless the model cache holds
+    it for a later config; the cache closes it on eviction.
+    """
+    cache = _get_model_cache(config)
+    if cache is None or _model_cache_key(model_cfg, config) not in cache:
+        model.close()
+
 
+def _apply_shared_prefix(
+    model: InferenceBackend,
+    config: dict,
+    load_record: Dict[str, Any],
+) -> None:
+    """
+    Set (or clear) the configured `shared_prefix` on a freshly loaded
+    or cache-reused model and add its prefix stats to the load record.
+    """
+    prefix_cfg = config.get("shared_prefix") or {}
+
+    model.set_prefix(
+        prefix_cfg.get("text"),
+        use_cache=prefix_cfg.get("cache", True),
+    )
+
+    if model.prefix_stats is None:
+        return
+
+    load_record.update(model.prefix_stats)
+
+    if model.prefix_stats["prefix_cached"]:
+        logging.info(
+            f"Shared prefix: {model.prefix_stats['prefix_tokens']} tokens cached "
+            f"({model.prefix_stats['prefix_cache_mb']:.2f} MB KV cache, "
+            f"{model.prefix_stats['prefix_prefill_sec']:.4f}s one-off prefill)"
+        )
+
+
+def _open_token_cache(
+    model: InferenceBackend,
+    prompts: PromptDataset,
+    config: dict,
+) -> TokenCache | None:
+    """
+    Open (building on first use) the token cache for this model's
+    tokenizer when `dataset.token_cache_dir` is configured.
+    """
+    cache_dir = config["dataset"].get("token_cache_dir")
+    if not cache_dir:
+        return None
+
+    if model.tokenizer is None:
+        logging.info("Backend tokenizes server-side; not using the token cache")
+        return None
+
+    return get_or_build_token_cache(prompts, model.tokenizer, Path(cache_dir))
+
+
+def _profile_model(
+    model: InferenceBackend,
+    prompts: Iterable[Dict[str, Any]],
+    config: dict,
+    model_name: str,
+    batch_size: int,
+    token_cache: TokenCache | None,
+    profile_dir: Path,
+) -> None:
+    """
+    Profile the first `profiling.calls` batches of a model in a separate
+    pass after its measured runs, so profiler overhead never reaches the
+    recorded results. Traces and the phase breakdown go to `profile_dir`.
+    """
+    from benchmark.profiling import profile_generation
+
+    if model.tokenizer is None:
+        logging.warning(f"Skipping profile of {model_name}: it is not a local model")
+        return
+
+    profiling_cfg = config.get("profiling") or {}
+    batches = [
+        ([prompt["prompt"] for prompt in batch], _cached_ids(token_cache, batch))
+        for batch in islice(
+            _iter_batches(prompts, batch_size), profiling_cfg.get("calls", 3)
+        )
+    ]
+
+    logging.info(f"Profiling {model_name} ({len(batches)} generate calls)")
+
+    try:
+        profile_generation(
+            model,
+            batches,
+            config["generation"],
+            profile_dir,
+            profiling_cfg,
+            model_name=model_name,
+        )
+    except InferenceError as exc:
+        logging.warning(f"Profiling {model_name} failed: {exc}")
+
+
+def _benchmark_model(
+    model_cfg: dict,
+    prompts: Iterable[Dict[str, Any]],
+    config: dict,
+    sink_path: Path,
+    completed: set | None = None,
+    load_sink_path: Path | None = None,
+    profile_dir: Path | None = None,
+) -> int:
+    """
+    Load one model and run every prompt batch `runs_per_prompt` times,
+    appending result rows to `sink_path` as each batch (or, with
+    length bucketing, each window) completes.
+
+    `completed` holds (prompt_id, run) keys already recorded by an
+    interrupted run; those prompts are skipped, and the model is not
+    loaded at all when nothing is left to do. The model load record is
+    appended to `load_sink_path`. With a `profile_dir`, the model is
+    profiled after its measured runs (see `_profile_model`).
+
+    Self-contained so it can run either in-process or inside a
+    worker process of a parallel sweep. Returns the number of rows
+    written.
+    """
+    benchmark_cfg = config.get("benchmark", {})
+    runs_per_prompt = benchmark_cfg.get("runs_per_prompt", 1)
+    seed = benchmark_cfg.get("seed", 42)
+
+    model_id = model_cfg["id"]
+    model_name = model_cfg["name"]
+
+    completed = completed or set()
+
+    def pending(run: int) -> Iterator[Dict[str, Any]]:
+        return (p for p in prompts if (p["id"], run) not in completed)
+
+    if completed and not any(
+        next(pending(run), None) for run in range(runs_per_prompt)
+    ):
+        logging.info(f"All results for {model_name} already recorded, skipping")
+        return 0
+
+    # Served models never touch torch, so an HTTP-only run does not
+    # import the ML stack
+    local = model_cfg.get("provider") != "openai"
+    threads = _torch_threads(model_cfg.get("optimizations") or {}) if local else nullcontext()
+
+    with threads:
+        model, load_record = _load_model(model_cfg, config)
+
+        if model is not None:
             try:
-                monitor.start()
+                _apply_shared_prefix(model, config, load_record)
+            except InferenceError as exc:
+                logging.error(f"Shared prefix prefill failed: {exc}")
+                load_record.update({"status": "error", "error": str(exc)})
+                _release_model(model, model_cfg, config)
+                model = None
+
+        def record_load() -> None:
+            if load_sink_path is not None:
+                with ResultsSink(load_sink_path) as load_sink:
+                    load_sink.write_rows([load_record])
+
+        if model is None:
+            record_load()
+            return 0
+
+        batch_size = model_cfg.get("batch_size", config["runtime"].get("batch_size", 1))
+
+        monitor = ResourceMonitor(
+            monitor_gpu=(config["runtime"]["device"] == "cuda"),
+            interval=config["runtime"].get("monitor_interval_seconds", 0.01),
+        )
+
+        token_cache = _open_token_cache(model, prompts, config)
+
+        live = _get_live_metrics(config)
+        if live is not None:
+            live.track_memory(model_name, monitor)
+
+        if local:
+            import torch
+            from transformers import set_seed
+
+            thread_counts = {
+                "torch_threads": torch.get_num_threads(),
+                "torch_interop_threads": torch.get_num_interop_threads(),
+            }
+        else:
+            thread_counts = {"torch_threads": None, "torch_interop_threads": None}
+
+        sink = ResultsSink(sink_path)
+
+        try:
+            sink.open()
+            load_record.update(_warmup(
+                model,
+                next(_iter_batches(prompts, batch_size), []),
+                config,
+                model_name,
+                token_cache,
+            ))
+            record_load()
 
-                latency, (output_text, output_tokens) = measure_latency(
-                    model.generate,
-                    prompt["prompt"],
-                    config["generation"],
+            for run in range(runs_per_prompt):
+                windows = _iter_windows(
+                    model,
+                    pending(run),
+                    batch_size,
+                    config["runtime"].get("length_bucketing"),
+                    token_cache,
                 )
 
-                monitor.sample()
-                mem = monitor.stop()
+                if local:
+                    set_seed(seed + run)
+
+                desc = f"Running {model_name}"
+                if runs_per_prompt > 1:
+                    desc += f" [run {run + 1}/{runs_per_prompt}]"
+
+                progress = tqdm(desc=desc, unit="batch")
+
+                for window, batches in windows:
+                    rows = []
+                    for batch in batches:
+                        try:
+                            batch_rows = _measure_batch(
+                                model, batch, config["generation"], monitor, token_cache
+                            )
+                        except InferenceError as exc:
+                            logging.warning(f"Inference failed: {exc}")
+                            if live is not None:
+                                live.record_failures(model_name, len(batch))
+                        else:
+                            rows.extend(batch_rows)
+                            if live is not None:
+                                live.record_rows(model_name, batch_rows)
+                        _publish_live_metrics()
+                        progress.update()
+
+                    # Bucketing reorders prompts; record them in dataset order
+                    position = {prompt["id"]: i for i, prompt in enumerate(window)}
+                    rows.sort(key=lambda row: position[row["prompt_id"]])
+
+                    sink.write_rows([
+                        {
+                            "model_id": model_id,
+                            "model_name": model_name,
+                            "run": run,
+                            **thread_counts,
+                            **row,
+                        }
+                        for row in rows
+                    ])
 
-                metrics = aggregate_metrics(
-                    latency=latency,
-                    tokens_generated=output_tokens,
-                    output_text=output_text,
+                progress.close()
+
+            if profile_dir is not None:
+                _profile_model(
+                    model, prompts, config, model_name, batch_size, token_cache, profile_dir
                 )
 
-                results.append({
-                    "model_id": model_id,
-                    "model_name": model_name,
-                    "prompt_id": prompt["id"],
-                    **metrics,
-                    "peak_ram_mb": mem["peak_ram_mb"],
-                    "peak_gpu_mb": mem["peak_gpu_mb"],
-                })
+        finally:
+            sink.close()
+            monitor.cleanup()
+            _release_model(model, model_cfg, config)
+            if live is not None:
+                live.untrack(model_name)
+                _publish_live_metrics(force=True)
 
-            except InferenceError as exc:
-                logging.warning(f"Inference failed: {exc}")
+        return sink.rows_written
+
+
+def run_benchmark(config: dict, resume_dir: Path | None = None) -> None:
+    """
+    Run the benchmark, or continue an interrupted run in `resume_dir`
+    by scheduling only the (model, prompt, run) cells it has not
+    recorded yet.
+    """
+    import pandas as pd
 
-            finally:
-                monitor.cleanup()
+    logging.info("Initializing benchmark run")
+
+    if resume_dir is not None and not (resume_dir / "results").is_dir():
+        raise RuntimeError(f"No recorded results to resume in {resume_dir}")
+
+    output_dir, latest_dir, prompts = _prepare_run(config, resume_dir)
+
+    # Result rows are streamed to one JSONL part per model
+    results_dir = output_dir / "results"
+    loads_dir = output_dir / "loads"
+
+    # Variants of one model share its id, so results are keyed by name
+    models = expand_model_variants(config["models"])
+    completed = {}
+
+    if resume_dir is not None:
+        completed = load_completed_keys(results_dir, key="model_name")
+        logging.info(
+            f"Resuming {resume_dir}: "
+            f"{sum(len(keys) for keys in completed.values())} results already recorded"
+        )
+
+    profiles_dir = None
+    if (config.get("profiling") or {}).get("enabled", False):
+        profiles_dir = output_dir / "profiles"
+
+    tasks = [
+        (
+            model_cfg,
+            prompts,
+            config,
+            result_part_path(results_dir, index),
+            completed.get(model_cfg["name"], set()),
+            result_part_path(loads_dir, index),
+            (
+                profiles_dir / profile_dir_name(index, model_cfg["name"])
+                if profiles_dir is not None
+                else None
+            ),
+        )
+        for index, model_cfg in enumerate(models)
+    ]
+
+    parallel_cfg = config["runtime"].get("parallel")
+
+    with _metrics_endpoint(config):
+        if parallel_cfg and parallel_cfg.get("workers", 1) > 1:
+            logging.info(
+                f"Running {len(models)} models across "
+                f"{parallel_cfg['workers']} worker processes"
+            )
+
+            if (config.get("live_metrics") or {}).get("port") is not None:
+                logging.warning(
+                    "The live metrics endpoint does not see worker processes; "
+                    "set live_metrics.textfile to export their metrics"
+                )
+
+            total_rows = sum(run_in_workers(
+                _benchmark_model,
+                tasks,
+                workers=parallel_cfg["workers"],
+                threads_per_worker=parallel_cfg.get("threads_per_worker", 1),
+                pin_cores=parallel_cfg.get("pin_cores", True),
+            ))
+
+        else:
+            # Model loop
+            total_rows = sum(_benchmark_model(*task) for task in tasks)
 
     # Safety check
-    if not results:
+    if not total_rows and not completed:
         raise RuntimeError(
             "Benchmark completed but NO RESULTS were collected. "
             "Check model loading or inference."
         )
 
-    # Reporting (CSV + plots)
-    csv_path = save_results_csv(results, output_dir)
-    plot_average_latency(results, output_dir)
-    plot_peak_memory(results, output_dir)
+    # Reporting (CSV + plots), derived from the sink by streaming reads
+    csv_path = save_results_csv(results_dir, output_dir)
+    means = summarize_means(results_dir, SUMMARY_METRICS + ("acceptance_rate",))
+    statistics = summarize_statistics(results_dir)
+    stats_path = save_statistics_csv(statistics, output_dir)
+    model_loads = read_model_loads(loads_dir)
+    save_model_loads_csv(model_loads, output_dir)
+
+    assisted = compare_assisted_decoding(means, {
+        model_cfg["name"]: model_cfg["baseline_name"]
+        for model_cfg in models
+        if "baseline_name" in model_cfg
+    })
+    if not assisted.empty:
+        assisted.round(6).to_csv(output_dir / "assisted_comparison.csv", index=False)
+    plot_average_latency(means, output_dir)
+    plot_peak_memory(means, output_dir)
+
+    phases = pd.DataFrame()
+    if profiles_dir is not None:
+        phases = read_profile_phases(profiles_dir)
+        if not phases.empty:
+            phases.to_csv(output_dir / "phase_breakdown.csv", index=False)
+            logging.info(f"Profiles saved to {profiles_dir}")
 
-    print_summary(results)
+    print_summary(means)
 
     logging.info(f"Results CSV saved at {csv_path}")
+    logging.info(f"Statistics CSV saved at {stats_path}")
 
     # Summary markdown
     summary_path = output_dir / "summary.md"
 
-    df = pd.DataFrame(results)
-    summary_df = df.groupby("model_name")[[
-        "latency_sec",
-        "tokens_per_sec",
-        "peak_ram_mb"
-    ]].mean().round(3)
+    summary_df = means[list(SUMMARY_METRICS)].round(3)
 
     with open(summary_path, "w", encoding="utf-8") as f:
         f.write("# Benchmark Summary\n\n")
-        f.write(f"- Models tested: {df['model_name'].nunique()}\n")
-        f.write(f"- Total runs: {len(df)}\n\n")
+        f.write(f"- Models tested: {len(means)}\n")
+        f.write(f"- Total runs: {int(means['rows'].sum())}\n\n")
         f.write("## Average Metrics per Model\n\n")
         f.write(summary_df.to_markdown())
+        f.write("\n\n## Distribution Statistics\n\n")
+        f.write(statistics.round(4).to_markdown(index=False))
 
-    logging.info(f"Summary report saved to {summary_path}")
+        if not assisted.empty:
+            f.write("\n\n## Assisted vs Plain Decoding\n\n")
+            f.write(assisted.round(4).to_markdown(index=False))
 
-    # Update latest/ directory
-    for item in latest_dir.iterdir():
-        if item.is_file():
-            item.unlink()
+        if not phases.empty:
+            f.write("\n\n## Generation Phases (profiled calls)\n\n")
+            f.write(
+                phases.pivot(index="model_name", columns="phase", values="per_call_sec")
+                .reindex(columns=list(PHASES) + ["other"])
+                .round(4)
+                .to_markdown()
+            )
 
-    for file in output_dir.iterdir():
-        if file.is_file():
-            target = latest_dir / file.name
-            target.write_bytes(file.read_bytes())
+        if not model_loads.empty:
+            f.write("\n\n## Model Load Times\n\n")
+            f.write(
+                model_loads.reindex(columns=list(MODEL_LOAD_COLUMNS))
+                .round(4)
+                .to_markdown(index=False)
+            )
 
-    logging.info("Updated outputs/latest with most recent run")
+    logging.info(f"Summary report saved to {summary_path}")
+
+    _update_latest(output_dir, latest_dir)
 
     logging.info("Benchmark completed successfully")
+
+
+def _run_load_level(
+    model,
+    prompts: List[Dict[str, Any]],
+    config: dict,
+    pattern: str,
+    level: float,
+    num_requests: int,
+    seed: int,
+    min_workers: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Drive one offered-load level against a model or scheduler.
+
+    `min_workers` lets a micro-batching scheduler receive enough
+    concurrent submissions to actually fill its batches.
+    """
+    if pattern == "concurrency":
+        return run_closed_loop(
+            model,
+            prompts,
+            config["generation"],
+            concurrency=level,
+            num_requests=num_requests,
+        )
+
+    return run_open_loop(
+        model,
+        prompts,
+        config["generation"],
+        arrival_offsets=generate_arrival_offsets(
+            num_requests, level, pattern, seed
+        ),
+        workers=max(config["load"].get("workers", 1), min_workers),
+    )
+
+
+def run_load_test(config: dict) -> None:
+    """
+    Benchmark each model under concurrent traffic at every configured
+    offered-load level (request rate or concurrency).
+    """
+    import pandas as pd
+
+    logging.info("Initializing load test")
+
+    load_cfg = config.get("load")
+    if not load_cfg:
+        raise RuntimeError("Load test requires a 'load' section in the config")
+
+    output_dir, latest_dir, dataset = _prepare_run(config)
+
+    # Requests cycle through the prompts by index, so only the first
+    # `num_requests` prompts are ever needed.
+    pattern = load_cfg["pattern"]
+    prompts = list(islice(dataset, load_cfg.get("num_requests")))
+    num_requests = load_cfg.get("num_requests", len(prompts))
+
+    if not prompts:
+        raise RuntimeError("Load test requires at least one prompt")
+    seed = config.get("benchmark", {}).get("seed", 42)
+
+    if pattern == "concurrency":
+        levels = load_cfg.get("concurrency", [1])
+    else:
+        levels = load_cfg.get("request_rates", [1.0])
+
+    # Each level runs unbatched and once per micro-batching max-wait,
+    # so batch size vs max-wait can be tuned against the baseline.
+    batch_size = config["runtime"].get("batch_size", 1)
+    batching_cfg = load_cfg.get("micro_batching", {})
+
+    variants = []
+    if batching_cfg.get("include_unbatched", True) or not batching_cfg:
+        variants.append(("unbatched", None))
+    for max_wait in batching_cfg.get("max_wait_seconds", []):
+        variants.append((f"batch<={batch_size} wait={max_wait * 1000:g}ms", max_wait))
+
+    records: List[Dict[str, Any]] = []
+    summaries: List[Dict[str, Any]] = []
+    load_records: List[Dict[str, Any]] = []
+
+    for model_cfg in expand_model_variants(config["models"]):
+        model, load_record = _load_model(model_cfg, config)
+        load_records.append(load_record)
+        if model is None:
+            continue
+
+        try:
+            _apply_shared_prefix(model, config, load_record)
+        except InferenceError as exc:
+            logging.error(f"Shared prefix prefill failed: {exc}")
+            _release_model(model, model_cfg, config)
+            continue
+
+        try:
+            load_record.update(_warmup(model, prompts[:1], config, model_cfg["name"]))
+
+            for level in levels:
+                for variant, max_wait in variants:
+                    logging.info(
+                        f"Load level {level} ({pattern}, {variant}) on {model_cfg['name']}"
+                    )
+
+                    labels = {
+                        "model_id": model_cfg["id"],
+                        "model_name": model_cfg["name"],
+                        "pattern": pattern,
+                        "offered_load": level,
+                        "variant": variant,
+                    }
+
+                    if max_wait is None:
+                        level_records = _run_load_level(
+                            model, prompts, config, pattern, level, num_requests, seed
+                        )
+                    else:
+                        with MicroBatchScheduler(
+                            model,
+                            max_batch_size=batch_size,
+                            max_wait_seconds=max_wait,
+                        ) as scheduler:
+                            level_records = _run_load_level(
+                                scheduler, prompts, config, pattern, level,
+                                num_requests, seed,
+                                min_workers=batch_size,
+                            )
+
+                    records.extend({**labels, **record} for record in level_records)
+                    summaries.append({**labels, **summarize_load(level_records)})
+        finally:
+            _release_model(model, model_cfg, config)
+
+    if not summaries:
+        raise RuntimeError(
+            "Load test completed but NO RESULTS were collected. "
+            "Check model loading or inference."
+        )
+
+    records_path, summary_path = save_load_results(records, summaries, output_dir)
+    save_model_loads_csv(pd.DataFrame(load_records), output_dir)
+    plot_latency_vs_throughput(summaries, output_dir)
+
+    print("\n===== Load Test Summary =====")
+    print(pd.DataFrame(summaries).to_string(index=False))
+
+    logging.info(f"Load test records saved at {records_path}")
+    logging.info(f"Load test summary saved at {summary_path}")
+
+    _update_latest(output_dir, latest_dir)
+
+    logging.info("Load test completed successfully")
+
+
+def run_prefix_benchmark(config: dict) -> None:
+    """
+    Compare prefill time with and without a reused shared-prefix KV
+    cache at each `shared_prefix.compare_lengths` prefix length.
+
+    The configured prefix text is tiled to each length; every prompt
+    is prefilled once per run with the prefix recomputed and once with
+    its cached past_key_values.
+    """
+    import pandas as pd
+
+    logging.info("Initializing prefix cache benchmark")
+
+    prefix_cfg = config.get("shared_prefix") or {}
+    lengths = prefix_cfg.get("compare_lengths")
+    if not prefix_cfg.get("text") or not lengths:
+        raise RuntimeError(
+            "Prefix benchmark requires shared_prefix.text and "
+            "shared_prefix.compare_lengths in the config"
+        )
+
+    output_dir, latest_dir, dataset = _prepare_run(config)
+
+    prompts = list(islice(dataset, prefix_cfg.get("num_prompts", 8)))
+    if not prompts:
+        raise RuntimeError("Prefix benchmark requires at least one prompt")
+
+    runs = config.get("benchmark", {}).get("runs_per_prompt", 1)
+
+    records: List[Dict[str, Any]] = []
+    summaries: List[Dict[str, Any]] = []
+
+    for model_cfg in expand_model_variants(config["models"]):
+        model, _ = _load_model(model_cfg, config)
+        if model is None:
+            continue
+
+        try:
+            if model.tokenizer is None:
+                logging.warning(
+                    f"Skipping {model_cfg['name']}: prefix caching needs a local model"
+                )
+                continue
+
+            base_ids = model.tokenizer(prefix_cfg["text"])["input_ids"]
+            max_positions = getattr(model.model.config, "max_position_embeddings", None)
+
+            # Untimed pass so kernel setup is not charged to the first length
+            _warmup(model, prompts[:1], config, model_cfg["name"])
+
+            for length in lengths:
+                if max_positions is not None and length >= max_positions:
+                    logging.warning(
+                        f"Skipping prefix length {length}: {model_cfg['name']} "
+                        f"supports at most {max_positions} positions"
+                    )
+                    continue
+
+                prefix_ids = tile_prefix_ids(base_ids, length)
+                labels = {
+                    "model_id": model_cfg["id"],
+                    "model_name": model_cfg["name"],
+                    "prefix_tokens": length,
+                }
+
+                logging.info(f"Prefix length {length} on {model_cfg['name']}")
+
+                try:
+                    model.set_prefix_ids(prefix_ids, use_cache=False)
+                    uncached = measure_prefill(model, prompts, config["generation"], runs)
+
+                    model.set_prefix_ids(prefix_ids, use_cache=True)
+                    cached = measure_prefill(model, prompts, config["generation"], runs)
+                except InferenceError as exc:
+                    logging.warning(f"Prefix benchmark failed at length {length}: {exc}")
+                    continue
+
+                records.extend({**labels, "cached": False, **r} for r in uncached)
+                records.extend({**labels, "cached": True, **r} for r in cached)
+                summaries.append({
+                    **labels,
+                    **summarize_prefix_cache(uncached, cached, model.prefix_stats),
+                })
+
+        finally:
+            # A cached model must not carry the prefix into later configs
+            model.set_prefix(None)
+            _release_model(model, model_cfg, config)
+
+    if not summaries:
+        raise RuntimeError(
+            "Prefix benchmark completed but NO RESULTS were collected. "
+            "Check model loading or inference."
+        )
+
+    records_path, summary_path = save_prefix_results(records, summaries, output_dir)
+    plot_prefill_vs_prefix_length(summaries, output_dir)
+
+    print("\n===== Prefix Cache Summary =====")
+    print(pd.DataFrame(summaries).to_string(index=False))
+
+    logging.info(f"Prefix cache records saved at {records_path}")
+    logging.info(f"Prefix cache summary saved at {summary_path}")
+
+    _update_latest(output_dir, latest_dir)
+
+    logging.info("Prefix cache benchmark completed successfully")
+
+
+# How long a sweep worker waits for the others to finish loading
+_SWEEP_BARRIER_TIMEOUT_SEC = 1800
+
+
+def _measure_thread_setting(
+    model: InferenceBackend,
+    model_cfg: dict,
+    prompts: List[Dict[str, Any]],
+    config: dict,
+    barrier=None,
+) -> Dict[str, Any]:
+    """
+    Warm the model up under the current thread settings, then generate
+    every prompt `runs_per_prompt` times. With a `barrier`, measuring
+    starts only once all concurrent workers are loaded and warm, so
+    their windows overlap.
+    """
+    batch_size = model_cfg.get("batch_size", config["runtime"].get("batch_size", 1))
+    runs = config.get("benchmark", {}).get("runs_per_prompt", 1)
+
+    _warmup(model, prompts[:batch_size], config, model_cfg["name"])
+
+    if barrier is not None:
+        barrier.wait(timeout=_SWEEP_BARRIER_TIMEOUT_SEC)
+
+    return measure_generation(model, prompts * runs, config["generation"], batch_size)
+
+
+def _thread_sweep_task(
+    model_cfg: dict,
+    prompts: List[Dict[str, Any]],
+    config: dict,
+    barrier=None,
+) -> Dict[str, Any]:
+    """
+    One worker's share of a multi-worker sweep setting; runs in a
+    worker process whose thread count `run_in_workers` has assigned.
+    """
+    with _torch_threads({}):
+        model, _ = _load_model(model_cfg, config)
+
+        if model is None:
+            if barrier is not None:
+                # Release the workers already waiting instead of timing out
+                barrier.abort()
+            raise ModelLoadError(f"Failed to load {model_cfg['name']}")
+
+        try:
+            return _measure_thread_setting(model, model_cfg, prompts, config, barrier)
+        finally:
+            _release_model(model, model_cfg, config)
+
+
+def run_thread_sweep(config: dict) -> None:
+    """
+    Run the same prompts at each `thread_sweep` setting (intra-op
+    thread count, optionally times a number of concurrent worker
+    processes) and report throughput, latency and parallel efficiency
+    per setting.
+
+    Single-worker settings run in-process on one loaded model; multi-
+    worker settings split the prompts across spawned workers, each
+    pinned to its own cores when enough are available.
+    """
+    import pandas as pd
+
+    logging.info("Initializing thread scaling sweep")
+
+    sweep_cfg = config.get("thread_sweep") or {}
+    if not sweep_cfg.get("thread_counts"):
+        raise RuntimeError(
+            "Thread sweep requires thread_sweep.thread_counts in the config"
+        )
+
+    output_dir, latest_dir, dataset = _prepare_run(config)
+
+    prompts = list(islice(dataset, sweep_cfg.get("num_prompts", 8)))
+    if not prompts:
+        raise RuntimeError("Thread sweep requires at least one prompt")
+
+    settings = plan_thread_settings(sweep_cfg)
+    cores = available_cores()
+
+    results: List[Dict[str, Any]] = []
+
+    for model_cfg in expand_model_variants(config["models"]):
+        model = None
+        load_failed = False
+
+        try:
+            for setting in settings:
+                workers = setting["workers"]
+                threads = setting["threads_per_worker"]
+                pinned = (
+                    workers > 1
+                    and sweep_cfg.get("pin_cores", True)
+                    and setting["total_threads"] <= len(cores)
+                )
+
+                if setting["total_threads"] > len(cores):
+                    logging.warning(
+                        f"{workers} workers x {threads} threads oversubscribes "
+                        f"the {len(cores)} available cores"
+                    )
+
+                logging.info(
+                    f"Sweeping {model_cfg['name']}: {workers} workers x {threads} threads"
+                )
+
+                if workers == 1:
+                    if load_failed:
+                        continue
+
+                    if model is None:
+                        model, _ = _load_model(model_cfg, config)
+                        if model is None:
+                            # Workers load their own copy, so multi-worker
+                            # settings still run
+                            logging.warning(
+                                f"Skipping single-worker settings for {model_cfg['name']}: "
+                                "model load failed"
+                            )
+                            load_failed = True
+                            continue
+
+                    with _torch_threads({"num_threads": threads}):
+                        measurements = [
+                            _measure_thread_setting(model, model_cfg, prompts, config)
+                        ]
+                else:
+                    with mp.get_context("spawn").Manager() as manager:
+                        barrier = manager.Barrier(workers)
+                        measurements = run_in_workers(
+                            _thread_sweep_task,
+                            [
+                                (model_cfg, prompts[i::workers], config, barrier)
+                                for i in range(workers)
+                            ],
+                            workers=workers,
+                            threads_per_worker=threads,
+                            pin_cores=pinned,
+                        )
+
+                record = {
+                    "model_id": model_cfg["id"],
+                    "model_name": model_cfg["name"],
+                    **setting,
+                    "pinned": pinned,
+                }
+
+                if len(measurements) < workers:
+                    logging.warning(
+                        f"Skipping {workers} x {threads} for {model_cfg['name']}: "
+                        "a worker failed"
+                    )
+                    continue
+
+                results.append({**record, **combine_measurements(measurements)})
+        finally:
+            if model is not None:
+                _release_model(model, model_cfg, config)
+
+    if not results:
+        raise RuntimeError(
+            "Thread sweep completed but NO RESULTS were collected. "
+            "Check model loading or inference."
+        )
+
+    summaries = summarize_scaling(results)
+
+    results_path = save_scaling_results(summaries, output_dir)
+    plot_thread_scaling(summaries, output_dir)
+
+    print("\n===== Thread Scaling Summary =====")
+    print(pd.DataFrame(summaries).drop(columns=["model_id"]).to_string(index=False))
+
+    logging.info(f"Thread scaling results saved at {results_path}")
+
+    _update_latest(output_dir, latest_dir)
+
+    logging.info("Thread scaling sweep completed successfully")
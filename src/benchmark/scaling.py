@@ -0,0 +1,147 @@
+import time
+from itertools import product
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmark.exceptions import InferenceError
+from benchmark.metrics import measure_latency
+
+
+def plan_thread_settings(sweep_config: dict) -> List[Dict[str, int]]:
+    """
+    Every (workers, threads per worker) combination of a thread sweep,
+    ordered by the total number of threads used.
+    """
+    thread_counts = sweep_config["thread_counts"]
+    worker_counts = sweep_config.get("workers", [1])
+
+    settings = [
+        {
+            "workers": workers,
+            "threads_per_worker": threads,
+            "total_threads": workers * threads,
+        }
+        for workers, threads in product(worker_counts, thread_counts)
+    ]
+    return sorted(settings, key=lambda s: (s["total_threads"], s["workers"]))
+
+
+def measure_generation(
+    model,
+    prompts: List[Dict[str, Any]],
+    generation_config: dict,
+    batch_size: int = 1,
+) -> Dict[str, Any]:
+    """
+    Generate every prompt once, in batches, and record the output
+    tokens, per-batch latencies and the wall-clock window (epoch
+    seconds, so windows of separate worker processes line up).
+
+    Outputs whose token count the backend could not report (None) are
+    left out of `output_tokens` and counted in `unknown_token_outputs`.
+    """
+    latencies = []
+    output_tokens = 0
+    unknown_token_outputs = 0
+    failed = 0
+
+    start = time.time()
+
+    for i in range(0, len(prompts), batch_size):
+        batch = prompts[i:i + batch_size]
+        try:
+            latency, outputs = measure_latency(
+                model.generate_batch,
+                [prompt["prompt"] for prompt in batch],
+                generation_config,
+            )
+        except InferenceError:
+            failed += len(batch)
+            continue
+
+        latencies.append(latency)
+        for out in outputs:
+            if out["output_tokens"] is None:
+                unknown_token_outputs += 1
+            else:
+                output_tokens += out["output_tokens"]
+
+    return {
+        "start": start,
+        "end": time.time(),
+        "output_tokens": output_tokens,
+        "unknown_token_outputs": unknown_token_outputs,
+        "latencies": latencies,
+        "failed": failed,
+    }
+
+
+def combine_measurements(
+    measurements: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Merge the measurements of concurrent workers into one setting
+    result. Throughput is total output tokens over the span from the
+    first worker starting to the last one finishing; it is None when
+    some output's token count is unknown.
+    """
+    latencies = np.array([l for m in measurements for l in m["latencies"]])
+    tokens = sum(m["output_tokens"] for m in measurements)
+    tokens_known = not any(m.get("unknown_token_outputs") for m in measurements)
+    wall = max(m["end"] for m in measurements) - min(m["start"] for m in measurements)
+
+    result = {
+        "output_tokens": tokens,
+        "failed": sum(m["failed"] for m in measurements),
+        "wall_sec": round(wall, 4),
+        "tokens_per_sec": (
+            None if not tokens_known
+            else round(tokens / wall, 4) if wall > 0
+            else 0.0
+        ),
+        "latency_mean_sec": None,
+        "latency_p90_sec": None,
+    }
+
+    if latencies.size:
+        result["latency_mean_sec"] = round(float(latencies.mean()), 4)
+        result["latency_p90_sec"] = round(float(np.percentile(latencies, 90)), 4)
+
+    return result
+
+
+def summarize_scaling(
+    results: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Add speedup and parallel efficiency to each setting result, per
+    model, relative to that model's setting with the fewest threads:
+
+        speedup    = tokens_per_sec / baseline tokens_per_sec
+        efficiency = speedup / (total_threads / baseline total_threads)
+
+    Efficiency 1.0 is perfect linear scaling.
+    """
+    summaries = []
+
+    models = dict.fromkeys(r["model_name"] for r in results)
+    for model_name in models:
+        rows = sorted(
+            (r for r in results if r["model_name"] == model_name),
+            key=lambda r: (r["total_threads"], r["workers"]),
+        )
+        baseline = next((r for r in rows if (r["tokens_per_sec"] or 0) > 0), None)
+
+        for row in rows:
+            row = {**row, "speedup": None, "parallel_efficiency": None}
+
+            if baseline is not None and row["tokens_per_sec"] is not None:
+                speedup = row["tokens_per_sec"] / baseline["tokens_per_sec"]
+                scale = row["total_threads"] / baseline["total_threads"]
+                row["speedup"] = round(speedup, 4)
+                row["parallel_efficiency"] = round(speedup / scale, 4)
+
+            summaries.append(row)
+
+    return summaries
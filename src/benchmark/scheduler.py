@@ -0,0 +1,150 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from benchmark.exceptions import InferenceError
+
+
+_STOP = object()
+
+
+class MicroBatchScheduler:
+    """
+    Dynamic micro-batching in front of a model.
+
+    Requests submitted from any thread are queued; a dispatcher thread
+    groups them into batches of up to `max_batch_size`, waiting at most
+    `max_wait_seconds` after the oldest queued request before running
+    whatever it has through `model.generate_batch`. Each caller gets
+    its result back through a Future.
+
+    The scheduler exposes the same `generate(prompt, generation_config)`
+    call as the model, so the load generator can drive either one.
+    All requests in a batch are generated with the config of the first.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int,
+        max_wait_seconds: float,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self._stopping = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def start(self):
+        """
+        Start the dispatcher thread.
+        """
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._dispatch_loop,
+            name="micro-batch-scheduler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Dispatch any queued requests, then stop the dispatcher thread.
+        """
+        if self._thread is None:
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, prompt: str, generation_config: dict) -> Future:
+        """
+        Queue a prompt and return a Future resolving to its output dict.
+        """
+        if self._thread is None:
+            raise InferenceError("Micro-batch scheduler is not running")
+
+        future: Future = Future()
+        self._queue.put((prompt, generation_config, future, time.perf_counter()))
+        return future
+
+    def generate(self, prompt: str, generation_config: dict) -> dict:
+        """
+        Blocking equivalent of `HuggingFaceModel.generate`.
+        """
+        return self.submit(prompt, generation_config).result()
+
+    def _collect_batch(self) -> list:
+        """
+        Block for the first request, then keep collecting until the
+        batch is full or the oldest request has waited `max_wait_seconds`.
+        """
+        first = self._queue.get()
+        if first is _STOP:
+            self._stopping = True
+            return []
+
+        batch = [first]
+        deadline = first[3] + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is _STOP:
+                self._stopping = True
+                break
+
+            batch.append(item)
+
+        return batch
+
+    def _dispatch_loop(self):
+        while not self._stopping:
+            batch = self._collect_batch()
+            if batch:
+                self._run_batch(batch)
+
+        # Drain requests that raced with stop()
+        while not self._queue.empty():
+            item = self._queue.get()
+            if item is not _STOP:
+                self._run_batch([item])
+
+    def _run_batch(self, batch: list):
+        dispatch_time = time.perf_counter()
+
+        try:
+            outputs = self.model.generate_batch(
+                [prompt for prompt, _, _, _ in batch],
+                batch[0][1],
+            )
+        except Exception as exc:
+            for _, _, future, _ in batch:
+                future.set_exception(exc)
+            return
+
+        for (_, _, future, enqueued), output in zip(batch, outputs):
+            future.set_result({
+                **output,
+                "batch_size": len(batch),
+                "batch_wait_sec": round(dispatch_time - enqueued, 6),
+            })
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Set
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from benchmark.exceptions import ReportError
+
+
+class ResultsSink:
+    """
+    Append-only JSONL file for result rows.
+
+    Rows are written as they are produced and flushed to disk after
+    every `write_rows` call, so a crash loses at most the batch in
+    flight and memory does not grow with the number of prompts.
+    """
+
+    def __init__(self, path: Path, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.rows_written = 0
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def open(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+            # A crash can leave a half-written last row; terminate it so
+            # rows appended by a resumed run start on a line of their own.
+            if self.path.stat().st_size and not self._ends_with_newline():
+                self._file.write("\n")
+        except OSError as exc:
+            raise ReportError(
+                f"Failed to open results sink {self.path}: {exc}"
+            ) from exc
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Append rows and flush them to disk.
+        """
+        try:
+            for row in rows:
+                self._file.write(json.dumps(row, default=str) + "\n")
+
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+            self.rows_written += len(rows)
+
+        except OSError as exc:
+            raise ReportError(
+                f"Failed to write results to {self.path}: {exc}"
+            ) from exc
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def result_part_path(results_dir: Path, index: int) -> Path:
+    """
+    Path of the JSONL part file for the `index`-th model of a run.
+
+    One part per model lets worker processes write concurrently
+    without sharing a file handle.
+    """
+    return results_dir / f"part-{index:04d}.jsonl"
+
+
+def iter_result_rows(results_dir: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream result rows from every part file in `results_dir`.
+
+    A truncated final line (from a crash mid-write) is skipped with a
+    warning rather than failing the whole read.
+    """
+    for part in sorted(results_dir.glob("part-*.jsonl")):
+        with open(part, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(
+                        f"Skipping malformed result row {part.name}:{line_no}"
+                    )
+
+
+def iter_result_chunks(
+    results_dir: Path,
+    chunksize: int = 50_000,
+) -> Iterator["pd.DataFrame"]:
+    """
+    Stream result rows as DataFrames of at most `chunksize` rows.
+    """
+    import pandas as pd
+
+    chunk: List[Dict[str, Any]] = []
+
+    for row in iter_result_rows(results_dir):
+        chunk.append(row)
+        if len(chunk) >= chunksize:
+            yield pd.DataFrame(chunk)
+            chunk = []
+
+    if chunk:
+        yield pd.DataFrame(chunk)
+
+
+def load_completed_keys(
+    results_dir: Path,
+    key: str = "model_id",
+) -> Dict[str, Set[tuple]]:
+    """
+    Index the result rows already recorded in `results_dir`.
+
+    Returns {row[key]: {(prompt_id, run), ...}} for every recorded
+    row, including timeouts, so a resumed run can skip that work.
+    """
+    completed: Dict[str, Set[tuple]] = {}
+
+    if not results_dir.exists():
+        return completed
+
+    for row in iter_result_rows(results_dir):
+        completed.setdefault(row[key], set()).add(
+            (row["prompt_id"], row.get("run", 0))
+        )
+
+    return completed
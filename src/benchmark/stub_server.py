@@ -0,0 +1,214 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    """
+    Serves `/v1/models` and `/v1/completions` (plain and streamed) in
+    the OpenAI format, over keep-alive HTTP/1.1.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # Send each streamed event immediately instead of coalescing them
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: dict, server_timing: str | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if server_timing:
+            self.send_header("Server-Timing", server_timing)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_event(self, payload) -> None:
+        data = payload if isinstance(payload, str) else json.dumps(payload)
+        self._write_chunk(f"data: {data}\n\n".encode("utf-8"))
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") != "/v1/models":
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        self._send_json(200, {
+            "object": "list",
+            "data": [{"id": self.server.model_id, "object": "model"}],
+        })
+
+    def do_POST(self) -> None:
+        received = time.perf_counter()
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        if self.path.rstrip("/") != "/v1/completions":
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        with self.server.slots:
+            queue_ms = (time.perf_counter() - received) * 1000
+            time.sleep(self.server.queue_delay)
+            queue_ms += self.server.queue_delay * 1000
+
+            prompt = str(request.get("prompt", ""))
+            max_tokens = int(request.get("max_tokens", 16))
+            tokens = [f" tok{i}" for i in range(max_tokens)]
+            usage = {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": len(tokens),
+                "total_tokens": len(prompt.split()) + len(tokens),
+            }
+            completion = {
+                "id": "cmpl-stub",
+                "object": "text_completion",
+                "model": request.get("model", self.server.model_id),
+            }
+
+            if request.get("stream"):
+                self._stream(completion, tokens, usage, queue_ms)
+                return
+
+            time.sleep(self.server.token_delay * len(tokens))
+            total_ms = (time.perf_counter() - received) * 1000
+
+            self._send_json(
+                200,
+                {
+                    **completion,
+                    "choices": [{
+                        "index": 0,
+                        "text": "".join(tokens),
+                        "finish_reason": "length",
+                    }],
+                    "usage": usage,
+                },
+                server_timing=f"queue;dur={queue_ms:.3f}, total;dur={total_ms:.3f}",
+            )
+
+    def _stream(self, completion: dict, tokens: list, usage: dict, queue_ms: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Server-Timing", f"queue;dur={queue_ms:.3f}")
+        self.end_headers()
+
+        try:
+            for i, token in enumerate(tokens):
+                time.sleep(self.server.token_delay)
+                self._send_event({
+                    **completion,
+                    "choices": [{
+                        "index": 0,
+                        "text": token,
+                        "finish_reason": "length" if i == len(tokens) - 1 else None,
+                    }],
+                })
+
+            self._send_event({**completion, "choices": [], "usage": usage})
+            self._send_event("[DONE]")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading (e.g. its deadline passed)
+            self.close_connection = True
+
+
+class StubCompletionServer(ThreadingHTTPServer):
+    """
+    Minimal OpenAI-compatible completion server for tests and dry runs
+    of the HTTP backend, with no model behind it.
+
+    Each request waits `queue_delay` seconds, then emits `max_tokens`
+    synthetic tokens `token_delay` seconds apart; at most
+    `max_concurrency` requests are served at once (the rest queue), and
+    the queue wait and total server time are reported in a
+    `Server-Timing` header. Port 0 picks a free port; see `url`.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        model_id: str = "stub-model",
+        token_delay: float = 0.0,
+        queue_delay: float = 0.0,
+        max_concurrency: int = 64,
+    ):
+        super().__init__((host, port), _CompletionHandler)
+        self.model_id = model_id
+        self.token_delay = token_delay
+        self.queue_delay = queue_delay
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubCompletionServer":
+        """
+        Serve from a background thread.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run a stub OpenAI-compatible completion server",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model-id", default="stub-model")
+    parser.add_argument("--token-delay", type=float, default=0.01,
+                        help="Seconds between generated tokens")
+    parser.add_argument("--queue-delay", type=float, default=0.0,
+                        help="Seconds every request waits before generating")
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    server = StubCompletionServer(
+        host=args.host,
+        port=args.port,
+        model_id=args.model_id,
+        token_delay=args.token_delay,
+        queue_delay=args.queue_delay,
+        max_concurrency=args.max_concurrency,
+    )
+    print(f"Stub completion server listening on {server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
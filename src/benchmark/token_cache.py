@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+from benchmark.exceptions import DatasetError
+
+
+TOKEN_DTYPE = np.int32
+
+
+def _sha256_file(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(dataset) -> str:
+    """
+    Hash the dataset file contents together with the loader options
+    (text field, sampling, sharding, ...), since both decide which
+    prompts the run sees.
+    """
+    options = {
+        "fmt": dataset.fmt,
+        "text_field": dataset.text_field,
+        **dataset.options,
+    }
+
+    digest = hashlib.sha256()
+    digest.update(_sha256_file(Path(dataset.path)).encode())
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """
+    Identify a tokenizer by name plus a hash of its full definition
+    (vocab, merges, normalizers), so a changed revision under the same
+    name never reuses stale token ids.
+    """
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        definition = backend.to_str()
+    else:
+        definition = json.dumps(sorted(tokenizer.get_vocab().items()))
+
+    name = Path(tokenizer.name_or_path).name or "tokenizer"
+    content = hashlib.sha256(definition.encode()).hexdigest()[:16]
+    return f"{name}-{content}"
+
+
+class TokenCache:
+    """
+    Token ids for every prompt of a dataset, stored as one flat
+    memory-mapped int32 array plus offsets:
+
+        ids[offsets[i]:offsets[i + 1]]  ->  tokens of the i-th prompt
+
+    Lookups slice the memory map, so a cache of any size opens
+    instantly and only touched pages are read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        with open(path / "prompt_ids.json", "r", encoding="utf-8") as f:
+            prompt_ids = json.load(f)
+
+        self._index = {prompt_id: i for i, prompt_id in enumerate(prompt_ids)}
+        self._offsets = np.load(path / "offsets.npy")
+
+        if self._offsets[-1] > 0:
+            self._ids = np.memmap(path / "ids.bin", dtype=TOKEN_DTYPE, mode="r")
+        else:
+            self._ids = np.empty(0, dtype=TOKEN_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, prompt_id) -> bool:
+        return prompt_id in self._index
+
+    def get(self, prompt_id) -> np.ndarray:
+        """
+        Return the token ids of a prompt (a read-only view).
+        """
+        i = self._index[prompt_id]
+        return self._ids[self._offsets[i]:self._offsets[i + 1]]
+
+
+def build_token_cache(
+    prompts: Iterable[Dict[str, Any]],
+    tokenizer,
+    path: Path,
+    chunksize: int = 1000,
+) -> TokenCache:
+    """
+    Tokenize a prompt stream in chunks and write the cache to `path`.
+
+    The cache is assembled in a temporary directory and renamed into
+    place, so a crash (or a concurrent worker building the same cache)
+    never leaves a half-written cache behind.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=path.parent, prefix=".building-"))
+
+    try:
+        prompt_ids = []
+        seen = set()
+        offsets = [0]
+
+        iterator = iter(prompts)
+        with open(tmp_dir / "ids.bin", "wb") as f:
+            while True:
+                chunk = list(islice(iterator, chunksize))
+                if not chunk:
+                    break
+
+                encoded = tokenizer([record["prompt"] for record in chunk])
+
+                for record, ids in zip(chunk, encoded["input_ids"]):
+                    if record["id"] in seen:
+                        raise DatasetError(
+                            f"Duplicate prompt id {record['id']!r}; "
+                            "the token cache needs unique ids"
+                        )
+                    seen.add(record["id"])
+
+                    prompt_ids.append(record["id"])
+                    offsets.append(offsets[-1] + len(ids))
+                    f.write(np.asarray(ids, dtype=TOKEN_DTYPE).tobytes())
+
+        np.save(tmp_dir / "offsets.npy", np.asarray(offsets, dtype=np.int64))
+        with open(tmp_dir / "prompt_ids.json", "w", encoding="utf-8") as f:
+            json.dump(prompt_ids, f)
+
+        try:
+            os.rename(tmp_dir, path)
+        except OSError:
+            # Another process finished the same cache first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return TokenCache(path)
+
+
+def get_or_build_token_cache(dataset, tokenizer, cache_dir: Path) -> TokenCache:
+    """
+    Open the cache for this (tokenizer, dataset) pair, building it on
+    first use. Models sharing a tokenizer share the cache.
+    """
+    path = cache_dir / tokenizer_fingerprint(tokenizer) / dataset_fingerprint(dataset)
+
+    if path.exists():
+        logging.info(f"Using token cache {path}")
+        return TokenCache(path)
+
+    logging.info(f"Building token cache {path}")
+    return build_token_cache(dataset, tokenizer, path)
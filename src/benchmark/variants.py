@@ -0,0 +1,97 @@
+from itertools import product
+from typing import Any, List
+
+from benchmark.exceptions import ConfigError
+
+
+# Model settings that may be given as a list; every combination is
+# benchmarked as its own model variant.
+VARIANT_KEYS = ("dtype", "low_cpu_mem_usage")
+
+# Inference optimizations accepted under `models[].optimizations`; a
+# list value likewise expands into one variant per option.
+OPTIMIZATION_KEYS = (
+    "compile",
+    "attn_implementation",
+    "num_threads",
+    "interop_threads",
+    "grad_mode",
+)
+
+
+def _variant_label(key: str, value: Any) -> str:
+    if key == "dtype":
+        return str(value)
+    return f"{key}={'off' if value is None else value}"
+
+
+def expand_model_variants(models: List[dict]) -> List[dict]:
+    """
+    Expand list-valued `VARIANT_KEYS` and `optimizations` into one
+    model config per combination, each named after the settings that
+    vary, e.g. "GPT-2 [bfloat16, compile=default]". Models with an
+    assistant are further split into plain and assisted variants.
+    """
+    expanded = []
+
+    for model_cfg in models:
+        optimizations = model_cfg.get("optimizations") or {}
+        unknown = set(optimizations) - set(OPTIMIZATION_KEYS)
+        if unknown:
+            raise ConfigError(
+                f"Unknown optimizations for {model_cfg['name']}: {sorted(unknown)}"
+            )
+
+        axes = [
+            (key, model_cfg[key], False)
+            for key in VARIANT_KEYS if isinstance(model_cfg.get(key), list)
+        ] + [
+            (key, value, True)
+            for key, value in optimizations.items() if isinstance(value, list)
+        ]
+
+        if not axes:
+            expanded.extend(split_assisted(model_cfg))
+            continue
+
+        for values in product(*(axis[1] for axis in axes)):
+            variant = {**model_cfg, "optimizations": dict(optimizations)}
+            labels = []
+            for (key, _, nested), value in zip(axes, values):
+                if nested:
+                    variant["optimizations"][key] = value
+                else:
+                    variant[key] = value
+                labels.append(_variant_label(key, value))
+
+            variant["name"] = f"{model_cfg['name']} [{', '.join(labels)}]"
+            expanded.extend(split_assisted(variant))
+
+    return expanded
+
+
+def split_assisted(model_cfg: dict) -> List[dict]:
+    """
+    Benchmark a model with an `assistant` both with plain decoding and
+    with assisted (speculative) decoding, on the same prompts; the
+    assisted variant names its plain baseline.
+
+    Assisted generation handles one prompt at a time, so both variants
+    run unbatched to keep their latencies comparable.
+    """
+    assistant = model_cfg.get("assistant")
+    if not assistant:
+        return [model_cfg]
+
+    model_cfg = {**model_cfg, "batch_size": 1}
+    assisted = {
+        **model_cfg,
+        "name": f"{model_cfg['name']} [assisted]",
+        "baseline_name": model_cfg["name"],
+    }
+
+    if not assistant.get("compare_plain", True):
+        return [assisted]
+
+    plain = {key: value for key, value in model_cfg.items() if key != "assistant"}
+    return [plain, assisted]
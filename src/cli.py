@@ -1,4 +1,5 @@
 import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -43,38 +44,312 @@ def parse_args():
         required=True,
         help="Path to benchmark configuration YAML file",
     )
+    run_parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_DIR",
+        help="Continue an interrupted run, skipping results already recorded in RUN_DIR",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile a few generate calls per model and write traces to the run directory",
+    )
+    run_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve live progress metrics in Prometheus format on PORT during the run",
+    )
+
+    # load command
+    load_parser = subparsers.add_parser(
+        "load", help="Run a load test with concurrent request arrivals"
+    )
+    load_parser.add_argument(
+        "--config",
+        type=str,
+        required=True,
+        help="Path to benchmark configuration YAML file (with a 'load' section)",
+    )
+
+    # prefix command
+    prefix_parser = subparsers.add_parser(
+        "prefix", help="Compare cached vs recomputed shared-prefix prefill"
+    )
+    prefix_parser.add_argument(
+        "--config",
+        type=str,
+        required=True,
+        help="Path to benchmark configuration YAML file (with a 'shared_prefix' section)",
+    )
+
+    # threads command
+    threads_parser = subparsers.add_parser(
+        "threads", help="Sweep CPU thread counts and report scaling efficiency"
+    )
+    threads_parser.add_argument(
+        "--config",
+        type=str,
+        required=True,
+        help="Path to benchmark configuration YAML file (with a 'thread_sweep' section)",
+    )
+
+    # plan command
+    plan_parser = subparsers.add_parser(
+        "plan",
+        help="Validate config and dataset and show the work matrix with a time estimate",
+    )
+    plan_parser.add_argument(
+        "--config",
+        type=str,
+        required=True,
+        help="Path to benchmark configuration YAML file",
+    )
+    plan_parser.add_argument(
+        "--history",
+        type=str,
+        default=None,
+        metavar="RUN_DIR",
+        help="Calibrate the estimate from an earlier run (default: <output.base_dir>/latest)",
+    )
+
+    # compare command
+    compare_parser = subparsers.add_parser(
+        "compare",
+        help="Compare runs against a baseline and flag performance regressions",
+    )
+    compare_parser.add_argument(
+        "runs",
+        nargs="+",
+        metavar="RUN_DIR",
+        help="Run directories; the first is the baseline",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        metavar="METRIC=PCT",
+        help="Regression threshold in percent for a metric (repeatable), e.g. latency_sec=5",
+    )
+    compare_parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Significance level (default: 0.05)",
+    )
+    compare_parser.add_argument(
+        "--method",
+        choices=["mannwhitney", "bootstrap"],
+        default="mannwhitney",
+        help="Significance test (default: mannwhitney)",
+    )
+    compare_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Also write comparison.csv to DIR",
+    )
 
     return parser.parse_args()
 
 
+def parse_thresholds(items: list) -> dict:
+    """Parse repeated METRIC=PCT options into {metric: pct}."""
+    thresholds = {}
+    for item in items:
+        metric, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid threshold '{item}', expected METRIC=PCT")
+        thresholds[metric] = float(value)
+    return thresholds
+
+
+def run_compare(args) -> int:
+    """
+    Compare the given runs and print the result.
+
+    Returns the exit status: 0 when no regression was found, 1 when at
+    least one metric regressed, 2 when the comparison could not run.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+
+    from benchmark.compare import compare_run_dirs, save_comparison  # noqa: E402
+
+    try:
+        comparison = compare_run_dirs(
+            [Path(run) for run in args.runs],
+            thresholds_pct=parse_thresholds(args.threshold),
+            alpha=args.alpha,
+            method=args.method,
+        )
+    except Exception as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 2
+
+    if comparison.empty:
+        print("[ERROR] The runs share no models or prompts to compare", file=sys.stderr)
+        return 2
+
+    print("\n===== Run Comparison =====")
+    print(comparison.to_string(index=False))
+
+    if args.output:
+        csv_path = save_comparison(comparison, Path(args.output))
+        print(f"\n[INFO] Comparison saved to {csv_path}")
+
+    regressions = comparison[comparison["regression"]]
+    if regressions.empty:
+        print("\n[INFO] No significant regressions")
+        return 0
+
+    print(f"\n[ERROR] {len(regressions)} significant regression(s):", file=sys.stderr)
+    for row in regressions.itertuples():
+        print(
+            f"  {row.model_name}: {row.metric} {row.delta_pct:+.1f}% "
+            f"(threshold {row.threshold_pct}%, p={row.p_value:.4f})",
+            file=sys.stderr,
+        )
+    return 1
+
+
+def run_plan(args) -> int:
+    """
+    Validate the config and dataset and print the expanded work matrix.
+
+    Imports no ML libraries and writes nothing, so it is safe as a
+    quick pre-flight check. Returns the process exit code.
+    """
+    from benchmark.exceptions import BenchmarkError  # noqa: E402
+    from benchmark.plan import build_plan, print_plan  # noqa: E402
+
+    try:
+        config = load_yaml(Path(args.config))
+        validate_config(config, Path("config/schema.yaml"))
+
+        history_dir = (
+            Path(args.history) if args.history
+            else Path(config["output"]["base_dir"]) / "latest"
+        )
+        plan = build_plan(config, history_dir=history_dir)
+
+    except (OSError, ValueError, BenchmarkError) as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 1
+
+    if not plan["prompts"]:
+        print("[ERROR] Dataset yields no prompts", file=sys.stderr)
+        return 1
+
+    print_plan(plan)
+    return 0
+
+
+def prepare_config(config_path: Path) -> dict:
+    """
+    Load and validate the config, then initialize logging.
+
+    Exits with status 1 if the config is missing or invalid.
+    """
+    schema_path = Path("config/schema.yaml")
+
+    try:
+        config = load_yaml(config_path)
+        validate_config(config, schema_path)
+    except Exception as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    # Initialize logging BEFORE benchmark starts
+    log_dir = Path(config["output"]["base_dir"]) / "logs"
+    setup_logging(
+        log_dir=log_dir,
+        level=config["output"].get("log_level", "INFO"),
+    )
+
+    print("[INFO] Configuration loaded and validated successfully.")
+    return config
+
+
 def main():
     args = parse_args()
 
     if args.command == "run":
-        config_path = Path(args.config)
-        schema_path = Path("config/schema.yaml")
-
-        try:
-            config = load_yaml(config_path)
-            validate_config(config, schema_path)
-        except Exception as exc:
-            print(f"[ERROR] {exc}", file=sys.stderr)
-            sys.exit(1)
+        config = prepare_config(Path(args.config))
 
-        # Initialize logging BEFORE benchmark starts
-        log_dir = Path(config["output"]["base_dir"]) / "logs"
-        setup_logging(
-            log_dir=log_dir,
-            level=config["output"].get("log_level", "INFO"),
-        )
+        if args.profile:
+            config["profiling"] = {**(config.get("profiling") or {}), "enabled": True}
+
+        if args.metrics_port is not None:
+            config["live_metrics"] = {
+                **(config.get("live_metrics") or {}),
+                "port": args.metrics_port,
+            }
 
-        print("[INFO] Configuration loaded and validated successfully.")
         print("[INFO] Starting LLM benchmarking process...")
 
         # Lazy import to avoid startup failures
         from benchmark.runner import run_benchmark  # noqa: E402
 
-        run_benchmark(config)
+        run_benchmark(
+            config,
+            resume_dir=Path(args.resume) if args.resume else None,
+        )
+
+    elif args.command == "load":
+        config = prepare_config(Path(args.config))
+
+        if "load" not in config:
+            print("[ERROR] Config has no 'load' section", file=sys.stderr)
+            sys.exit(1)
+
+        print("[INFO] Starting LLM load test...")
+
+        from benchmark.runner import run_load_test  # noqa: E402
+
+        run_load_test(config)
+
+    elif args.command == "prefix":
+        config = prepare_config(Path(args.config))
+
+        if not (config.get("shared_prefix") or {}).get("compare_lengths"):
+            print(
+                "[ERROR] Config has no 'shared_prefix.compare_lengths'",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+        print("[INFO] Starting prefix cache benchmark...")
+
+        from benchmark.runner import run_prefix_benchmark  # noqa: E402
+
+        run_prefix_benchmark(config)
+
+    elif args.command == "threads":
+        config = prepare_config(Path(args.config))
+
+        if "thread_sweep" not in config:
+            print("[ERROR] Config has no 'thread_sweep' section", file=sys.stderr)
+            sys.exit(1)
+
+        print("[INFO] Starting thread scaling sweep...")
+
+        from benchmark.runner import run_thread_sweep  # noqa: E402
+
+        run_thread_sweep(config)
+
+    elif args.command == "plan":
+        sys.exit(run_plan(args))
+
+    elif args.command == "compare":
+        if len(args.runs) < 2:
+            print("[ERROR] compare needs at least two run directories", file=sys.stderr)
+            sys.exit(2)
+
+        sys.exit(run_compare(args))
 
     else:
         raise RuntimeError("Unknown command")
@@ -0,0 +1,52 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """
+    Build a tiny randomly-initialised GPT-2 with its own BPE tokenizer.
+
+    Keeps model-level tests offline and fast; the outputs are gibberish,
+    which is fine for exercising shapes, padding and token accounting.
+    """
+    tokenizers = pytest.importorskip("tokenizers")
+    transformers = pytest.importorskip("transformers")
+
+    model_dir = tmp_path_factory.mktemp("tiny-gpt2")
+    transformers.set_seed(0)
+
+    corpus = [
+        "Explain the concept of machine learning in simple terms.",
+        "What is the difference between supervised and unsupervised learning?",
+        "Summarize the importance of data preprocessing.",
+    ] * 10
+
+    bpe = tokenizers.ByteLevelBPETokenizer()
+    bpe.train_from_iterator(
+        corpus,
+        vocab_size=300,
+        special_tokens=["<|endoftext|>"],
+    )
+    bpe.save_model(str(model_dir))
+
+    tokenizer = transformers.GPT2TokenizerFast(
+        vocab_file=str(model_dir / "vocab.json"),
+        merges_file=str(model_dir / "merges.txt"),
+        eos_token="<|endoftext|>",
+        bos_token="<|endoftext|>",
+        unk_token="<|endoftext|>",
+    )
+    tokenizer.save_pretrained(str(model_dir))
+
+    config = transformers.GPT2Config(
+        vocab_size=len(tokenizer),
+        n_positions=256,
+        n_embd=32,
+        n_layer=2,
+        n_head=2,
+        bos_token_id=tokenizer.eos_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+    )
+    transformers.GPT2LMHeadModel(config).save_pretrained(str(model_dir))
+
+    return str(model_dir)
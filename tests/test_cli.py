@@ -1,5 +1,5 @@
 import sys
-from cli import parse_args
+from cli import parse_args, parse_thresholds
 
 
 def test_cli_parse_run(monkeypatch):
@@ -14,3 +14,44 @@ def test_cli_parse_run(monkeypatch):
     args = parse_args()
     assert args.command == "run"
     assert args.config == "config/benchmark.yaml"
+
+
+def test_cli_parse_load(monkeypatch):
+    test_args = [
+        "llm-bench",
+        "load",
+        "--config",
+        "config/benchmark.yaml",
+    ]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    args = parse_args()
+    assert args.command == "load"
+
+
+def test_cli_parse_compare(monkeypatch):
+    test_args = [
+        "llm-bench",
+        "compare",
+        "outputs/a",
+        "outputs/b",
+        "--threshold",
+        "latency_sec=3",
+        "--method",
+        "bootstrap",
+    ]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    args = parse_args()
+    assert args.command == "compare"
+    assert args.runs == ["outputs/a", "outputs/b"]
+    assert parse_thresholds(args.threshold) == {"latency_sec": 3.0}
+    assert args.method == "bootstrap"
+
+
+def test_cli_parse_run_profile(monkeypatch):
+    monkeypatch.setattr(
+        sys, "argv", ["llm-bench", "run", "--config", "config/benchmark.yaml", "--profile"]
+    )
+
+    assert parse_args().profile is True
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from benchmark.compare import compare_runs, compare_run_dirs
+
+
+def _run(latency_scale: float, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = []
+    for prompt_id in range(20):
+        for run in range(3):
+            latency = latency_scale * (1.0 + 0.05 * rng.standard_normal())
+            rows.append({
+                "model_name": "M",
+                "prompt_id": prompt_id,
+                "run": run,
+                "status": "ok",
+                "latency_sec": latency,
+                "tokens_per_sec": 32 / latency,
+                "peak_ram_mb": 500.0,
+            })
+    return pd.DataFrame(rows)
+
+
+def test_compare_runs_flags_significant_regression():
+    baseline = _run(1.0, seed=0)
+
+    for method in ("mannwhitney", "bootstrap"):
+        comparison = compare_runs(baseline, _run(1.3, seed=1), method=method)
+        by_metric = comparison.set_index("metric")
+
+        assert by_metric.loc["latency_sec", "regression"]
+        assert by_metric.loc["tokens_per_sec", "regression"]
+        assert not by_metric.loc["peak_ram_mb", "regression"]
+        assert by_metric.loc["latency_sec", "delta_pct"] > 25
+
+
+def test_compare_runs_ignores_noise_and_improvements():
+    baseline = _run(1.0, seed=0)
+
+    noise = compare_runs(baseline, _run(1.0, seed=1))
+    assert not noise["regression"].any()
+
+    faster = compare_runs(baseline, _run(0.7, seed=1))
+    assert faster.set_index("metric").loc["latency_sec", "significant"]
+    assert not faster["regression"].any()
+
+    # A generous threshold tolerates the slowdown
+    tolerated = compare_runs(
+        baseline, _run(1.3, seed=1), thresholds_pct={"latency_sec": 50, "tokens_per_sec": 50}
+    )
+    assert not tolerated["regression"].any()
+
+
+def test_compare_run_dirs_reads_result_parts(tmp_path):
+    for name, scale in (("base", 1.0), ("slow", 1.3)):
+        results_dir = tmp_path / name / "results"
+        results_dir.mkdir(parents=True)
+        with open(results_dir / "part-0000.jsonl", "w", encoding="utf-8") as f:
+            for row in _run(scale, seed=len(name)).to_dict("records"):
+                f.write(json.dumps(row) + "\n")
+
+    comparison = compare_run_dirs([tmp_path / "base", tmp_path / "slow"])
+
+    assert set(comparison["candidate_run"]) == {str(tmp_path / "slow")}
+    assert comparison["regression"].any()
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from benchmark.dataset import PromptDataset, iter_dataset, load_dataset
+from benchmark.exceptions import DatasetError
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    path = tmp_path / "prompts.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for idx in range(20):
+            f.write(json.dumps({"id": idx, "prompt": f"prompt {idx}"}) + "\n")
+    return path
+
+
+def test_jsonl_streaming_with_max_prompts(jsonl_path):
+    records = list(iter_dataset(str(jsonl_path), "jsonl", "prompt", max_prompts=3))
+    assert [r["id"] for r in records] == [0, 1, 2]
+
+
+def test_sharding_and_sampling(jsonl_path):
+    shard = list(iter_dataset(
+        str(jsonl_path), "jsonl", "prompt", num_shards=4, shard_index=1
+    ))
+    assert [r["id"] for r in shard] == [1, 5, 9, 13, 17]
+
+    dataset = PromptDataset(str(jsonl_path), "jsonl", "prompt", sample_fraction=0.5)
+    first_pass = [r["id"] for r in dataset]
+    assert 0 < len(first_pass) < 20
+    assert [r["id"] for r in dataset] == first_pass
+
+
+def test_shard_index_out_of_range(jsonl_path):
+    with pytest.raises(ValueError):
+        list(iter_dataset(str(jsonl_path), "jsonl", "prompt", num_shards=4, shard_index=4))
+
+    with pytest.raises(ValueError):
+        PromptDataset(str(jsonl_path), "jsonl", "prompt", num_shards=2, shard_index=-1)
+
+
+def test_csv_read_in_chunks(tmp_path):
+    path = tmp_path / "prompts.csv"
+    path.write_text("prompt,other\n" + "".join(f"p{i},x\n" for i in range(7)))
+
+    records = list(iter_dataset(str(path), "csv", "prompt", chunksize=3))
+    assert [r["id"] for r in records] == list(range(7))
+    assert records[6]["prompt"] == "p6"
+
+    with pytest.raises(DatasetError, match="Missing required column 'text'"):
+        list(iter_dataset(str(path), "csv", "text"))
+
+
+def test_load_dataset_errors(tmp_path):
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text("\n")
+
+    with pytest.raises(DatasetError):
+        load_dataset(str(empty), "jsonl", "prompt")
+
+    with pytest.raises(DatasetError):
+        PromptDataset(str(tmp_path / "missing.jsonl"), "jsonl", "prompt")
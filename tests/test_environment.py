@@ -0,0 +1,37 @@
+from benchmark.environment import get_environment_metadata, get_numa_nodes
+
+
+def test_numa_nodes_read_from_sysfs(tmp_path):
+    for node, cpus in ((1, "4-7"), (0, "0-3")):
+        node_dir = tmp_path / f"node{node}"
+        node_dir.mkdir()
+        (node_dir / "cpulist").write_text(f"{cpus}\n")
+    (tmp_path / "possible").write_text("0-1\n")
+
+    assert get_numa_nodes(tmp_path) == [
+        {"node": 0, "cpus": "0-3"},
+        {"node": 1, "cpus": "4-7"},
+    ]
+    assert get_numa_nodes(tmp_path / "missing") is None
+
+
+def test_environment_records_core_counts():
+    env = get_environment_metadata()
+
+    assert env["cpu_logical_cores"] >= 1
+    assert "cpu_physical_cores" in env
+    assert "numa_nodes" in env
+
+
+def test_torch_version_keeps_build_tag_without_importing_torch(monkeypatch):
+    import sys
+
+    import torch
+
+    from benchmark.environment import _package_version
+
+    expected = torch.__version__
+    monkeypatch.delitem(sys.modules, "torch")
+
+    assert _package_version("torch", version_file="version.py") == expected
+    assert "torch" not in sys.modules
@@ -0,0 +1,125 @@
+import io
+import json
+
+import pytest
+
+from benchmark.exceptions import ModelLoadError
+from benchmark.http_backend import OpenAIHTTPModel, parse_server_timing
+from benchmark.stub_server import StubCompletionServer
+
+
+@pytest.fixture
+def stub_server():
+    server = StubCompletionServer(token_delay=0.002, queue_delay=0.005).start()
+    yield server
+    server.stop()
+
+
+def test_parse_server_timing():
+    timings = parse_server_timing('queue;dur=1.5, total;desc="all";dur=20, cache')
+    assert timings == {"queue": 0.0015, "total": 0.02}
+    assert parse_server_timing(None) == {}
+
+
+def test_http_backend_generates_over_pooled_connections(stub_server):
+    model = OpenAIHTTPModel("stub-model", stub_server.url, max_connections=2)
+    assert model.tokenizer is None
+    assert model.load_stats["load_total_sec"] > 0
+
+    for _ in range(3):
+        outputs = model.generate_batch(
+            ["hello world", "one two three"], {"max_new_tokens": 4}
+        )
+        assert [o["output_tokens"] for o in outputs] == [4, 4]
+        assert [o["prompt_tokens"] for o in outputs] == [2, 3]
+        assert outputs[0]["token_times"] is None
+
+        timings = outputs[0]["timings"]
+        assert timings["server_queue_sec"] >= 0.005
+        assert timings["server_time_sec"] >= timings["server_queue_sec"]
+
+    # Keep-alive: six requests never needed more than the pool size
+    assert model.pool.connections_opened <= 2
+
+    model.close()
+
+
+def test_http_backend_streams_token_times(stub_server):
+    model = OpenAIHTTPModel("stub-model", stub_server.url)
+
+    output = model.generate("hello", {"max_new_tokens": 5, "streaming": True})
+
+    assert output["output_text"] == " tok0 tok1 tok2 tok3 tok4"
+    assert output["output_tokens"] == 5
+    assert len(output["token_times"]) == 5
+    assert output["token_times"] == sorted(output["token_times"])
+    assert output["timings"]["server_time_sec"] is None
+
+    model.close()
+
+
+def test_http_backend_returns_partial_output_at_timeout(stub_server):
+    stub_server.token_delay = 0.05
+    model = OpenAIHTTPModel("stub-model", stub_server.url, timeout_seconds=0.2)
+
+    output = model.generate("hello", {"max_new_tokens": 50, "streaming": True})
+    assert output["timed_out"]
+    assert 0 < len(output["token_times"]) < 50
+    assert output["output_tokens"] is None
+
+    # The abandoned stream's connection is dropped, not reused
+    stub_server.token_delay = 0.0
+    assert model.generate("hi", {"max_new_tokens": 2, "streaming": True})["output_tokens"] == 2
+
+    model.close()
+
+
+def test_http_backend_reports_non_streaming_timeout(stub_server):
+    stub_server.token_delay = 0.05
+    model = OpenAIHTTPModel("stub-model", stub_server.url, timeout_seconds=0.2)
+
+    output = model.generate("hello", {"max_new_tokens": 50})
+    assert output["timed_out"]
+    assert output["output_tokens"] == 0
+    assert output["token_times"] is None
+
+    stub_server.token_delay = 0.0
+    assert model.generate("hi", {"max_new_tokens": 2})["output_tokens"] == 2
+
+    model.close()
+
+
+def test_http_backend_leaves_token_count_unknown_without_usage():
+    response = io.BytesIO(json.dumps({"choices": [{"text": " a few words"}]}).encode())
+
+    output = OpenAIHTTPModel._read_completion(response)
+
+    assert output["output_text"] == " a few words"
+    assert output["output_tokens"] is None
+
+
+def test_http_backend_stream_without_usage_leaves_token_count_unknown():
+    class FakeConnection:
+        def close(self):
+            pass
+
+    events = [{"choices": [{"text": " two tokens"}]}, {"choices": [{"text": " more"}]}]
+    response = io.BytesIO(
+        b"".join(b"data: " + json.dumps(event).encode() + b"\n\n" for event in events)
+        + b"data: [DONE]\n\n"
+    )
+
+    output = OpenAIHTTPModel._read_stream(FakeConnection(), response, 0.0, None)
+
+    assert output["output_text"] == " two tokens more"
+    assert len(output["token_times"]) == 2
+    assert output["output_tokens"] is None
+
+
+def test_http_backend_unreachable_server():
+    server = StubCompletionServer()
+    url = server.url
+    server.server_close()
+
+    with pytest.raises(ModelLoadError):
+        OpenAIHTTPModel("stub-model", url)
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("torch", "transformers", "pandas", "matplotlib")
+
+# Generous bound: `plan` takes well under a second, importing torch
+# alone takes several
+MAX_PLAN_SEC = 3.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+sys.argv = ["llm-bench", "plan", "--config", "config/benchmark.yaml"]
+import cli
+try:
+    cli.main()
+except SystemExit as exc:
+    code = exc.code
+else:
+    code = 0
+print(json.dumps({
+    "code": code,
+    "elapsed": time.perf_counter() - start,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def test_plan_command_imports_no_ml_libraries():
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / "src")}
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert probe["code"] == 0
+    assert probe["heavy"] == []
+    assert probe["elapsed"] < MAX_PLAN_SEC
+
+
+def test_library_modules_defer_heavy_imports():
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / "src")}
+    probe = (
+        "import json, sys\n"
+        "import benchmark.environment, benchmark.dataset, benchmark.reporter, benchmark.runner\n"
+        "print(json.dumps([m for m in %r if m in sys.modules]))\n" % (HEAVY_MODULES,)
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+_HTTP_RUN_PROBE = """
+import json, sys
+from benchmark.runner import run_benchmark
+from benchmark.stub_server import StubCompletionServer
+
+server = StubCompletionServer(model_id="stub").start()
+try:
+    run_benchmark({
+        "dataset": {
+            "path": "config/prompts.jsonl",
+            "format": "jsonl",
+            "text_field": "prompt",
+            "max_prompts": 2,
+        },
+        "models": [{
+            "id": "stub",
+            "name": "Stub",
+            "provider": "openai",
+            "base_url": server.url,
+        }],
+        "runtime": {"device": "cpu"},
+        "generation": {"max_new_tokens": 4},
+        "output": {"base_dir": %r},
+    })
+finally:
+    server.stop()
+print(json.dumps([m for m in ("torch", "transformers") if m in sys.modules]))
+"""
+
+
+def test_http_only_run_never_imports_torch(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / "src")}
+    completed = subprocess.run(
+        [sys.executable, "-c", _HTTP_RUN_PROBE % (str(tmp_path),)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
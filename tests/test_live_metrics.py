@@ -0,0 +1,104 @@
+import urllib.request
+from pathlib import Path
+
+from benchmark.live_metrics import (
+    LiveMetrics,
+    MetricsServer,
+    TextfileExporter,
+    worker_textfile_path,
+)
+
+
+class _FakeMonitor:
+    def current_ram_mb(self):
+        return 2.0
+
+
+def _rows():
+    return [
+        {"status": "ok", "latency_sec": 0.3, "ttft_sec": 0.02, "output_tokens": 10,
+         "batch_tokens_per_sec": 50.0},
+        {"status": "timeout", "latency_sec": 3.0, "ttft_sec": None, "output_tokens": 5,
+         "batch_tokens_per_sec": 50.0},
+    ]
+
+
+def test_render_counts_requests_tokens_and_histograms():
+    metrics = LiveMetrics()
+    metrics.record_rows("M", _rows())
+    metrics.record_failures("M", 2)
+    metrics.track_memory("M", _FakeMonitor())
+
+    lines = metrics.render().splitlines()
+
+    assert 'llm_bench_requests_total{model="M",status="ok"} 1' in lines
+    assert 'llm_bench_requests_total{model="M",status="timeout"} 1' in lines
+    assert 'llm_bench_requests_total{model="M",status="error"} 2' in lines
+    assert 'llm_bench_output_tokens_total{model="M"} 15' in lines
+    assert 'llm_bench_tokens_per_second{model="M"} 50.0' in lines
+    assert f'llm_bench_resident_memory_bytes{{model="M"}} {2 * 1024 ** 2}' in lines
+
+    # Buckets are cumulative and end in +Inf == count
+    assert 'llm_bench_request_latency_seconds_bucket{model="M",le="0.25"} 0' in lines
+    assert 'llm_bench_request_latency_seconds_bucket{model="M",le="0.5"} 1' in lines
+    assert 'llm_bench_request_latency_seconds_bucket{model="M",le="5.0"} 2' in lines
+    assert 'llm_bench_request_latency_seconds_bucket{model="M",le="+Inf"} 2' in lines
+    assert 'llm_bench_request_latency_seconds_count{model="M"} 2' in lines
+    assert 'llm_bench_ttft_seconds_count{model="M"} 1' in lines
+
+    metrics.untrack("M")
+    assert "llm_bench_resident_memory_bytes{" not in metrics.render()
+
+
+def test_throughput_gauge_falls_back_when_batch_throughput_is_unknown():
+    metrics = LiveMetrics()
+    row = {"status": "ok", "latency_sec": 0.5, "output_tokens": 6,
+           "tokens_per_sec": 12.0, "batch_tokens_per_sec": None}
+
+    metrics.record_rows("M", [row])
+    assert 'llm_bench_tokens_per_second{model="M"} 12.0' in metrics.render().splitlines()
+
+    # Nothing known at all: the gauge keeps its last value
+    metrics.record_rows("M", [{**row, "output_tokens": None, "tokens_per_sec": None}])
+    assert 'llm_bench_tokens_per_second{model="M"} 12.0' in metrics.render().splitlines()
+
+
+def test_label_values_are_escaped():
+    metrics = LiveMetrics()
+    metrics.record_failures('say "hi"\\', 1)
+
+    assert 'model="say \\"hi\\"\\\\"' in metrics.render()
+
+
+def test_textfile_exporter_is_rate_limited(tmp_path):
+    metrics = LiveMetrics()
+    exporter = TextfileExporter(metrics, tmp_path / "prom" / "bench.prom", interval_seconds=60)
+
+    exporter.write()
+    metrics.record_failures("M", 1)
+    exporter.write()
+    assert "llm_bench_requests_total{" not in exporter.path.read_text()
+
+    exporter.write(force=True)
+    assert 'status="error"} 1' in exporter.path.read_text()
+    assert [p.name for p in exporter.path.parent.iterdir()] == ["bench.prom"]
+
+
+def test_worker_textfile_path():
+    assert worker_textfile_path(Path("/x/llm_bench.prom"), 42) == Path("/x/llm_bench.42.prom")
+
+
+def test_metrics_server_serves_metrics_endpoint():
+    metrics = LiveMetrics()
+    metrics.record_rows("M", _rows())
+
+    server = MetricsServer(metrics, port=0).start()
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.stop()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert 'llm_bench_requests_total{model="M",status="ok"} 1' in body
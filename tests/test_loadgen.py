@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+import pytest
+
+from benchmark.exceptions import InferenceError
+from benchmark.loadgen import (
+    generate_arrival_offsets,
+    run_open_loop,
+    run_closed_loop,
+    summarize_load,
+)
+
+
+class SleepModel:
+    """Stand-in model whose generate call takes a fixed service time."""
+
+    def __init__(
+        self,
+        service_time: float,
+        fail_on: str | None = None,
+        timeout_on: str | None = None,
+    ):
+        self.service_time = service_time
+        self.fail_on = fail_on
+        self.timeout_on = timeout_on
+
+    def generate(self, prompt, generation_config):
+        time.sleep(self.service_time)
+        if prompt == self.fail_on:
+            raise InferenceError("boom")
+        return {
+            "output_text": "ok",
+            "output_tokens": 4,
+            "prompt_tokens": 2,
+            "timed_out": prompt == self.timeout_on,
+        }
+
+
+PROMPTS = [{"id": 0, "prompt": "a"}, {"id": 1, "prompt": "b"}]
+
+
+def test_arrival_offsets():
+    constant = generate_arrival_offsets(4, rate=2.0, pattern="constant")
+    assert np.allclose(constant, [0.0, 0.5, 1.0, 1.5])
+
+    poisson = generate_arrival_offsets(5000, rate=10.0, pattern="poisson")
+    assert poisson[0] == 0.0
+    assert np.all(np.diff(poisson) >= 0)
+    assert abs(np.diff(poisson).mean() - 0.1) < 0.01
+
+    with pytest.raises(ValueError):
+        generate_arrival_offsets(4, rate=1.0, pattern="bursty")
+
+
+def test_open_loop_overload_builds_queue():
+    model = SleepModel(service_time=0.02)
+    offsets = generate_arrival_offsets(6, rate=200.0, pattern="constant")
+
+    records = run_open_loop(model, PROMPTS, {}, offsets, workers=1)
+
+    assert [record["request_id"] for record in records] == list(range(6))
+    assert records[-1]["queue_delay_sec"] > records[0]["queue_delay_sec"]
+    for record in records:
+        assert record["latency_sec"] >= record["service_time_sec"]
+
+
+def test_closed_loop_and_summary():
+    model = SleepModel(service_time=0.01, fail_on="b")
+
+    records = run_closed_loop(model, PROMPTS, {}, concurrency=2, num_requests=6)
+    summary = summarize_load(records)
+
+    assert len(records) == 6
+    assert summary["requests"] == 6
+    assert summary["failed"] == 3
+    assert summary["achieved_rps"] > 0
+    assert summary["latency_p50_sec"] <= summary["latency_p99_sec"]
+
+
+def test_timeouts_are_recorded_not_dropped():
+    model = SleepModel(service_time=0.0, timeout_on="a")
+
+    records = run_closed_loop(model, PROMPTS, {}, concurrency=1, num_requests=4)
+    summary = summarize_load(records)
+
+    assert [record["status"] for record in records] == ["timeout", "ok"] * 2
+    assert records[0]["output_tokens"] == 4
+    assert summary["timed_out"] == 2
+    assert summary["failed"] == 0
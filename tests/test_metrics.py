@@ -1,7 +1,12 @@
 from benchmark.metrics import (
+    mann_whitney_u,
+    bootstrap_mean_diff,
     compute_throughput,
+    compute_padding_efficiency,
     compute_output_length,
     compute_vocabulary_diversity,
+    compute_token_latencies,
+    compute_distribution_stats,
     aggregate_metrics,
 )
 
@@ -30,3 +35,77 @@ def test_aggregate_metrics():
     assert metrics["latency_sec"] == 1.0
     assert metrics["tokens_per_sec"] == 20.0
     assert metrics["output_length"] == 4
+    assert metrics["output_tokens"] == 20
+
+
+def test_aggregate_metrics_without_token_count():
+    metrics = aggregate_metrics(latency=1.0, tokens_generated=None, output_text="a b")
+    assert metrics["output_tokens"] is None
+    assert metrics["tokens_per_sec"] is None
+
+
+def test_token_latencies():
+    metrics = compute_token_latencies([0.5, 0.6, 0.7, 0.9], prompt_tokens=10)
+    assert metrics["ttft_sec"] == 0.5
+    assert metrics["prefill_tokens_per_sec"] == 20.0
+    assert metrics["decode_tokens_per_sec"] == 7.5
+    assert abs(metrics["itl_mean_sec"] - 0.4 / 3) < 1e-6
+    assert abs(metrics["itl_p50_sec"] - 0.1) < 1e-6
+
+
+def test_padding_efficiency():
+    assert compute_padding_efficiency([10, 10]) == 1.0
+    assert compute_padding_efficiency([10, 30]) == 40 / 60
+    assert compute_padding_efficiency([]) == 1.0
+
+
+def test_token_latencies_without_timestamps():
+    metrics = compute_token_latencies([])
+    assert metrics["ttft_sec"] is None
+    assert metrics["decode_tokens_per_sec"] is None
+
+    metrics = aggregate_metrics(latency=1.0, tokens_generated=1, output_text="a")
+    assert metrics["itl_p99_sec"] is None
+
+
+def test_distribution_stats():
+    values = [1.0, 2.0, 3.0, 4.0, float("nan")]
+    stats = compute_distribution_stats(values, n_bootstrap=500)
+
+    assert stats["n"] == 4
+    assert stats["mean"] == 2.5
+    assert stats["p50"] == 2.5
+    assert stats["ci_low"] <= stats["mean"] <= stats["ci_high"]
+    assert 1.0 <= stats["ci_low"] and stats["ci_high"] <= 4.0
+
+
+def test_distribution_stats_empty():
+    stats = compute_distribution_stats([])
+    assert stats["n"] == 0
+
+
+def test_mann_whitney_u():
+    separated = mann_whitney_u(range(20), range(100, 120))
+    assert separated["u"] == 0.0
+    assert separated["p_value"] < 1e-6
+
+    same = mann_whitney_u([1.0, 2.0, 3.0] * 5, [1.0, 2.0, 3.0] * 5)
+    assert same["p_value"] == 1.0
+
+    # U = 12, mu = 36, sigma = sqrt(108): z = 23.5 / 10.39 = 2.26
+    reference = mann_whitney_u(
+        [1.1, 2.3, 3.0, 4.2, 5.5, 6.1, 7.4, 8.0],
+        [3.3, 5.0, 6.6, 7.7, 8.8, 9.1, 10.2, 11.5, 12.0],
+    )
+    assert reference["u"] == 12.0
+    assert abs(reference["p_value"] - 0.0237) < 1e-3
+
+
+def test_bootstrap_mean_diff():
+    shifted = bootstrap_mean_diff([1.0, 1.2, 0.9, 1.1, 1.05] * 4, n_bootstrap=2000)
+    assert shifted["ci_low"] > 0
+    assert shifted["p_value"] < 0.01
+
+    noise = bootstrap_mean_diff([-1.0, 1.0] * 10, n_bootstrap=2000)
+    assert noise["ci_low"] < 0 < noise["ci_high"]
+    assert noise["p_value"] > 0.5
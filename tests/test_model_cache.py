@@ -0,0 +1,56 @@
+from benchmark.model_cache import ModelCache
+
+
+class FakeModel:
+    def __init__(self, size_mb):
+        self.size_mb = size_mb
+        self.closed = False
+
+    def memory_footprint_mb(self):
+        return self.size_mb
+
+    def close(self):
+        self.closed = True
+
+
+def test_model_cache_reuses_loaded_models():
+    cache = ModelCache(max_memory_mb=100)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return FakeModel(40)
+
+    first, hit = cache.get_or_load("a", loader)
+    assert hit is False
+
+    second, hit = cache.get_or_load("a", loader)
+    assert hit is True
+    assert second is first
+    assert len(loads) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_model_cache_evicts_least_recently_used():
+    cache = ModelCache(max_memory_mb=100)
+
+    cache.get_or_load("a", lambda: FakeModel(40))
+    b, _ = cache.get_or_load("b", lambda: FakeModel(40))
+    cache.get_or_load("a", lambda: FakeModel(40))  # "b" is now oldest
+    cache.get_or_load("c", lambda: FakeModel(40))
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert b.closed
+    assert cache.used_mb == 80
+
+
+def test_model_cache_skips_models_over_budget():
+    cache = ModelCache(max_memory_mb=100)
+    cache.get_or_load("a", lambda: FakeModel(40))
+
+    model, hit = cache.get_or_load("huge", lambda: FakeModel(500))
+
+    assert model.size_mb == 500 and hit is False
+    assert "huge" not in cache
+    assert "a" in cache
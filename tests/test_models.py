@@ -0,0 +1,219 @@
+from benchmark.models import HuggingFaceModel
+
+
+GENERATION_CONFIG = {
+    "max_new_tokens": 8,
+    "do_sample": False,
+}
+
+
+def test_generate_batch_splits_outputs_per_prompt(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+
+    prompts = [
+        "Explain machine learning.",
+        "What is the difference between supervised and unsupervised learning?",
+    ]
+    outputs = model.generate_batch(prompts, GENERATION_CONFIG)
+
+    assert len(outputs) == len(prompts)
+    for output in outputs:
+        assert isinstance(output["output_text"], str)
+        assert 0 < output["output_tokens"] <= GENERATION_CONFIG["max_new_tokens"]
+        assert output["prompt_tokens"] > 0
+        assert output["token_times"] is None
+        assert output["timed_out"] is False
+
+    assert outputs[0]["prompt_tokens"] < outputs[1]["prompt_tokens"]
+
+
+def test_generate_batch_streaming_timestamps_tokens(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+
+    outputs = model.generate_batch(
+        ["Explain machine learning."],
+        {**GENERATION_CONFIG, "streaming": True},
+    )
+
+    token_times = outputs[0]["token_times"]
+    assert len(token_times) == outputs[0]["output_tokens"]
+    assert token_times == sorted(token_times)
+    assert token_times[0] > 0
+
+
+def test_generate_counts_only_new_tokens(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+
+    prompt = "Summarize the importance of data preprocessing. " * 5
+    output = model.generate(prompt, GENERATION_CONFIG)
+
+    assert output["prompt_tokens"] > GENERATION_CONFIG["max_new_tokens"]
+    assert 0 < output["output_tokens"] <= GENERATION_CONFIG["max_new_tokens"]
+    assert not output["output_text"].startswith(prompt.strip())
+
+
+def test_generate_stops_at_timeout_with_partial_output(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir, timeout_seconds=1e-6)
+
+    output = model.generate(
+        "Explain machine learning.",
+        {**GENERATION_CONFIG, "max_new_tokens": 64},
+    )
+
+    assert output["timed_out"] is True
+    assert 0 < output["output_tokens"] < 64
+
+
+def test_generate_batch_empty():
+    model = HuggingFaceModel.__new__(HuggingFaceModel)
+    assert model.generate_batch([], GENERATION_CONFIG) == []
+
+
+def test_generate_batch_accepts_pretokenized_ids(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+
+    prompts = ["Explain machine learning.", "Hi"]
+    input_ids = [model.tokenizer(prompt)["input_ids"] for prompt in prompts]
+
+    from_text = model.generate_batch(prompts, GENERATION_CONFIG)
+    from_ids = model.generate_batch(prompts, GENERATION_CONFIG, input_ids=input_ids)
+
+    assert from_ids == from_text
+
+
+def test_load_stats_break_down_cold_start(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+    stats = model.load_stats
+
+    stages = (
+        stats["tokenizer_load_sec"]
+        + stats["weights_load_sec"]
+        + stats["to_device_sec"]
+        + stats["quantize_sec"]
+        + stats["assistant_load_sec"]
+        + stats["compile_setup_sec"]
+    )
+    assert abs(stages - stats["load_total_sec"]) < 1e-3
+    assert stats["load_peak_rss_mb"] > 0
+    assert model.memory_footprint_mb() > 0
+
+
+def test_low_memory_dtypes_generate(tiny_model_dir):
+    import torch
+
+    bf16 = HuggingFaceModel(
+        model_id=tiny_model_dir, dtype="bfloat16", low_cpu_mem_usage=True
+    )
+    assert bf16.model.dtype == torch.bfloat16
+
+    int8 = HuggingFaceModel(model_id=tiny_model_dir, dtype="int8")
+    assert any(
+        isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+        for module in int8.model.modules()
+    )
+
+    for model in (bf16, int8):
+        output = model.generate("Explain machine learning.", GENERATION_CONFIG)
+        assert output["output_tokens"] > 0
+
+
+def test_backend_options_generate(tiny_model_dir):
+    model = HuggingFaceModel(
+        model_id=tiny_model_dir,
+        attn_implementation="eager",
+        grad_mode="inference_mode",
+    )
+    assert model.model.config._attn_implementation == "eager"
+
+    output = model.generate("Explain machine learning.", GENERATION_CONFIG)
+    assert output["output_tokens"] > 0
+
+
+def test_cached_prefix_matches_recomputed_prefix(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+    prefix = "You are a helpful assistant. Answer concisely."
+    prompts = ["Explain machine learning.", "Hi"]
+
+    model.set_prefix(prefix, use_cache=False)
+    recomputed = model.generate_batch(prompts, GENERATION_CONFIG)
+
+    model.set_prefix(prefix, use_cache=True)
+    cached = model.generate_batch(prompts, GENERATION_CONFIG)
+
+    assert [o["output_text"] for o in cached] == [o["output_text"] for o in recomputed]
+    assert model.prefix_stats["prefix_cache_mb"] > 0
+
+    # Unpadded single prompt: same tokens as plain generation
+    prefix_ids = model.tokenizer(prefix)["input_ids"]
+    suffix_ids = model.tokenizer("Hi", add_special_tokens=False)["input_ids"]
+    model.set_prefix(None)
+    plain = model.generate_batch(
+        [""], GENERATION_CONFIG, input_ids=[prefix_ids + suffix_ids]
+    )
+    assert cached[1]["output_text"] == plain[0]["output_text"]
+
+
+class _BosTokenizer:
+    """
+    Wraps a tokenizer to prepend BOS by default, like Llama's.
+    """
+
+    def __init__(self, tokenizer, bos_id):
+        self._tokenizer = tokenizer
+        self.bos_id = bos_id
+
+    def __getattr__(self, name):
+        return getattr(self._tokenizer, name)
+
+    def __call__(self, text, add_special_tokens=True, **kwargs):
+        encoded = self._tokenizer(text, **kwargs)
+        if add_special_tokens and "return_tensors" not in kwargs:
+            ids = encoded["input_ids"]
+            encoded["input_ids"] = (
+                [self.bos_id] + ids if isinstance(text, str)
+                else [[self.bos_id] + row for row in ids]
+            )
+        return encoded
+
+
+def test_prefix_ignores_special_tokens_of_pretokenized_suffixes(tiny_model_dir):
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+    model.tokenizer = _BosTokenizer(model.tokenizer, bos_id=1)
+    prompts = ["Explain machine learning.", "Hi"]
+
+    model.set_prefix("You are a helpful assistant.", use_cache=True)
+    tokenized_here = model.generate_batch(prompts, GENERATION_CONFIG)
+
+    # Token cache ids are encoded with the tokenizer's defaults
+    cached_ids = model.tokenizer(prompts)["input_ids"]
+    assert all(ids[0] == 1 for ids in cached_ids)
+    pretokenized = model.generate_batch(prompts, GENERATION_CONFIG, input_ids=cached_ids)
+
+    assert [o["prompt_tokens"] for o in pretokenized] == [
+        o["prompt_tokens"] for o in tokenized_here
+    ]
+    assert [o["output_text"] for o in pretokenized] == [
+        o["output_text"] for o in tokenized_here
+    ]
+
+
+def test_assisted_generation_reports_acceptance(tiny_model_dir):
+    plain = HuggingFaceModel(model_id=tiny_model_dir)
+    assisted = HuggingFaceModel(
+        model_id=tiny_model_dir,
+        assistant_id=tiny_model_dir,
+        num_assistant_tokens=3,
+    )
+
+    prompts = ["Explain machine learning.", "Hi"]
+    config = {**GENERATION_CONFIG, "streaming": True}
+    expected = plain.generate_batch(prompts, config)
+    outputs = assisted.generate_batch(prompts, config)
+
+    # Greedy decoding with an identical draft: same text, every draft accepted
+    for output, reference in zip(outputs, expected):
+        assert output["output_text"] == reference["output_text"]
+        assert output["acceptance_rate"] == 1.0
+        assert len(output["token_times"]) == output["output_tokens"]
+
+    assert expected[0]["acceptance_rate"] is None
@@ -1,3 +1,7 @@
+import time
+
+import psutil
+
 from benchmark.monitor import ResourceMonitor
 
 
@@ -10,3 +14,19 @@ def test_resource_monitor_ram_only():
     assert "peak_ram_mb" in stats
     assert stats["peak_ram_mb"] > 0
     assert stats["peak_gpu_mb"] is None
+
+
+def test_resource_monitor_captures_peak_during_work():
+    with ResourceMonitor(monitor_gpu=False, interval=0.005) as monitor:
+        buffer = b"x" * (200 * 1024 ** 2)
+        time.sleep(0.05)
+        del buffer
+        time.sleep(0.05)
+
+    stats = monitor.stats
+    ram_after_mb = psutil.Process().memory_info().rss / (1024 ** 2)
+
+    assert stats["samples"] > 2
+    assert stats["peak_ram_mb"] >= stats["mean_ram_mb"] > 0
+    assert stats["peak_ram_mb"] - ram_after_mb > 100
+    assert len(stats["ram_series_mb"]) <= 64
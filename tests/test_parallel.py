@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+from benchmark.exceptions import ConfigError
+from benchmark.parallel import plan_core_sets, run_in_workers, worker_threads
+
+
+def test_plan_core_sets_disjoint():
+    core_sets = plan_core_sets(3, 2, cores=[0, 1, 2, 3, 4, 5, 6])
+    assert core_sets == [[0, 1], [2, 3], [4, 5]]
+
+
+def test_plan_core_sets_rejects_oversubscription():
+    with pytest.raises(ConfigError):
+        plan_core_sets(4, 2, cores=[0, 1, 2])
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_getaffinity") or len(os.sched_getaffinity(0)) < 2,
+    reason="needs CPU affinity support and at least two cores",
+)
+def test_run_in_workers_pins_each_process():
+    affinities = run_in_workers(
+        os.sched_getaffinity,
+        [(0,), (0,)],
+        workers=2,
+        threads_per_worker=1,
+        pin_cores=True,
+    )
+
+    assert len(affinities) == 2
+    assert all(len(affinity) == 1 for affinity in affinities)
+
+
+def test_run_in_workers_returns_results_in_task_order():
+    results = run_in_workers(
+        divmod,
+        [(7, 2), (9, 4), (1, 1)],
+        workers=1,
+        threads_per_worker=1,
+        pin_cores=False,
+    )
+
+    assert results == [(3, 1), (2, 1), (1, 0)]
+
+
+def _worker_state():
+    return worker_threads(), "torch" in sys.modules
+
+
+def test_run_in_workers_defers_torch_thread_setup():
+    results = run_in_workers(
+        _worker_state,
+        [()],
+        workers=1,
+        threads_per_worker=2,
+        pin_cores=False,
+    )
+
+    # The count is recorded for the runner; torch itself is not imported
+    assert results == [(2, False)]
+    assert worker_threads() is None
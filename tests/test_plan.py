@@ -0,0 +1,61 @@
+import json
+
+from benchmark.plan import build_plan, format_duration
+
+
+def _config(tmp_path, models):
+    dataset = tmp_path / "prompts.jsonl"
+    dataset.write_text(
+        "\n".join(json.dumps({"prompt": f"Prompt {i}"}) for i in range(5)) + "\n",
+        encoding="utf-8",
+    )
+    return {
+        "dataset": {"path": str(dataset), "format": "jsonl", "text_field": "prompt"},
+        "models": models,
+        "generation": {"max_new_tokens": 40},
+        "runtime": {"device": "cpu", "batch_size": 2},
+        "benchmark": {"runs_per_prompt": 2, "warmup_iterations": 1},
+    }
+
+
+def test_build_plan_expands_matrix_with_default_estimate(tmp_path):
+    config = _config(tmp_path, [
+        {"name": "Small", "hf_id": "m", "size": "<1B", "dtype": ["float32", "bfloat16"]},
+    ])
+
+    plan = build_plan(config)
+
+    assert plan["prompts"] == 5
+    assert len(plan["variants"]) == 2
+
+    variant = plan["variants"][0]
+    assert variant["batches"] == 6  # ceil(5 / 2) batches x 2 runs
+    assert variant["generations"] == 10
+    assert variant["basis"] == "default"
+    # load + (warmup + batches) x max_new_tokens / tokens per sec
+    assert variant["estimate_sec"] == 5.0 + 7 * 1.0
+    assert plan["total_estimate_sec"] == 2 * variant["estimate_sec"]
+
+
+def test_build_plan_calibrates_from_history(tmp_path):
+    config = _config(tmp_path, [{"name": "Small", "hf_id": "m", "dtype": "float32"}])
+
+    history = tmp_path / "latest"
+    history.mkdir()
+    (history / "results.csv").write_text(
+        "model_name,latency_sec\nSmall,0.5\nSmall,1.5\nOther,9\n", encoding="utf-8"
+    )
+    (history / "model_loads.csv").write_text(
+        "model_name,load_total_sec\nSmall,3\n", encoding="utf-8"
+    )
+
+    variant = build_plan(config, history_dir=history)["variants"][0]
+
+    assert variant["basis"] == "history"
+    assert variant["estimate_sec"] == 3.0 + 7 * 1.0
+
+
+def test_format_duration():
+    assert format_duration(42.4) == "42s"
+    assert format_duration(125) == "2m 05s"
+    assert format_duration(7260) == "2h 01m"
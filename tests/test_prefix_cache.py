@@ -0,0 +1,20 @@
+from benchmark.prefix_cache import tile_prefix_ids, summarize_prefix_cache
+
+
+def test_tile_prefix_ids():
+    assert tile_prefix_ids([1, 2, 3], 7) == [1, 2, 3, 1, 2, 3, 1]
+    assert tile_prefix_ids([1, 2, 3], 2) == [1, 2]
+
+
+def test_summarize_prefix_cache():
+    uncached = [{"prefill_sec": 0.4}, {"prefill_sec": 0.6}]
+    cached = [{"prefill_sec": 0.1}, {"prefill_sec": None}]
+    stats = {"prefix_tokens": 64, "prefix_prefill_sec": 0.3, "prefix_cache_mb": 2.0}
+
+    summary = summarize_prefix_cache(uncached, cached, stats)
+
+    assert summary["uncached_prefill_sec"] == 0.5
+    assert summary["cached_prefill_sec"] == 0.1
+    assert summary["prefill_saved_sec"] == 0.4
+    assert summary["prefill_speedup"] == 5.0
+    assert summary["prefix_cache_mb"] == 2.0
@@ -0,0 +1,79 @@
+import csv
+import json
+
+import pytest
+
+from benchmark.profiling import (
+    PHASES,
+    PhaseRecorder,
+    profile_dir_name,
+    summarize_phases,
+)
+
+
+def test_summarize_phases_reports_unattributed_time_as_other():
+    rows = summarize_phases(
+        {"tokenize": 0.1, "prefill": 0.3, "decode": 1.2, "detokenize": 0.2},
+        calls=2,
+        wall_sec=2.0,
+    )
+
+    by_phase = {row["phase"]: row for row in rows}
+    assert list(by_phase) == list(PHASES) + ["other"]
+    assert by_phase["decode"]["per_call_sec"] == 0.6
+    assert by_phase["decode"]["share"] == 0.6
+    assert by_phase["other"]["total_sec"] == pytest.approx(0.2)
+
+
+def test_profile_dir_name_is_filesystem_safe():
+    assert profile_dir_name(3, "DistilGPT-2 (Small) [int8]") == "03-DistilGPT-2_Small_int8"
+
+
+def test_phase_recorder_closes_open_phase_on_start():
+    pytest.importorskip("torch")
+
+    recorder = PhaseRecorder()
+    recorder.start("prefill")
+    recorder.start("decode")
+    recorder.stop()
+    recorder.stop()
+
+    assert recorder.totals["prefill"] > 0
+    assert recorder.totals["decode"] > 0
+    assert recorder.totals["tokenize"] == 0
+
+
+def test_profile_generation_writes_traces_and_phases(tiny_model_dir, tmp_path):
+    from benchmark.models import HuggingFaceModel
+    from benchmark.profiling import profile_generation
+
+    model = HuggingFaceModel(model_id=tiny_model_dir)
+    batches = [(["Explain machine learning.", "What is data?"], None)] * 2
+
+    phases = profile_generation(
+        model,
+        batches,
+        {"max_new_tokens": 4, "do_sample": False},
+        tmp_path,
+        {"cprofile": True, "row_limit": 5},
+        model_name="Tiny",
+    )
+
+    by_phase = {row["phase"]: row for row in phases}
+    assert all(row["model_name"] == "Tiny" for row in phases)
+    assert by_phase["prefill"]["calls"] == 2
+    assert by_phase["prefill"]["total_sec"] > 0
+    assert by_phase["decode"]["total_sec"] > 0
+    assert model.phase_recorder is None
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    span_names = {event.get("name") for event in trace["traceEvents"]}
+    assert set(PHASES) <= span_names
+
+    with open(tmp_path / "top_ops.csv", newline="") as f:
+        ops = list(csv.DictReader(f))
+    assert 0 < len(ops) <= 5
+    assert not {op["name"] for op in ops} & set(PHASES)
+
+    for name in ("top_ops.txt", "phases.csv", "cprofile.prof", "cprofile.txt"):
+        assert (tmp_path / name).exists()
@@ -1,5 +1,6 @@
 import pytest
 from benchmark.runner import run_benchmark
+from benchmark.variants import expand_model_variants
 
 
 def test_runner_fails_on_empty_results(tmp_path):
@@ -18,3 +19,360 @@ def test_runner_fails_on_empty_results(tmp_path):
 
     with pytest.raises(RuntimeError):
         run_benchmark(fake_config)
+
+
+def test_runner_resume_skips_completed_models(tmp_path, monkeypatch):
+    import benchmark.models as models
+    from benchmark.sink import ResultsSink, result_part_path
+
+    run_dir = tmp_path / "2024-01-01_0000"
+    with ResultsSink(result_part_path(run_dir / "results", 0)) as sink:
+        sink.write_rows([
+            {
+                "model_id": "done/model",
+                "model_name": "Done",
+                "run": 0,
+                "prompt_id": prompt_id,
+                "latency_sec": 1.0,
+                "tokens_per_sec": 10.0,
+                "batch_tokens_per_sec": 10.0,
+                "peak_ram_mb": 100.0,
+            }
+            for prompt_id in (1, 2)
+        ])
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("completed model must not be loaded")
+
+    monkeypatch.setattr(models, "HuggingFaceModel", fail_load)
+
+    config = {
+        "benchmark": {"runs_per_prompt": 1, "seed": 0},
+        "dataset": {
+            "path": "config/prompts.jsonl",
+            "format": "jsonl",
+            "text_field": "prompt",
+            "max_prompts": 2,
+        },
+        "models": [{"id": "done/model", "name": "Done", "dtype": "float32"}],
+        "runtime": {"device": "cpu"},
+        "generation": {},
+        "output": {"base_dir": str(tmp_path)},
+    }
+
+    run_benchmark(config, resume_dir=run_dir)
+
+    assert (run_dir / "results.csv").exists()
+    assert (tmp_path / "latest" / "summary.md").exists()
+
+
+def test_length_bucketing_groups_similar_lengths():
+    from benchmark.runner import _iter_windows
+
+    class WordTokenizer:
+        def __call__(self, texts):
+            return {"input_ids": [text.split() for text in texts]}
+
+    class FakeModel:
+        tokenizer = WordTokenizer()
+
+    prompts = [
+        {"id": i, "prompt": " ".join(["w"] * length)}
+        for i, length in enumerate([1, 9, 2, 8, 3, 7])
+    ]
+
+    windows = list(_iter_windows(
+        FakeModel(), prompts, batch_size=2,
+        bucketing_cfg={"enabled": True, "window": 6},
+    ))
+
+    assert len(windows) == 1
+    window, batches = windows[0]
+    assert window == prompts
+    assert [[p["id"] for p in batch] for batch in batches] == [[0, 2], [4, 5], [3, 1]]
+
+    unbucketed = list(_iter_windows(FakeModel(), prompts, batch_size=2))
+    assert [batches[0] for _, batches in unbucketed] == [prompts[0:2], prompts[2:4], prompts[4:6]]
+
+
+def test_model_variants_expand_list_settings():
+    from benchmark.variants import expand_model_variants
+
+    base = {"id": "m", "name": "M", "dtype": "float32"}
+    assert expand_model_variants([base]) == [base]
+
+    variants = expand_model_variants([
+        {**base, "dtype": ["float32", "int8"], "low_cpu_mem_usage": [True]},
+    ])
+
+    assert [v["name"] for v in variants] == [
+        "M [float32, low_cpu_mem_usage=True]",
+        "M [int8, low_cpu_mem_usage=True]",
+    ]
+    assert [v["dtype"] for v in variants] == ["float32", "int8"]
+    assert all(v["id"] == "m" and v["low_cpu_mem_usage"] is True for v in variants)
+
+
+def test_assistant_models_split_into_plain_and_assisted():
+    from benchmark.variants import expand_model_variants
+
+    variants = expand_model_variants([
+        {"id": "m", "name": "M", "dtype": "float32", "assistant": {"id": "draft"}},
+    ])
+
+    plain, assisted = variants
+    assert plain["name"] == "M" and "assistant" not in plain
+    assert assisted["name"] == "M [assisted]"
+    assert assisted["baseline_name"] == "M"
+    assert plain["batch_size"] == assisted["batch_size"] == 1
+
+
+def test_optimizations_expand_into_named_variants():
+    from benchmark.exceptions import ConfigError
+    from benchmark.variants import expand_model_variants
+
+    variants = expand_model_variants([{
+        "id": "m",
+        "name": "M",
+        "dtype": ["float32", "bfloat16"],
+        "optimizations": {"compile": [None, "default"], "grad_mode": "inference_mode"},
+    }])
+
+    assert [v["name"] for v in variants] == [
+        "M [float32, compile=off]",
+        "M [float32, compile=default]",
+        "M [bfloat16, compile=off]",
+        "M [bfloat16, compile=default]",
+    ]
+    assert [v["optimizations"]["compile"] for v in variants] == [None, "default"] * 2
+    assert all(v["optimizations"]["grad_mode"] == "inference_mode" for v in variants)
+
+    with pytest.raises(ConfigError):
+        expand_model_variants([
+            {"id": "m", "name": "M", "dtype": "float32", "optimizations": {"jit": True}},
+        ])
+
+
+def test_torch_threads_restores_thread_count():
+    import torch
+    from benchmark.runner import _torch_threads
+
+    previous = torch.get_num_threads()
+
+    with _torch_threads({"num_threads": 1}):
+        assert torch.get_num_threads() == 1
+
+    assert torch.get_num_threads() == previous
+
+
+def test_back_to_back_fresh_runs_do_not_share_rows(tmp_path):
+    import pandas as pd
+    from benchmark.stub_server import StubCompletionServer
+
+    server = StubCompletionServer(model_id="stub").start()
+    try:
+        config = {
+            "benchmark": {"runs_per_prompt": 1, "seed": 0},
+            "dataset": {
+                "path": "config/prompts.jsonl",
+                "format": "jsonl",
+                "text_field": "prompt",
+                "max_prompts": 3,
+            },
+            "models": [{
+                "id": "stub",
+                "name": "Stub",
+                "provider": "openai",
+                "base_url": server.url,
+            }],
+            "runtime": {"device": "cpu"},
+            "generation": {"max_new_tokens": 4},
+            "output": {"base_dir": str(tmp_path)},
+        }
+
+        run_benchmark(config)
+        run_benchmark(config)
+    finally:
+        server.stop()
+
+    run_dirs = sorted(p for p in tmp_path.iterdir() if p.name != "latest")
+    assert len(run_dirs) == 2
+    for run_dir in run_dirs:
+        assert len(pd.read_csv(run_dir / "results.csv")) == 3
+
+
+def test_model_cache_loads_load_option_variants_separately(monkeypatch):
+    import benchmark.models as models
+    import benchmark.runner as runner
+    from benchmark.backend import InferenceBackend
+
+    loaded = []
+
+    class FakeModel(InferenceBackend):
+        def __init__(self, **kwargs):
+            loaded.append(kwargs["low_cpu_mem_usage"])
+            self.load_stats = {"load_total_sec": 1.0}
+
+        def generate_batch(self, prompts, generation_config, input_ids=None):
+            return []
+
+    monkeypatch.setattr(models, "HuggingFaceModel", FakeModel)
+    monkeypatch.setattr(runner, "_MODEL_CACHE", None)
+
+    config = {
+        "runtime": {"device": "cpu", "model_cache": {"enabled": True, "max_memory_mb": 1000}},
+    }
+    variants = expand_model_variants([
+        {"id": "m", "name": "M", "dtype": "float32", "low_cpu_mem_usage": [False, True]},
+    ])
+
+    records = [runner._load_model(model_cfg, config)[1] for model_cfg in variants]
+
+    assert loaded == [False, True]
+    assert [record["cache_hit"] for record in records] == [False, False]
+
+
+def test_runner_closes_http_models_after_their_benchmark(tmp_path, monkeypatch):
+    from benchmark.http_backend import OpenAIHTTPModel
+    from benchmark.stub_server import StubCompletionServer
+
+    closed = []
+    close = OpenAIHTTPModel.close
+
+    def tracking_close(self):
+        closed.append(self.model_id)
+        close(self)
+
+    monkeypatch.setattr(OpenAIHTTPModel, "close", tracking_close)
+
+    server = StubCompletionServer(model_id="stub").start()
+    try:
+        run_benchmark({
+            "dataset": {
+                "path": "config/prompts.jsonl",
+                "format": "jsonl",
+                "text_field": "prompt",
+                "max_prompts": 2,
+            },
+            "models": [{
+                "id": "stub",
+                "name": "Stub",
+                "provider": "openai",
+                "base_url": server.url,
+            }],
+            "runtime": {"device": "cpu"},
+            "generation": {"max_new_tokens": 4},
+            "output": {"base_dir": str(tmp_path)},
+        })
+    finally:
+        server.stop()
+
+    assert closed == ["stub"]
+
+
+def test_thread_sweep_continues_past_failed_single_worker_load(tmp_path, monkeypatch):
+    import benchmark.runner as runner
+
+    monkeypatch.setattr(runner, "_load_model", lambda model_cfg, config: (None, {}))
+
+    swept = []
+
+    def fake_run_in_workers(task, args, workers, threads_per_worker, pin_cores):
+        swept.append((workers, threads_per_worker))
+        return [
+            {"start": 0.0, "end": 1.0, "output_tokens": 10, "latencies": [1.0], "failed": 0}
+            for _ in range(workers)
+        ]
+
+    monkeypatch.setattr(runner, "run_in_workers", fake_run_in_workers)
+
+    runner.run_thread_sweep({
+        "dataset": {
+            "path": "config/prompts.jsonl",
+            "format": "jsonl",
+            "text_field": "prompt",
+        },
+        "models": [{"id": "m", "name": "M", "dtype": "float32"}],
+        "runtime": {"device": "cpu"},
+        "generation": {"max_new_tokens": 4},
+        "thread_sweep": {"thread_counts": [1, 2], "workers": [1, 2], "num_prompts": 2},
+        "output": {"base_dir": str(tmp_path)},
+    })
+
+    assert swept == [(2, 1), (2, 2)]
+
+
+def test_prefix_benchmark_closes_skipped_http_models(tmp_path, monkeypatch):
+    import benchmark.runner as runner
+    from benchmark.http_backend import OpenAIHTTPModel
+    from benchmark.stub_server import StubCompletionServer
+
+    closed = []
+    close = OpenAIHTTPModel.close
+
+    def tracking_close(self):
+        closed.append(self.model_id)
+        close(self)
+
+    monkeypatch.setattr(OpenAIHTTPModel, "close", tracking_close)
+
+    server = StubCompletionServer(model_id="stub").start()
+    try:
+        with pytest.raises(RuntimeError, match="NO RESULTS"):
+            runner.run_prefix_benchmark({
+                "dataset": {
+                    "path": "config/prompts.jsonl",
+                    "format": "jsonl",
+                    "text_field": "prompt",
+                },
+                "models": [{
+                    "id": "stub",
+                    "name": "Stub",
+                    "provider": "openai",
+                    "base_url": server.url,
+                }],
+                "runtime": {"device": "cpu"},
+                "generation": {"max_new_tokens": 4},
+                "shared_prefix": {"text": "System prompt.", "compare_lengths": [8]},
+                "output": {"base_dir": str(tmp_path)},
+            })
+    finally:
+        server.stop()
+
+    assert closed == ["stub"]
+
+
+def test_thread_sweep_releases_loaded_models(tmp_path, monkeypatch):
+    import benchmark.runner as runner
+
+    closed = []
+
+    class FakeModel:
+        def close(self):
+            closed.append(self)
+
+    measurement = {"start": 0.0, "end": 1.0, "output_tokens": 10, "latencies": [1.0], "failed": 0}
+
+    monkeypatch.setattr(runner, "_load_model", lambda model_cfg, config: (FakeModel(), {}))
+    monkeypatch.setattr(runner, "_measure_thread_setting", lambda *args: measurement)
+
+    config = {
+        "dataset": {
+            "path": "config/prompts.jsonl",
+            "format": "jsonl",
+            "text_field": "prompt",
+        },
+        "models": [{"id": "m", "name": "M", "dtype": "float32"}],
+        "runtime": {"device": "cpu"},
+        "generation": {"max_new_tokens": 4},
+        "thread_sweep": {"thread_counts": [1, 2], "num_prompts": 2},
+        "output": {"base_dir": str(tmp_path)},
+    }
+
+    runner.run_thread_sweep(config)
+
+    # One model serves every single-worker setting and is closed once
+    assert len(closed) == 1
+
+    assert runner._thread_sweep_task(config["models"][0], [], config) == measurement
+    assert len(closed) == 2
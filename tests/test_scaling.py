@@ -0,0 +1,65 @@
+import pytest
+
+from benchmark.scaling import (
+    plan_thread_settings,
+    measure_generation,
+    combine_measurements,
+    summarize_scaling,
+)
+
+
+def test_plan_thread_settings_orders_by_total_threads():
+    settings = plan_thread_settings({"thread_counts": [4, 1, 2], "workers": [1, 2]})
+
+    assert [(s["workers"], s["threads_per_worker"]) for s in settings] == [
+        (1, 1), (1, 2), (2, 1), (1, 4), (2, 2), (2, 4),
+    ]
+    assert all(s["total_threads"] == s["workers"] * s["threads_per_worker"] for s in settings)
+
+    assert len(plan_thread_settings({"thread_counts": [1, 2]})) == 2
+
+
+def test_combine_measurements_spans_all_workers():
+    combined = combine_measurements([
+        {"start": 10.0, "end": 12.0, "output_tokens": 20, "latencies": [1.0, 1.0], "failed": 0},
+        {"start": 10.5, "end": 14.0, "output_tokens": 20, "latencies": [2.0], "failed": 1},
+    ])
+
+    assert combined["wall_sec"] == 4.0
+    assert combined["tokens_per_sec"] == 10.0
+    assert combined["failed"] == 1
+    assert combined["latency_mean_sec"] == pytest.approx(4 / 3, abs=1e-4)
+
+
+def test_summarize_scaling_computes_parallel_efficiency():
+    results = [
+        {"model_name": "M", "workers": 1, "total_threads": 4, "tokens_per_sec": 30.0},
+        {"model_name": "M", "workers": 1, "total_threads": 1, "tokens_per_sec": 10.0},
+        {"model_name": "M", "workers": 1, "total_threads": 2, "tokens_per_sec": 20.0},
+    ]
+
+    summaries = summarize_scaling(results)
+
+    assert [s["total_threads"] for s in summaries] == [1, 2, 4]
+    assert [s["speedup"] for s in summaries] == [1.0, 2.0, 3.0]
+    assert [s["parallel_efficiency"] for s in summaries] == [1.0, 1.0, 0.75]
+
+
+def test_unknown_token_counts_leave_throughput_unknown():
+    class UncountedModel:
+        def generate_batch(self, prompts, generation_config):
+            return [{"output_tokens": None} for _ in prompts]
+
+    measurement = measure_generation(
+        UncountedModel(), [{"prompt": "a"}, {"prompt": "b"}], {}, batch_size=1
+    )
+    assert measurement["output_tokens"] == 0
+    assert measurement["unknown_token_outputs"] == 2
+
+    combined = combine_measurements([measurement])
+    assert combined["tokens_per_sec"] is None
+
+    summaries = summarize_scaling([
+        {"model_name": "M", "workers": 1, "total_threads": 1, **combined},
+    ])
+    assert summaries[0]["speedup"] is None
@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmark.exceptions import InferenceError
+from benchmark.scheduler import MicroBatchScheduler
+
+
+class RecordingModel:
+    """Stand-in model that records the size of every batch it runs."""
+
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def generate_batch(self, prompts, generation_config):
+        with self._lock:
+            self.batch_sizes.append(len(prompts))
+        time.sleep(0.01)
+        if self.fail:
+            raise InferenceError("boom")
+        return [
+            {"output_text": prompt.upper(), "output_tokens": 1, "prompt_tokens": 1}
+            for prompt in prompts
+        ]
+
+
+def test_scheduler_fills_batches_up_to_max_size():
+    model = RecordingModel()
+
+    with MicroBatchScheduler(model, max_batch_size=4, max_wait_seconds=0.2) as scheduler:
+        futures = [scheduler.submit(p, {}) for p in "abcdefgh"]
+        outputs = [future.result() for future in futures]
+
+    assert [output["output_text"] for output in outputs] == list("ABCDEFGH")
+    assert model.batch_sizes == [4, 4]
+    assert all(output["batch_size"] == 4 for output in outputs)
+
+
+def test_scheduler_dispatches_partial_batch_after_max_wait():
+    model = RecordingModel()
+
+    with MicroBatchScheduler(model, max_batch_size=8, max_wait_seconds=0.02) as scheduler:
+        start = time.perf_counter()
+        output = scheduler.generate("a", {})
+        elapsed = time.perf_counter() - start
+
+    assert output["batch_size"] == 1
+    assert output["batch_wait_sec"] >= 0.02
+    assert elapsed < 0.5
+
+
+def test_scheduler_concurrent_callers_and_errors():
+    model = RecordingModel()
+
+    with MicroBatchScheduler(model, max_batch_size=3, max_wait_seconds=0.05) as scheduler:
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            outputs = list(pool.map(lambda p: scheduler.generate(p, {}), "abcdef"))
+
+    assert [output["output_text"] for output in outputs] == list("ABCDEF")
+    assert sum(model.batch_sizes) == 6
+    assert max(model.batch_sizes) <= 3
+
+    with MicroBatchScheduler(RecordingModel(fail=True), 2, 0.01) as scheduler:
+        with pytest.raises(InferenceError):
+            scheduler.generate("a", {})
@@ -0,0 +1,81 @@
+import pandas as pd
+
+from benchmark.sink import (
+    ResultsSink,
+    result_part_path,
+    iter_result_rows,
+    iter_result_chunks,
+    load_completed_keys,
+)
+from benchmark.reporter import (
+    save_results_csv,
+    summarize_means,
+    summarize_statistics,
+)
+
+
+def _write_parts(results_dir):
+    with ResultsSink(result_part_path(results_dir, 0)) as sink:
+        sink.write_rows([
+            {"model_name": "a", "latency_sec": 1.0, "peak_ram_mb": 10.0},
+            {"model_name": "a", "latency_sec": 3.0, "peak_ram_mb": 30.0},
+        ])
+    with ResultsSink(result_part_path(results_dir, 1)) as sink:
+        sink.write_rows([
+            {"model_name": "b", "latency_sec": 2.0, "status": "timeout"},
+        ])
+
+
+def test_sink_appends_and_skips_truncated_rows(tmp_path):
+    _write_parts(tmp_path)
+
+    # Simulate a crash halfway through writing a row
+    with open(result_part_path(tmp_path, 1), "a", encoding="utf-8") as f:
+        f.write('{"model_name": "b", "laten')
+
+    rows = list(iter_result_rows(tmp_path))
+    assert [row["model_name"] for row in rows] == ["a", "a", "b"]
+
+    chunks = list(iter_result_chunks(tmp_path, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+
+    # Rows appended after the crash must not be glued to the broken row
+    with ResultsSink(result_part_path(tmp_path, 1)) as sink:
+        sink.write_rows([{"model_name": "c", "latency_sec": 4.0}])
+
+    rows = list(iter_result_rows(tmp_path))
+    assert [row["model_name"] for row in rows] == ["a", "a", "b", "c"]
+
+
+def test_load_completed_keys(tmp_path):
+    with ResultsSink(result_part_path(tmp_path, 0)) as sink:
+        sink.write_rows([
+            {"model_id": "m", "prompt_id": 1, "run": 0},
+            {"model_id": "m", "prompt_id": 1, "run": 1},
+            {"model_id": "n", "prompt_id": 2, "run": 0},
+        ])
+
+    assert load_completed_keys(tmp_path) == {
+        "m": {(1, 0), (1, 1)},
+        "n": {(2, 0)},
+    }
+    assert load_completed_keys(tmp_path / "missing") == {}
+
+
+def test_streamed_reports(tmp_path):
+    _write_parts(tmp_path)
+
+    csv_path = save_results_csv(tmp_path, tmp_path / "out")
+    df = pd.read_csv(csv_path)
+    assert len(df) == 3
+    assert {"latency_sec", "peak_ram_mb", "status"} <= set(df.columns)
+
+    means = summarize_means(tmp_path)
+    assert means.loc["a", "latency_sec"] == 2.0
+    assert means.loc["a", "rows"] == 2
+    assert pd.isna(means.loc["b", "peak_ram_mb"])
+
+    stats = summarize_statistics(tmp_path, metrics=("latency_sec",), max_samples=1)
+    row = stats[stats["model_name"] == "a"].iloc[0]
+    assert row["n"] == 2
+    assert row["mean"] in (1.0, 3.0)
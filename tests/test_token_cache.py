@@ -0,0 +1,44 @@
+import json
+
+from transformers import AutoTokenizer
+
+from benchmark.dataset import PromptDataset
+from benchmark.token_cache import get_or_build_token_cache
+
+
+def _write_prompts(path, prompts):
+    with open(path, "w", encoding="utf-8") as f:
+        for idx, prompt in enumerate(prompts):
+            f.write(json.dumps({"id": f"p{idx}", "prompt": prompt}) + "\n")
+
+
+def test_token_cache_matches_tokenizer_and_is_reused(tmp_path, tiny_model_dir):
+    tokenizer = AutoTokenizer.from_pretrained(tiny_model_dir)
+    dataset_path = tmp_path / "prompts.jsonl"
+    prompts = ["Explain machine learning.", "Hi", "What is a transformer?"]
+    _write_prompts(dataset_path, prompts)
+
+    dataset = PromptDataset(str(dataset_path), "jsonl", "prompt")
+    cache = get_or_build_token_cache(dataset, tokenizer, tmp_path / "cache")
+
+    assert len(cache) == len(prompts)
+    for idx, prompt in enumerate(prompts):
+        assert cache.get(f"p{idx}").tolist() == tokenizer(prompt)["input_ids"]
+
+    reopened = get_or_build_token_cache(dataset, tokenizer, tmp_path / "cache")
+    assert reopened.path == cache.path
+
+
+def test_token_cache_key_follows_dataset_content(tmp_path, tiny_model_dir):
+    tokenizer = AutoTokenizer.from_pretrained(tiny_model_dir)
+    dataset_path = tmp_path / "prompts.jsonl"
+
+    _write_prompts(dataset_path, ["Hello world"])
+    dataset = PromptDataset(str(dataset_path), "jsonl", "prompt")
+    first = get_or_build_token_cache(dataset, tokenizer, tmp_path / "cache")
+
+    _write_prompts(dataset_path, ["Something else entirely"])
+    second = get_or_build_token_cache(dataset, tokenizer, tmp_path / "cache")
+
+    assert second.path != first.path
+    assert second.get("p0").tolist() == tokenizer("Something else entirely")["input_ids"]